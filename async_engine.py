@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import concurrent.futures
+import threading
+from io import BytesIO
+
+from fake_llm import stub_reply
+from providers import default_providers
+from tracing import TRACER
+
+
+class AsyncEngine:
+    """asyncio event loop on a dedicated thread for all network-bound work
+
+    Text analysis, vision calls and questions are coroutines on this loop, so
+    hundreds of requests in flight cost coroutines rather than OS threads; a
+    semaphore caps how many actually hit the network at once. The Tk side never
+    touches the loop directly: job threads hand coroutines over with run() and
+    deliver results through the UI event bus as before.
+
+    Requests go to named providers (see providers.py): "groq" and "openrouter"
+    by default, plus any OpenAI-compatible endpoint added with add_provider().
+    Each provider owns its pooled client, retries and usage counters.
+    """
+
+    def __init__(self, max_in_flight=64, timeout=60, providers=None):
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.loop = None
+        self.thread = None
+        self.semaphore = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.providers = {}
+        for provider in default_providers(timeout) if providers is None else providers:
+            self.add_provider(provider)
+
+    # ==================== LOOP THREAD ====================
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True, name="async-engine")
+                self.thread.start()
+        self.ready.wait()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.loop.call_soon(self.ready.set)
+        self.loop.run_forever()
+
+    def stop(self):
+        if self.loop is None:
+            return
+
+        async def close_all():
+            for provider in self.providers.values():
+                await provider.close()
+            # Streams left at "data: [DONE]" still hold an open line iterator
+            await self.loop.shutdown_asyncgens()
+
+        asyncio.run_coroutine_threadsafe(close_all(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    # ==================== BRIDGE ====================
+
+    def submit(self, coro):
+        """Schedule a coroutine from any thread; returns a concurrent.futures.Future"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, job=None, poll=0.1):
+        """Block the calling (worker) thread until coro is done; cancels it with the job"""
+        future = self.submit(coro)
+        while True:
+            try:
+                return future.result(timeout=poll)
+            except concurrent.futures.TimeoutError:
+                if job is not None and job.cancelled:
+                    future.cancel()
+                    job.check()
+
+    async def map(self, fn, items, on_result=None, limit=None):
+        """await fn(item) for every item concurrently; results (or exceptions) in input order
+
+        on_result(index, result) runs on the loop thread as each one finishes.
+        limit caps concurrency for this batch on top of the engine-wide cap.
+        """
+        batch_limit = asyncio.Semaphore(limit) if limit else None
+
+        async def one(index, item):
+            try:
+                if batch_limit is None:
+                    result = await fn(item)
+                else:
+                    async with batch_limit:
+                        result = await fn(item)
+            except Exception as e:
+                result = e
+            if on_result:
+                on_result(index, result)
+            return result
+
+        return await asyncio.gather(*(one(index, item) for index, item in enumerate(items)))
+
+    # ==================== PROVIDERS ====================
+
+    def add_provider(self, provider):
+        self.providers[provider.name] = provider
+        return provider
+
+    def provider(self, name):
+        return self.providers[name]
+
+    def usage(self):
+        return {name: provider.usage.snapshot() for name, provider in self.providers.items()}
+
+    # ==================== REQUESTS ====================
+
+    async def chat(self, provider, model, messages, **params):
+        """Chat completion through a named provider; returns the reply text"""
+        async with self.semaphore:
+            return await self.providers[provider].chat(model, messages, **params)
+
+    async def chat_stream(self, provider, model, messages, on_delta=None, **params):
+        """Streaming chat completion; on_delta(text_so_far) runs per chunk, returns the full text"""
+        async with self.semaphore:
+            return await self.providers[provider].chat_stream(model, messages, on_delta, **params)
+
+    async def vision(self, provider, model, prompt, pil_image, image_format="PNG", max_tokens=800):
+        """Describe a PIL image with a vision model"""
+        # Encoding is CPU work; keep it off the loop
+        with TRACER.span('image.encode', format=image_format):
+            image_b64 = await self.loop.run_in_executor(None, encode_image, pil_image, image_format)
+        mime = "image/jpeg" if image_format == "JPEG" else "image/png"
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{image_b64}"}}
+                ]
+            }
+        ]
+        return await self.chat(provider, model, messages, max_tokens=max_tokens)
+
+
+class StubEngine(AsyncEngine):
+    """AsyncEngine that answers locally instead of calling an API
+
+    Lets the service (and the windows) run with no keys and no network. Every
+    call waits `latency` seconds under the same in-flight cap as real requests,
+    so queueing and concurrency behave as they would against a backend.
+    Nothing goes over HTTP; to exercise the real clients use fake_llm instead.
+    """
+
+    def __init__(self, latency=0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.calls = 0
+
+    async def chat(self, provider, model, messages, **params):
+        async with self.semaphore:
+            await asyncio.sleep(self.latency)
+        self.calls += 1
+        return stub_reply(messages)
+
+    async def chat_stream(self, provider, model, messages, on_delta=None, **params):
+        text = await self.chat(provider, model, messages, **params)
+        words = text.split(" ")
+        for count in range(1, len(words) + 1):
+            if on_delta:
+                on_delta(" ".join(words[:count]))
+            await asyncio.sleep(0)
+        return text
+
+
+def encode_image(pil_image, image_format="PNG"):
+    buffered = BytesIO()
+    if image_format == "JPEG":
+        pil_image.save(buffered, format="JPEG", quality=85)
+    else:
+        pil_image.save(buffered, format=image_format)
+    return base64.b64encode(buffered.getvalue()).decode('utf-8')
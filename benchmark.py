@@ -0,0 +1,373 @@
+"""End-to-end benchmark on synthetic PDFs
+
+    python benchmark.py                                   # default matrix
+    python benchmark.py --pages 10,100,1000 --repeat 3 --output bench.json
+    python benchmark.py --compare bench-main.json         # flag regressions
+
+Generates PDFs with PyMuPDF across a matrix of page counts, text densities
+and embedded-image counts, then times every stage of the engine on each:
+open, text extraction, image extraction, rule-based analysis, index build,
+LLM page analysis and questions (local answer and LLM answer). LLM calls go
+to the StubEngine, so the numbers measure our own code, not an API.
+Results are written as JSON (stage medians over --repeat runs, plus the
+revision and environment) so two revisions can be compared with --compare.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+
+from startup import lazy_import
+from async_engine import StubEngine
+from engine import PDFEngine, DocumentAnalysis
+from records import PageRecord
+
+fitz = lazy_import('fitz')  # PyMuPDF
+Image = lazy_import('PIL.Image')
+
+# Bump when stages or the generated documents change; results are only comparable within a version
+BENCHMARK_VERSION = 1
+
+# Words per page
+DENSITIES = {'sparse': 80, 'normal': 300, 'dense': 900}
+
+STAGES = ['open', 'text_extraction', 'image_extraction', 'rule_based_analysis', 'index_build',
+          'llm_analysis']
+
+# Slower than the baseline by more than this share counts as a regression
+REGRESSION_THRESHOLD = 0.10
+
+QUESTIONS = [
+    "Who is Elara?",
+    "What did Detective Hale find in the server room?",
+    "what happened at night",
+    "Marcuss",                          # Typo: exercises the fuzzy index
+    "summary",
+    "quantum giraffe"                   # No match at all
+]
+
+# ==================== SYNTHETIC PDFS ====================
+
+NAMES = ["Elara", "Marcus", "Detective Hale", "Professor Quinn", "Nadia", "Captain Reyes", "Tobias", "Ines"]
+PLACES = ["the server room", "the old library", "the harbor office", "the city park", "the hospital",
+          "the north street", "the school", "the archive"]
+OBJECTS = ["a letter", "the key", "a torn map", "the laptop", "a book", "the car", "a photograph", "the door"]
+VERBS = ["found", "noticed", "took", "gave", "opened", "discovered", "left", "argued about"]
+TIMES = ["that morning", "in the evening", "at night", "the next day", "a week later", "after midnight"]
+FILLER = ["quietly", "without a word", "for the first time", "as the rain started", "while the others waited",
+          "before anyone arrived", "with some hesitation", "as planned"]
+
+
+def synthetic_text(words, rng):
+    """Story-like text of about `words` words, with names, places and event triggers"""
+    sentences = []
+    count = 0
+    while count < words:
+        template = rng.randrange(4)
+        name, other = rng.sample(NAMES, 2)
+        if template == 0:
+            sentence = f"{name} {rng.choice(VERBS)} {rng.choice(OBJECTS)} in {rng.choice(PLACES)} {rng.choice(TIMES)}."
+        elif template == 1:
+            sentence = f'"We should check {rng.choice(PLACES)}," {name} said to {other} {rng.choice(FILLER)}.'
+        elif template == 2:
+            sentence = f"Then {name} walked into {rng.choice(PLACES)} and {rng.choice(VERBS)} {rng.choice(OBJECTS)}."
+        else:
+            sentence = f"{name} realized that {other} had {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(TIMES)}."
+        sentences.append(sentence)
+        count += len(sentence.split())
+
+    # Paragraphs of a few sentences, like a real page
+    paragraphs = [" ".join(sentences[start:start + 5]) for start in range(0, len(sentences), 5)]
+    return "\n\n".join(paragraphs)
+
+
+def synthetic_image(rng, width=320, height=240):
+    """A small PNG that differs per call (so PyMuPDF stores every one separately)"""
+    base = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+    image = Image.new("RGB", (width, height), base)
+    for _ in range(12):
+        x0, y0 = rng.randrange(width), rng.randrange(height)
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        image.paste(color, (x0, y0, min(width, x0 + rng.randrange(20, 120)), min(height, y0 + rng.randrange(20, 90))))
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def make_pdf(path, pages, words_per_page, images, seed=0):
+    """Write a synthetic PDF: `pages` pages of text with `images` images spread over them"""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    image_pages = [page_index * pages // images for page_index in range(images)] if images else []
+
+    for page_index in range(pages):
+        page = doc.new_page(width=595, height=842)  # A4
+        lines = []
+        for paragraph in synthetic_text(words_per_page, rng).split("\n\n"):
+            lines.extend(textwrap.wrap(paragraph, 110))
+            lines.append("")
+        page.insert_text((36, 40), "\n".join(lines), fontsize=7)
+
+        for slot in range(image_pages.count(page_index)):
+            top = 842 - 140 * (slot % 5 + 1)
+            left = 36 + 150 * (slot // 5 % 3)
+            page.insert_image(fitz.Rect(left, top, left + 120, top + 90), stream=synthetic_image(rng))
+
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+# ==================== MEASURING ====================
+
+def percentile(values, share):
+    """Nearest-rank percentile of a list of numbers (share in 0..1)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(share * len(ordered)) - 1))]
+
+
+def latency_summary(seconds):
+    """p50/p95/max/mean in milliseconds"""
+    ms = [value * 1000 for value in seconds]
+    return {
+        'count': len(ms),
+        'p50_ms': round(percentile(ms, 0.50), 3),
+        'p95_ms': round(percentile(ms, 0.95), 3),
+        'max_ms': round(max(ms), 3),
+        'mean_ms': round(statistics.mean(ms), 3)
+    }
+
+
+class Stopwatch:
+    """Times named stages: with watch('open'): ..."""
+
+    def __init__(self):
+        self.seconds = {}
+
+    def __call__(self, stage):
+        self.stage = stage
+        return self
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds[self.stage] = time.perf_counter() - self.started
+
+
+def count_images(engine, pdf_path):
+    with engine.open_pdf(pdf_path) as doc:
+        return sum(1 for _ in engine.iter_images(doc))
+
+
+def run_once(engine, pdf_path, questions):
+    """Every stage once on one PDF; returns (stage seconds, local question seconds, LLM question seconds)"""
+    watch = Stopwatch()
+
+    with watch('open'):
+        doc = engine.open_pdf(pdf_path)
+        len(doc)
+    doc.close()
+
+    with watch('text_extraction'):
+        texts = engine.read_pages(pdf_path)
+
+    with watch('image_extraction'):
+        count_images(engine, pdf_path)
+
+    with watch('rule_based_analysis'):
+        analyses = [engine.rule_based_analysis(text) for text in texts]
+
+    with watch('index_build'):
+        pages = [PageRecord(page_num + 1, text, analysis) for page_num, (text, analysis) in enumerate(zip(texts, analyses))]
+        document = DocumentAnalysis(pdf_path, pages)
+
+    # Only the API calls: records and the index were timed in the stages above
+    with watch('llm_analysis'):
+        engine.groq_page_analyses(texts, range(len(texts)))
+
+    local, llm = [], []
+    for question in questions:
+        started = time.perf_counter()
+        engine.instant_answer(question, document)
+        local.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        engine.answer(question, document)
+        llm.append(time.perf_counter() - started)
+
+    return watch.seconds, local, llm
+
+
+def run_case(pdf_path, repeat, llm_latency, questions=QUESTIONS):
+    """Median stage times over `repeat` runs with a fresh stub-backed engine each time"""
+    runs = []
+    local, llm = [], []
+    image_count = count_images(PDFEngine(llm=StubEngine(latency=llm_latency), journal_dir=None), pdf_path)
+    for _ in range(repeat):
+        engine = PDFEngine(llm=StubEngine(latency=llm_latency), journal_dir=None)
+        try:
+            seconds, run_local, run_llm = run_once(engine, pdf_path, questions)
+        finally:
+            engine.llm.stop()
+        runs.append(seconds)
+        local.extend(run_local)
+        llm.extend(run_llm)
+
+    stages = {stage: round(statistics.median(run[stage] for run in runs) * 1000, 3) for stage in STAGES}
+    return {
+        'stages_ms': stages,
+        'total_ms': round(sum(stages.values()), 3),
+        'images_found': image_count,
+        'questions': {'local': latency_summary(local), 'llm': latency_summary(llm)}
+    }
+
+
+def revision():
+    """Short git revision of the tree, with -dirty for uncommitted changes"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=here, capture_output=True,
+                             text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=here,
+                               capture_output=True, text=True, timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f"{rev}-dirty" if rev and dirty else rev or None
+
+
+def run_benchmark(page_counts, densities, image_counts, repeat=1, llm_latency=0.0, pdf_dir=None, seed=0):
+    """Generate (or reuse) every PDF of the matrix and benchmark it; returns the results dict"""
+    results = {
+        'benchmark': 'intellex-e2e',
+        'version': BENCHMARK_VERSION,
+        'revision': revision(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pymupdf': fitz.VersionBind,
+        'settings': {'repeat': repeat, 'llm_latency': llm_latency, 'seed': seed,
+                     'questions': len(QUESTIONS)},
+        'cases': []
+    }
+
+    with tempfile.TemporaryDirectory(prefix="intellex-bench-") as scratch:
+        pdf_dir = pdf_dir or scratch
+        os.makedirs(pdf_dir, exist_ok=True)
+        for pages in page_counts:
+            for density in densities:
+                for images in image_counts:
+                    case_id = f"p{pages}-{density}-i{images}"
+                    pdf_path = os.path.join(pdf_dir, f"synthetic-v{BENCHMARK_VERSION}-s{seed}-{case_id}.pdf")
+                    if not os.path.exists(pdf_path):
+                        make_pdf(pdf_path, pages, DENSITIES[density], images, seed)
+
+                    case = {'id': case_id, 'pages': pages, 'density': density,
+                            'words_per_page': DENSITIES[density], 'images': images,
+                            'pdf_bytes': os.path.getsize(pdf_path)}
+                    case.update(run_case(pdf_path, repeat, llm_latency))
+                    results['cases'].append(case)
+                    print(f"⏱ {case_id:<22} {case['total_ms']:>10.1f} ms  "
+                          f"(local p95 {case['questions']['local']['p95_ms']:.2f} ms)", file=sys.stderr)
+    return results
+
+
+# ==================== REPORTS ====================
+
+def print_results(results):
+    print(f"Revision {results['revision'] or '?'}, {results['settings']['repeat']} run(s) per case, "
+          f"stub LLM latency {results['settings']['llm_latency']}s\n")
+    header = f"{'case':<22}" + "".join(f"{stage[:12]:>13}" for stage in STAGES) + f"{'local p95':>11}{'llm p95':>10}"
+    print(header)
+    print("-" * len(header))
+    for case in results['cases']:
+        row = f"{case['id']:<22}" + "".join(f"{case['stages_ms'][stage]:>13.1f}" for stage in STAGES)
+        row += f"{case['questions']['local']['p95_ms']:>11.2f}{case['questions']['llm']['p95_ms']:>10.2f}"
+        print(row)
+    print("\n(all times in ms; stage times are medians)")
+
+
+def compare(baseline, results, threshold=REGRESSION_THRESHOLD):
+    """Print per-stage changes against an earlier results file; returns the number of regressions"""
+    if baseline.get('version') != results['version']:
+        print(f"⚠️ Baseline is benchmark version {baseline.get('version')}, this is {results['version']}: "
+              "numbers are not comparable")
+        return 0
+
+    old_cases = {case['id']: case for case in baseline['cases']}
+    regressions = 0
+    print(f"\nCompared with {baseline.get('revision') or '?'} (regression: more than {threshold:.0%} slower)")
+    for case in results['cases']:
+        old = old_cases.get(case['id'])
+        if old is None:
+            continue
+        pairs = [(stage, old['stages_ms'][stage], case['stages_ms'][stage]) for stage in STAGES]
+        pairs.append(('local_p95', old['questions']['local']['p95_ms'], case['questions']['local']['p95_ms']))
+        for name, before, after in pairs:
+            # Ignore sub-millisecond noise
+            if before <= 0 or max(before, after) < 1.0:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions += 1
+                print(f"🔺 {case['id']} {name}: {before:.1f} -> {after:.1f} ms ({change:+.0%})")
+            elif change < -threshold:
+                print(f"🔻 {case['id']} {name}: {before:.1f} -> {after:.1f} ms ({change:+.0%})")
+    print(f"{regressions} regression(s)")
+    return regressions
+
+
+def int_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic PDFs")
+    parser.add_argument('--pages', type=int_list, default=[10, 100], help="page counts, e.g. 10,100,1000")
+    parser.add_argument('--density', default="sparse,dense",
+                        help=f"text densities, any of {','.join(DENSITIES)}")
+    parser.add_argument('--images', type=int_list, default=[0, 20], help="embedded images per document")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case (stage times are medians)")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="stub LLM latency per call (seconds)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated documents")
+    parser.add_argument('--pdf-dir', help="keep (and reuse) the generated PDFs here")
+    parser.add_argument('--output', help="write the results JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="results JSON of an earlier revision")
+    args = parser.parse_args(argv)
+
+    densities = [density for density in args.density.split(',') if density]
+    unknown = [density for density in densities if density not in DENSITIES]
+    if unknown:
+        parser.error(f"unknown density: {', '.join(unknown)}")
+
+    results = run_benchmark(args.pages, densities, args.images, repeat=max(1, args.repeat),
+                            llm_latency=args.llm_latency, pdf_dir=args.pdf_dir, seed=args.seed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}", file=sys.stderr)
+
+    print_results(results)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        return 1 if compare(baseline, results) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".intellex", "journal")
+
+# Bump when the stored analysis format changes; older journals are then ignored
+JOURNAL_VERSION = 1
+
+
+class AnalysisJournal:
+    """Append-only record of the paid results for one PDF
+
+    Every page analysis and image description that came back from an API is
+    appended as one JSON line the moment it completes, so a crash or a dropped
+    connection at page 450 of 600 loses nothing: the next run loads the journal
+    and only asks for what is missing. Rule-based fallbacks are not recorded,
+    they are cheap to redo and the API may be back next time.
+
+    The first line identifies the file (size and mtime) and what produced the
+    results (text provider and model, vision provider); if any of it changed,
+    the old journal is discarded. A torn last line from a crash is skipped.
+    The file is only open while a record is appended.
+    """
+
+    def __init__(self, pdf_path, journal_dir=DEFAULT_JOURNAL_DIR, provider=None, model=None, vision_provider=None):
+        self.pdf_path = os.path.abspath(pdf_path)
+        doc_id = hashlib.sha1(self.pdf_path.encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(journal_dir, f"{doc_id}.jsonl")
+        self.lock = threading.Lock()
+        self.page_results = {}     # page number -> analysis
+        self.descriptions = {}     # (page, image index, model) -> description
+        self.source = {'provider': provider, 'model': model, 'vision_provider': vision_provider}
+        self._load()
+
+    def _header(self):
+        try:
+            stat = os.stat(self.pdf_path)
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size, mtime = None, None
+        return {'type': 'header', 'version': JOURNAL_VERSION, 'path': self.pdf_path, 'size': size, 'mtime': mtime,
+                **self.source}
+
+    def is_current(self, provider=None, model=None, vision_provider=None):
+        """False once the PDF on disk, or the provider and model asking, no longer match this journal"""
+        source = {'provider': provider, 'model': model, 'vision_provider': vision_provider}
+        return source == self.source and self._header() == self.header
+
+    def _load(self):
+        header = self.header = self._header()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # Torn write from a crash
+
+        if not records or records[0] != header:
+            # New document, or the PDF changed since the journal was written
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header) + "\n")
+            records = []
+        elif not lines[-1].endswith("\n"):
+            # Finish the torn line so the next record starts on its own line
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n")
+
+        for record in records[1:]:
+            if record.get('type') == 'page':
+                self.page_results[record['page']] = record['analysis']
+            elif record.get('type') == 'image':
+                self.descriptions[(record['page'], record['index'], record['model'])] = record['description']
+
+    def _append(self, record):
+        with self.lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+
+    # ==================== PAGES ====================
+
+    def page(self, page_num):
+        return self.page_results.get(page_num)
+
+    def add_page(self, page_num, analysis):
+        self.page_results[page_num] = analysis
+        self._append({'type': 'page', 'page': page_num, 'analysis': analysis})
+
+    # ==================== IMAGES ====================
+
+    def description(self, page_num, index, model):
+        return self.descriptions.get((page_num, index, model))
+
+    def add_description(self, page_num, index, model, description):
+        self.descriptions[(page_num, index, model)] = description
+        self._append({'type': 'image', 'page': page_num, 'index': index, 'model': model,
+                      'description': description})
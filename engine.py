@@ -0,0 +1,930 @@
+import json
+import os
+import re
+import threading
+import time
+from io import BytesIO
+
+from startup import lazy_import
+from async_engine import AsyncEngine
+from providers import EngineError, openai_compatible
+from checkpoint import AnalysisJournal, DEFAULT_JOURNAL_DIR
+from entity_extractor import ENTITY_EXTRACTOR
+from entity_store import EntityStore
+from library import DocumentLibrary
+from memory import MEMORY
+from records import PageRecord, ImageRecord
+from search_index import PageIndex
+from telemetry import TELEMETRY
+from tracing import TRACER
+
+# Heavy modules are imported on first use
+fitz = lazy_import('fitz')  # PyMuPDF
+Image = lazy_import('PIL.Image')
+
+# Page analysis and the connection check use the fast model
+TEXT_MODEL = "llama-3.1-8b-instant"
+
+# Question answering tries these in order until one answers
+ANSWER_MODELS = [
+    "llama-3.1-8b-instant",        # Fast and reliable
+    "llama-3.2-3b-preview",        # Alternative model
+    "llama-3.2-1b-preview",        # Another alternative
+    "mixtral-8x7b-32768",          # Mixtral model
+    "gemma2-9b-it"                 # Gemma model
+]
+
+IMAGE_PROMPT = ("Analyze this image in detail. Describe everything you see, including objects, text, "
+                "people, colors, layout, and any important details. Be thorough and precise.")
+
+
+class AnswerError(Exception):
+    """Raised when every answer model failed"""
+
+
+class DocumentAnalysis:
+    """One analyzed PDF: its pages plus the search index and entity store built from them"""
+
+    def __init__(self, pdf_path, pages):
+        self.pdf_path = pdf_path
+        self.pages = pages    # [PageRecord]
+        self.all_text = "".join(f"\n\n--- PAGE {data.page} ---\n{data.text}" for data in pages)
+        self.search_index = PageIndex()
+        self.entity_store = EntityStore()
+        for data in pages:
+            self.search_index.add_page(data.page, data.text)
+            self.entity_store.add_page(data.page, data.analysis)
+
+    @property
+    def name(self):
+        return os.path.basename(self.pdf_path)
+
+    def __len__(self):
+        return len(self.pages)
+
+
+def load_image(image_bytes):
+    """PIL image (RGB) from the raw bytes of an embedded image"""
+    pil_image = Image.open(BytesIO(image_bytes))
+    if pil_image.mode != 'RGB':
+        pil_image = pil_image.convert('RGB')
+    return pil_image
+
+
+def format_hit(hit):
+    if hit.get('doc'):
+        return f"📄 {hit['doc']} - Page {hit['page']}: {hit['text'][:200]}"
+    return f"📄 Page {hit['page']}: {hit['text'][:200]}"
+
+
+class PDFEngine:
+    """Everything the analyzers do that is not drawing
+
+    Loading, page analysis, image descriptions, search and LLM answers live here
+    so both windows and the headless runner share one implementation. Nothing in
+    this class touches Tk: long calls take an optional job (checked between
+    steps, see jobs.py) and report progress through plain callbacks, which the
+    windows wrap in job.post.
+
+    Text calls (analysis, answers) go to the text_provider and image calls to
+    the vision_provider of the async engine, Groq and OpenRouter by default;
+    their API keys default to the GROQ_API_KEY and OPENROUTER_API_KEY
+    environment variables (see providers.py).
+    """
+
+    def __init__(self, groq_api_key=None, openrouter_api_key=None, library=None, llm=None,
+                 journal_dir=DEFAULT_JOURNAL_DIR, text_provider="groq", vision_provider="openrouter",
+                 text_model=TEXT_MODEL, answer_models=ANSWER_MODELS):
+        self.library = library if library is not None else DocumentLibrary()
+        self.llm = llm or AsyncEngine()  # Event loop thread for every API call; started on first use
+        self.text_provider = text_provider
+        self.vision_provider = vision_provider
+        self.text_model = text_model
+        self.answer_models = answer_models
+        if groq_api_key is not None:
+            self.groq_api_key = groq_api_key
+        if openrouter_api_key is not None:
+            self.openrouter_api_key = openrouter_api_key
+        self.groq_ready = False
+        self.groq_status = "Checking..."
+        self.journal_dir = journal_dir  # None disables checkpoints
+        self.journals = {}
+        self.journals_lock = threading.Lock()
+
+    # ==================== PROVIDERS ====================
+
+    @property
+    def groq_api_key(self):
+        return self.llm.provider('groq').api_key
+
+    @groq_api_key.setter
+    def groq_api_key(self, key):
+        self.llm.provider('groq').api_key = key
+
+    @property
+    def openrouter_api_key(self):
+        return self.llm.provider('openrouter').api_key
+
+    @openrouter_api_key.setter
+    def openrouter_api_key(self, key):
+        self.llm.provider('openrouter').api_key = key
+
+    @property
+    def vision_configured(self):
+        return self.llm.provider(self.vision_provider).configured
+
+    def use_endpoint(self, base_url, api_key="", name="custom", model=None):
+        """Send text and image calls to an OpenAI-compatible endpoint instead"""
+        self.llm.add_provider(openai_compatible(name, base_url, api_key, timeout=self.llm.timeout))
+        self.text_provider = self.vision_provider = name
+        if model:
+            self.text_model = model
+            self.answer_models = [model]
+
+    # ==================== GROQ CONNECTION ====================
+
+    def check_groq(self):
+        """Test call against the text provider (Groq); blocks, so run it off the UI thread"""
+        self.groq_ready = False
+        if not self.llm.provider(self.text_provider).configured:
+            print("⚠️ Groq API key not set.")
+            self.groq_status = "Not configured"
+            return False
+
+        try:
+            reply = self.llm.run(self.llm.chat(
+                self.text_provider, self.text_model,
+                [{"role": "user", "content": "Say 'Connected'"}],
+                max_tokens=10
+            ))
+        except Exception as e:
+            print(f"⚠️ Groq setup failed: {str(e)[:100]}")
+            self.groq_status = f"Failed: {str(e)[:30]}"
+            return False
+
+        if not reply:
+            self.groq_status = "No reply"
+            return False
+
+        print("✅ Groq API configured successfully!")
+        self.groq_status = "Connected"
+        self.groq_ready = True
+        return True
+
+    # ==================== CHECKPOINTS ====================
+
+    def journal_for(self, pdf_path):
+        """The (shared) checkpoint journal of a PDF, or None when checkpoints are off
+
+        A PDF replaced on disk, or a switch of provider or model, since its
+        journal was opened gets a fresh one, so new text is never paired with
+        the old file's results and one model's answers are never passed off
+        as another's.
+        """
+        if self.journal_dir is None:
+            return None
+        key = os.path.abspath(pdf_path)
+        source = {'provider': self.text_provider, 'model': self.text_model, 'vision_provider': self.vision_provider}
+        with self.journals_lock:
+            journal = self.journals.get(key)
+            if journal is None or not journal.is_current(**source):
+                journal = self.journals[key] = AnalysisJournal(pdf_path, self.journal_dir, **source)
+            return journal
+
+    # ==================== LOADING ====================
+
+    def open_pdf(self, pdf_path):
+        with TRACER.span('pdf.open'):
+            return fitz.open(pdf_path)
+
+    def read_pages(self, pdf_path, job=None):
+        """Plain text of every page"""
+        with self.open_pdf(pdf_path) as doc, TRACER.span('extract.text', pages=len(doc)):
+            texts = []
+            for page_num in range(len(doc)):
+                if job is not None:
+                    job.check()
+                texts.append(doc.load_page(page_num).get_text())
+        return texts
+
+    def iter_images(self, doc, job=None):
+        """Yield every embedded image of an open PDF, stopping when the job is cancelled"""
+        for page_num in range(len(doc)):
+            if job is not None:
+                job.check()
+
+            page = doc.load_page(page_num)
+            for img_index, img in enumerate(page.get_images()):
+                if job is not None:
+                    job.check()
+
+                # Timed before the yield: the consumer's work is not extraction
+                with TRACER.span('image.extract', page=page_num + 1, index=img_index):
+                    image_bytes = doc.extract_image(img[0])["image"]
+                    image = load_image(image_bytes)
+                yield ImageRecord(page_num + 1, img_index, image, image_bytes)
+
+    def image_batches(self, doc, job=None, batch_size=8, max_wait=0.2):
+        """iter_images grouped into lists, so a gallery can grow a few images per update"""
+        batch = []
+        last_batch = time.monotonic()
+        for image_data in self.iter_images(doc, job):
+            batch.append(image_data)
+            if len(batch) >= batch_size or time.monotonic() - last_batch > max_wait:
+                yield batch
+                batch = []
+                last_batch = time.monotonic()
+        if batch:
+            yield batch
+
+    # ==================== PAGE ANALYSIS ====================
+
+    def analyze_document(self, pdf_path, job=None, on_progress=None, add_to_library=True):
+        """Read and analyze every page; returns a DocumentAnalysis
+
+        With Groq connected every page is a concurrent request on the async
+        engine, otherwise the rule-based analysis runs on the calling thread.
+        on_progress(done, total) runs as pages finish (on the engine loop
+        thread when Groq is used).
+        """
+        with TRACER.span('document', pdf=os.path.basename(pdf_path)):
+            return self.analyze_texts(pdf_path, self.read_pages(pdf_path, job), job, on_progress, add_to_library)
+
+    def analyze_texts(self, pdf_path, texts, job=None, on_progress=None, add_to_library=True):
+        """analyze_document for page texts that were already extracted
+
+        Pages already in the document's checkpoint journal are not sent again;
+        every page Groq answers is journaled as soon as it arrives.
+        """
+        with TRACER.span('analysis', pages=len(texts), groq=self.groq_ready):
+            return self._analyze_texts(pdf_path, texts, job, on_progress, add_to_library)
+
+    def _analyze_texts(self, pdf_path, texts, job, on_progress, add_to_library):
+        total = len(texts)
+        journal = self.journal_for(pdf_path)
+        analyses = [journal.page(page_num + 1) if journal else None for page_num in range(total)]
+        todo = [page_index for page_index, analysis in enumerate(analyses) if analysis is None]
+        finished = [None] * (total - len(todo))
+
+        if finished:
+            print(f"♻️ Resuming {os.path.basename(pdf_path)}: {len(finished)}/{total} pages from checkpoint")
+            if on_progress:
+                on_progress(len(finished), total)
+
+        if self.groq_ready:
+            def on_result(todo_index, analysis):
+                page_index = todo[todo_index]
+                if isinstance(analysis, Exception):
+                    print(f"Groq analysis error (page {page_index + 1}): {str(analysis)[:100]}")
+                    analysis = self.rule_based_analysis(texts[page_index])
+                elif journal:
+                    journal.add_page(page_index + 1, analysis)
+                analyses[page_index] = analysis
+                finished.append(page_index)
+                if on_progress:
+                    on_progress(len(finished), total)
+
+            self.groq_page_analyses(texts, todo, on_result, job)
+        else:
+            for page_index in todo:
+                if job is not None:
+                    job.check()
+                analyses[page_index] = self.rule_based_analysis(texts[page_index])
+                finished.append(page_index)
+                if on_progress:
+                    on_progress(len(finished), total)
+
+        pages = [PageRecord(page_num + 1, text, analysis) for page_num, (text, analysis) in enumerate(zip(texts, analyses))]
+
+        if job is not None:
+            job.check()
+
+        # Keep the analyzed document in the persistent library
+        if add_to_library:
+            try:
+                with TRACER.span('library.add'):
+                    self.library.add_document(pdf_path, pages)
+            except Exception as e:
+                print(f"Library error: {e}")
+
+        with TRACER.span('index.build'):
+            return DocumentAnalysis(pdf_path, pages)
+
+    def groq_page_analyses(self, texts, page_indices, on_result=None, job=None):
+        """Groq analyses of the given pages, eight at a time; results (or exceptions) in order"""
+        return self.llm.run(self.llm.map(lambda page_index: self.groq_page_analysis(texts[page_index], page_index + 1),
+                                         page_indices, on_result, limit=8), job)
+
+    async def groq_page_analysis(self, text, page_num):
+        """One Groq page analysis; raises on API errors and unparsable replies"""
+        with TRACER.span('page.analyze', page=page_num):
+            return await self._groq_page_analysis(text, page_num)
+
+    async def _groq_page_analysis(self, text, page_num):
+        text_chunk = text[:3500].strip()
+        if len(text) > 3500:
+            text_chunk += " [Text truncated for analysis]"
+
+        prompt = f"""ANALYZE THIS TEXT AND EXTRACT INFORMATION:
+
+TEXT FROM PAGE {page_num}:
+"{text_chunk}"
+
+EXTRACTION TASKS:
+1. ENTITIES: Extract all important named entities (people, organizations, locations, technical terms)
+2. KEYWORDS: Extract 5-10 most important keywords or key phrases
+3. EVENTS: Extract key events, actions, or important occurrences
+
+OUTPUT FORMAT - Return ONLY a valid JSON object with this exact structure:
+{{
+  "entities": ["Entity 1", "Entity 2", "Entity 3"],
+  "keywords": ["Keyword 1", "Keyword 2", "Keyword 3"],
+  "events": ["Event 1", "Event 2", "Event 3"]
+}}
+
+RETURN ONLY THE JSON OBJECT:"""
+
+        result_text = await self.llm.chat(
+            self.text_provider,
+            self.text_model,
+            [
+                {
+                    "role": "system",
+                    "content": "You are an expert document analyst. Extract information accurately and return ONLY valid JSON."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=500,
+            temperature=0.1,
+            top_p=0.9
+        )
+        with TRACER.span('parse_json'):
+            clean_text = result_text.strip().replace('```json', '').replace('```', '').strip()
+            analysis_data = json.loads(clean_text)
+        return {
+            'entities': list(analysis_data.get('entities', []))[:8],
+            'keywords': list(analysis_data.get('keywords', []))[:6],
+            'events': list(analysis_data.get('events', []))[:5]
+        }
+
+    def rule_based_analysis(self, text):
+        """Offline analysis: entity extractor plus keyword and event patterns"""
+        with TRACER.span('page.rule_based'):
+            return self._rule_based_analysis(text)
+
+    def _rule_based_analysis(self, text):
+        analysis = {
+            'entities': [],
+            'keywords': [],
+            'events': []
+        }
+
+        # Entity extraction (one linear pass over the whole page)
+        for entity, role in ENTITY_EXTRACTOR.extract(text):
+            analysis['entities'].append(f"{entity} ({role})")
+
+        # Keywords extraction
+        universal_categories = {
+            "CHARACTERS": ['said', 'asked', 'replied', 'answered', 'whispered', 'shouted'],
+            "ACTIONS": ['went', 'came', 'ran', 'walked', 'entered', 'left', 'took', 'gave'],
+            "OBJECTS": ['book', 'letter', 'key', 'door', 'window', 'car', 'house', 'room'],
+            "EMOTIONS": ['happy', 'sad', 'angry', 'scared', 'surprised', 'excited'],
+            "TIME": ['morning', 'afternoon', 'evening', 'night', 'day', 'week', 'month', 'year'],
+            "LOCATIONS": ['home', 'office', 'school', 'hospital', 'street', 'park', 'city']
+        }
+
+        text_lower = text.lower()
+        for category, keywords in universal_categories.items():
+            found_keywords = [keyword.upper() for keyword in keywords if keyword in text_lower]
+            if found_keywords:
+                analysis['keywords'].append(f"{category}: {', '.join(found_keywords[:3])}")
+
+        # Events detection
+        event_patterns = [
+            ("DIALOGUE", ['"', 'said', 'asked', 'replied', 'answered']),
+            ("ACTION", ['went to', 'came from', 'ran towards', 'walked into']),
+            ("DISCOVERY", ['found', 'discovered', 'noticed', 'saw', 'observed']),
+            ("CONFLICT", ['argued', 'fought', 'disagreed', 'confronted']),
+            ("DECISION", ['decided', 'chose', 'selected', 'picked']),
+            ("REVELATION", ['realized', 'understood', 'learned', 'found out']),
+            ("TRANSITION", ['then', 'next', 'after', 'later', 'meanwhile']),
+            ("DESCRIPTION", ['was', 'were', 'had', 'looked', 'seemed', 'appeared'])
+        ]
+
+        for sentence in text.split('.'):
+            sentence_lower = sentence.lower().strip()
+            if len(sentence_lower) > 10:
+                for event_name, triggers in event_patterns:
+                    if any(trigger in sentence_lower for trigger in triggers):
+                        clean_sentence = sentence.strip()
+                        if len(clean_sentence) > 20:
+                            analysis['events'].append(f"{event_name}: {clean_sentence[:80]}...")
+                        break
+
+        # Drop repeats but keep page order, so the same page always gives the same ten
+        for key in analysis:
+            analysis[key] = list(dict.fromkeys(analysis[key]))[:10]
+
+        return analysis
+
+    # ==================== RULE-BASED ANSWERS ====================
+
+    def rule_based_answer(self, question, pages):
+        """Offline answer: relevant sentences plus who/when/where/... patterns, with page references
+
+        pages are the PageRecords of one document, or library.iter_pages()
+        (those carry a doc name, which then goes into the page labels).
+        """
+        with TRACER.span('question.rule_based', question=question[:80]):
+            return self._rule_based_answer(question, pages)
+
+    def _rule_based_answer(self, question, pages):
+        question_lower = question.lower()
+
+        answers_info = {
+            'direct_matches': [],
+            'context_matches': [],
+            'named_entities': [],
+            'page_references': set()
+        }
+
+        question_type = self.detect_question_type(question_lower)
+
+        for page_data in pages:
+            text = page_data.text
+            if page_data.doc:
+                page_num = f"{page_data.page} of {page_data.doc}"
+            else:
+                page_num = page_data.page
+
+            sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+
+            for sentence in sentences:
+                sentence_lower = sentence.lower()
+                relevance = self.calculate_relevance(sentence_lower, question_lower)
+
+                if relevance > 0.7:
+                    answers_info['direct_matches'].append({
+                        'text': sentence,
+                        'page': page_num,
+                        'relevance': relevance,
+                        'type': 'direct'
+                    })
+                    answers_info['page_references'].add(page_num)
+
+                elif relevance > 0.4:
+                    answers_info['context_matches'].append({
+                        'text': sentence,
+                        'page': page_num,
+                        'relevance': relevance,
+                        'type': 'context'
+                    })
+                    answers_info['page_references'].add(page_num)
+
+            if question_type == 'who':
+                self.extract_names_improved(answers_info, text, page_num, question_lower,
+                                            page_data.analysis)
+            elif question_type == 'when':
+                self.extract_dates_times(answers_info, text, page_num)
+            elif question_type == 'where':
+                self.extract_locations(answers_info, text, page_num)
+            elif question_type == 'number':
+                self.extract_numbers(answers_info, text, page_num)
+            elif question_type == 'why':
+                self.extract_reasons(answers_info, text, page_num)
+
+        return self.format_rule_based_answer(question, answers_info, question_type)
+
+    def detect_question_type(self, question_lower):
+        if 'who' in question_lower:
+            return 'who'
+        elif 'when' in question_lower:
+            return 'when'
+        elif 'where' in question_lower:
+            return 'where'
+        elif 'how many' in question_lower or 'how much' in question_lower:
+            return 'number'
+        elif 'why' in question_lower:
+            return 'why'
+        elif 'what' in question_lower:
+            return 'what'
+        elif 'how' in question_lower:
+            return 'how'
+        return 'general'
+
+    def calculate_relevance(self, sentence, question):
+        sentence_words = set(re.findall(r'\b\w+\b', sentence.lower()))
+        question_words = set(re.findall(r'\b\w+\b', question.lower()))
+
+        if not sentence_words or not question_words:
+            return 0.0
+
+        common_words = sentence_words.intersection(question_words)
+        score = len(common_words) / max(len(question_words), 1)
+
+        question_keywords = ['who', 'what', 'when', 'where', 'why', 'how']
+        for keyword in question_keywords:
+            if keyword in question and keyword in sentence:
+                score += 0.2
+
+        return min(score, 1.0)
+
+    def extract_names_improved(self, answers_info, text, page_num, question_lower, analysis=None):
+        if analysis:
+            for entity in analysis.get('entities', [])[:5]:
+                answers_info['named_entities'].append({
+                    'text': entity,
+                    'page': page_num,
+                    'type': 'entity'
+                })
+
+        name_patterns = [
+            r'Detective\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
+            r'Dr\.\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
+            r'Officer\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
+            r'Professor\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
+            r'\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b'
+        ]
+
+        for pattern in name_patterns:
+            matches = re.findall(pattern, text)
+            for match in matches:
+                if isinstance(match, tuple):
+                    name = ' '.join([m for m in match if m])
+                else:
+                    name = match
+
+                if (len(name) > 3 and
+                    name.lower() not in ['the', 'and', 'but', 'for'] and
+                    not any(month in name.lower() for month in ['january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october', 'november', 'december'])):
+
+                    is_relevant = True
+                    if 'detective' in question_lower and 'detective' not in name.lower():
+                        is_relevant = False
+
+                    if is_relevant:
+                        answers_info['named_entities'].append({
+                            'text': f"Identified: {name}",
+                            'page': page_num,
+                            'type': 'name'
+                        })
+
+    def extract_dates_times(self, answers_info, text, page_num):
+        date_patterns = [
+            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b',
+            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
+            r'\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b',
+            r'\b\d{1,2}:\d{2}\s*(?:AM|PM|GMT)?\b',
+            r'\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b',
+            r'\b(?:morning|afternoon|evening|night|noon|midnight)\b'
+        ]
+
+        for pattern in date_patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            for match in matches:
+                answers_info['named_entities'].append({
+                    'text': f"Date/Time: {match}",
+                    'page': page_num,
+                    'type': 'datetime'
+                })
+
+    def extract_locations(self, answers_info, text, page_num):
+        location_patterns = [
+            r'\b(?:at|in|near|by)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
+            r'\b(?:room|office|building|house|apartment|street|avenue|road)\s+[A-Z]?\d*\b',
+            r'coordinates?\s*[:=]?\s*(\d+\.\d+°?\s*[NS],?\s*\d+\.\d+°?\s*[EW])',
+            r'Server Room\s+[A-Z]'
+        ]
+
+        for pattern in location_patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            for match in matches:
+                if isinstance(match, tuple):
+                    location = ' '.join([m for m in match if m])
+                else:
+                    location = match
+
+                if len(location) > 3:
+                    answers_info['named_entities'].append({
+                        'text': f"Location: {location}",
+                        'page': page_num,
+                        'type': 'location'
+                    })
+
+    def extract_numbers(self, answers_info, text, page_num):
+        number_patterns = [
+            r'\b\d+\s*(?:percent|%)\b',
+            r'\b\d+\.?\d*\s*(?:TB|GB|MB|KB)\b',
+            r'\b\d+\s*(?:dollars|USD|Rs|rupees)\b',
+            r'\b\d+\s*(?:hours|minutes|seconds|days|weeks|months|years)\b',
+            r'\b\d+\.?\d*\s*(?:°C|degrees|℃)\b',
+            r'\b\d+\.?\d*\s*(?:GHz|MHz|Hz)\b'
+        ]
+
+        for pattern in number_patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            for match in matches:
+                answers_info['named_entities'].append({
+                    'text': f"Numerical: {match}",
+                    'page': page_num,
+                    'type': 'number'
+                })
+
+    def extract_reasons(self, answers_info, text, page_num):
+        reason_keywords = ['because', 'since', 'as', 'due to', 'reason', 'cause', 'therefore', 'thus']
+
+        sentences = text.split('.')
+        for sentence in sentences:
+            sentence_lower = sentence.lower()
+            for keyword in reason_keywords:
+                if keyword in sentence_lower:
+                    answers_info['named_entities'].append({
+                        'text': sentence.strip()[:150],
+                        'page': page_num,
+                        'type': 'reason'
+                    })
+                    break
+
+    def format_rule_based_answer(self, question, answers_info, question_type):
+        formatted = f"""{"="*70}
+🔍 QUESTION: {question}
+{"="*70}
+
+"""
+
+        answers_info['direct_matches'].sort(key=lambda x: x['relevance'], reverse=True)
+        answers_info['context_matches'].sort(key=lambda x: x['relevance'], reverse=True)
+
+        if answers_info['direct_matches']:
+            formatted += f"""✅ MOST RELEVANT MATCHES:
+{"-"*30}\n"""
+
+            for i, match in enumerate(answers_info['direct_matches'][:3], 1):
+                page_ref = f" (Page {match['page']})" if match['page'] else ""
+                formatted += f"""📌 {i}. {match['text'][:120]}...{page_ref}
+   Relevance: {match['relevance']:.1%}
+
+"""
+
+        if answers_info['context_matches'] and not answers_info['direct_matches']:
+            formatted += f"""📄 CONTEXTUAL INFORMATION:
+{"-"*30}\n"""
+
+            for i, match in enumerate(answers_info['context_matches'][:3], 1):
+                page_ref = f" (Page {match['page']})" if match['page'] else ""
+                formatted += f"""📌 {i}. {match['text'][:100]}...{page_ref}
+   Relevance: {match['relevance']:.1%}
+
+"""
+
+        if answers_info['named_entities'] and question_type in ['who', 'what']:
+            formatted += f"""👤 IDENTIFIED ENTITIES:
+{"-"*30}\n"""
+
+            unique_entities = []
+            seen = set()
+            for entity in answers_info['named_entities']:
+                if entity['text'] not in seen:
+                    seen.add(entity['text'])
+                    unique_entities.append(entity)
+
+            for i, entity in enumerate(unique_entities[:5], 1):
+                page_ref = f" (Page {entity['page']})" if entity['page'] else ""
+                formatted += f"   • {entity['text']}{page_ref}\n"
+            formatted += "\n"
+
+        if answers_info['page_references']:
+            pages = sorted(answers_info['page_references'])
+            formatted += f"""📄 RELEVANT PAGES: {', '.join(map(str, pages))}
+
+"""
+
+        total_matches = len(answers_info['direct_matches']) + len(answers_info['context_matches'])
+
+        if total_matches > 0:
+            formatted += f"""{"="*70}
+📊 SUMMARY:
+• Question Type: {question_type.upper()}
+• Total matches found: {total_matches}
+• Relevant pages: {len(answers_info['page_references'])}
+• Mode: Fast Rule-based Search
+• Status: ✅ Information found
+{"="*70}"""
+        else:
+            formatted += f"""❌ NO DIRECT MATCHES FOUND
+
+💡 SUGGESTIONS:
+1. Try rephrasing your question
+2. Use Smart AI mode for better understanding
+3. Check analysis sections above for context
+4. Search for specific keywords manually
+
+{"="*70}
+📊 SUMMARY:
+• Question Type: {question_type.upper()}
+• Mode: Fast Rule-based Search
+• Status: ⚠️ No direct matches found
+• Tip: Use more specific keywords
+{"="*70}"""
+
+        return formatted
+
+    # ==================== IMAGES ====================
+
+    def describe_images(self, images, model, job=None, on_result=None, limit=4, pdf_path=None, **options):
+        """Describe ImageRecords concurrently; on_result(index, description) as each finishes
+
+        With pdf_path, descriptions already in that PDF's checkpoint journal
+        are reused and new ones are journaled as they arrive. Failed calls
+        come back as an error text in place of the description.
+        """
+        journal = self.journal_for(pdf_path) if pdf_path else None
+        descriptions = [journal.description(img.page, img.index, model) if journal else None
+                        for img in images]
+        todo = [index for index, description in enumerate(descriptions) if description is None]
+
+        for index, description in enumerate(descriptions):
+            if description is not None and on_result:
+                on_result(index, description)
+
+        def on_described(todo_index, description):
+            index = todo[todo_index]
+            if isinstance(description, EngineError):
+                description = f"Error: API returned status {description.status}"
+            elif isinstance(description, Exception):
+                description = f"Error analyzing image: {str(description)[:100]}"
+            elif journal:
+                journal.add_description(images[index].page, images[index].index, model, description)
+            descriptions[index] = description
+            if on_result:
+                on_result(index, description)
+
+        self.llm.run(self.llm.map(lambda index: self.describe_image(MEMORY.image(images[index]), model, **options),
+                                  todo, on_described, limit=limit), job)
+        return descriptions
+
+    async def describe_image(self, pil_image, model, prompt=IMAGE_PROMPT, image_format="PNG", max_tokens=800):
+        """One OpenRouter vision call"""
+        with TRACER.span('image.describe', model=model):
+            return await self.llm.vision(self.vision_provider, model, prompt, pil_image,
+                                         image_format=image_format, max_tokens=max_tokens)
+
+    # ==================== LOCAL SEARCH ====================
+
+    def search(self, question, document=None, top_k=3, on_hit=None):
+        """Ranked search over one document, or over the whole library when document is None"""
+        with TRACER.span('search', library=document is None):
+            return self._search(question, document, top_k, on_hit)
+
+    def _search(self, question, document, top_k, on_hit):
+        if document is None:
+            hits = self.library.search(question, top_k=top_k, on_hit=on_hit)
+            results = [format_hit(hit) for hit in hits]
+            if results:
+                return "LIBRARY SEARCH RESULTS:\n\n" + "\n\n".join(results)
+            return "No matches found in the library. Try Groq AI mode for intelligent analysis."
+
+        index = document.search_index
+        hits = index.search(question, top_k=top_k, on_hit=on_hit)
+        results = [format_hit(hit) for hit in hits]
+
+        # No sentence holds every term: a typo or OCR artifact is likely, try the trigram index
+        if not hits or hits[0]['relevance'] < 1.0:
+            fuzzy_hits = index.fuzzy_search(question, top_k=top_k)
+            if fuzzy_hits and (not hits or fuzzy_hits[0]['relevance'] > hits[0]['relevance']):
+                results = [format_hit(hit) for hit in fuzzy_hits]
+                return "FAST SEARCH RESULTS (closest matches):\n\n" + "\n\n".join(results)
+
+        if results:
+            return "FAST SEARCH RESULTS:\n\n" + "\n\n".join(results)
+        return "No quick matches found. Try Groq AI mode for intelligent analysis."
+
+    def instant_answer(self, question, document=None):
+        """Local-only answer from the indexes; fast enough to show before any LLM call"""
+        with TRACER.span('question.local', question=question[:80]):
+            return self._instant_answer(question, document)
+
+    def _instant_answer(self, question, document):
+        if document is None:
+            return self.search(question, top_k=5)
+
+        question_lower = question.lower()
+        results = []
+
+        # Only pages the index says contain the phrase; quote the matching paragraph
+        for data in document.search_index.find_phrase(question_lower):
+            for para in data['text'].split('\n\n'):
+                if question_lower in para.lower():
+                    results.append(f"📄 Page {data['page']}:\n{para[:500]}...")
+                    break
+
+        # Typo-tolerant lookup before giving up on the text
+        if not results:
+            for hit in document.search_index.fuzzy_search(question):
+                results.append(f"🔤 Page {hit['page']} (closest match):\n{hit['text'][:500]}...")
+
+        # Search in extracted entities if no text matches
+        if not results:
+            store = document.entity_store
+            for entity in store.find('entities', question_lower):
+                pages = ', '.join(map(str, store.pages_for('entities', entity)))
+                results.append(f"👤 Entity: {entity} (Pages {pages})")
+
+            for keyword in store.find('keywords', question_lower):
+                pages = ', '.join(map(str, store.pages_for('keywords', keyword)))
+                results.append(f"🔑 Keyword: {keyword} (Pages {pages})")
+
+        if results:
+            return "SIMPLE SEARCH RESULTS:\n\n" + "\n\n".join(results[:5])
+        return self.overview_answer(question, document)
+
+    def overview_answer(self, question, document):
+        """Answer from the document as a whole (topics, main entities, opening text)"""
+        store = document.entity_store
+        question_lower = question.lower()
+
+        if any(word in question_lower for word in ['what is', 'what are', 'define', 'explain']):
+            return "Based on the PDF content, I can tell you about:\n\n" + \
+                   f"Main topics mentioned: {', '.join(label for label, _, _ in store.top('keywords', 10))}\n\n" + \
+                   f"Main characters/entities: {', '.join(label for label, _, _ in store.top('entities', 10))}"
+
+        elif any(word in question_lower for word in ['who is', 'who are', 'character']):
+            if not store.counts['entities']:
+                return "No specific entities extracted. Try analyzing with Groq AI for better results."
+            lines = []
+            for label, count, pages in store.top('entities', 15):
+                related = ', '.join(name for name, _ in store.related(label, 3))
+                line = f"• {label} - {count} mentions, pages {', '.join(map(str, pages[:10]))}"
+                if related:
+                    line += f" (often with {related})"
+                lines.append(line)
+            return "Main entities in the PDF:\n\n" + "\n".join(lines)
+
+        elif any(word in question_lower for word in ['summary', 'overview', 'main idea']):
+            return f"PDF Summary (from first page):\n\n{document.all_text[:500]}..."
+
+        return f"No direct matches found for: '{question}'\n\nTry:\n1. Using different keywords\n2. Asking specific questions\n3. Using Groq AI mode for intelligent analysis"
+
+    # ==================== LLM ANSWERS ====================
+
+    def context_for(self, question, document=None, max_chars=6000):
+        """LLM context: the most relevant library pages, or the start of one document"""
+        if document is None:
+            return self.library.context_for(question, max_chars=max_chars)
+        return document.all_text[:max_chars]
+
+    def chat(self, messages, job=None, on_partial=None, models=None, **params):
+        """Streamed answer, trying each model (answer_models by default) in turn; returns (text, model)
+
+        on_partial(text_so_far) runs on the engine loop thread while tokens arrive.
+        Transient errors are already retried by the provider; a model that still
+        fails hands over to the next one. Models whose recent calls all failed
+        are tried last (see telemetry.py). Raises AnswerError when none answered.
+        """
+        error_message = "No models to try"
+        for model in TELEMETRY.route(models or self.answer_models, self.text_provider):
+            # Stop between model fallbacks once the job is cancelled
+            if job is not None:
+                job.check()
+            try:
+                text = self.llm.run(self.llm.chat_stream(
+                    self.text_provider, model, messages, on_partial, **params), job).strip()
+            except Exception as e:
+                error_message = f"Model {model} failed: {str(e)[:100]}"
+                continue
+            if text:
+                return text, model
+            error_message = f"Model {model} returned an empty answer"
+        raise AnswerError(error_message)
+
+    def answer(self, question, document=None, job=None, on_partial=None):
+        """Answer a question from the document (or library) text; returns (text, model)"""
+        with TRACER.span('question.llm', question=question[:80]) as span:
+            text, model = self._answer(question, document, job, on_partial)
+            span['model'] = model
+            return text, model
+
+    def _answer(self, question, document, job, on_partial):
+        citation_note = "Cite the DOCUMENT name and PAGE number for every fact you use." if document is None else ""
+        prompt = f"""PDF CONTENT:
+{self.context_for(question, document)}
+
+QUESTION:
+{question}
+
+Please answer this question based ONLY on the PDF content above.
+Be accurate, thorough, and reference specific information from the text.
+{citation_note}"""
+
+        return self.chat(
+            [
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that answers questions based on provided PDF content. Use only the given text."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            job, on_partial,
+            temperature=0.3,
+            max_tokens=1000
+        )
@@ -0,0 +1,120 @@
+import re
+
+# Titles that introduce a name, mapped to the role reported for it
+HONORIFICS = {
+    'detective': 'detective', 'officer': 'detective', 'constable': 'detective',
+    'inspector': 'detective', 'sergeant': 'detective',
+    'dr': 'medical', 'doctor': 'medical', 'nurse': 'medical', 'surgeon': 'medical',
+    'physician': 'medical',
+    'professor': 'academic', 'prof': 'academic', 'lecturer': 'academic', 'teacher': 'academic',
+    'mr': 'person', 'mrs': 'person', 'ms': 'person', 'miss': 'person', 'master': 'person',
+}
+
+# Capitalized words that start sentences far more often than they name something
+LEADING_WORDS = frozenset({
+    'the', 'and', 'but', 'for', 'from', 'this', 'that', 'with', 'a', 'an', 'as', 'at', 'in',
+    'on', 'of', 'to', 'or', 'if', 'it', 'its', 'he', 'she', 'they', 'we', 'you', 'i', 'his',
+    'her', 'their', 'our', 'my', 'your', 'there', 'then', 'when', 'where', 'what', 'who',
+    'why', 'how', 'once', 'one', 'after', 'before', 'while', 'as', 'so', 'yet', 'all', 'some',
+    'these', 'those', 'each', 'every', 'no', 'not', 'yes', 'page', 'step', 'method', 'option',
+})
+
+MONTHS = frozenset({
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+    'october', 'november', 'december',
+})
+
+# Words stripped from the front of a title-case run
+SKIP_LEADING = LEADING_WORDS | MONTHS | frozenset(HONORIFICS)
+
+WORD = r"[A-Z][a-z]+(?:['’][a-z]+)?"
+# Only capitalized titles: "Miss Paris" is a name, "I miss Paris" is not
+HONORIFIC_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted((title.capitalize() for title in HONORIFICS), key=len, reverse=True)) + r")\.?\s+"
+    r"(" + WORD + r"(?:\s+" + WORD + r")?)"
+)
+TITLE_CASE_RUN = re.compile(r"\b" + WORD + r"(?:[ \t]+" + WORD + r")*")
+SPEECH_VERB = re.compile(r"\s+(?:said|asked|replied|went|came|took)\b")
+WORD_PATTERN = re.compile(r"[\w'’]+")
+POSSESSIVE = re.compile(r"['’]s$")
+
+
+class EntityExtractor:
+    """Offline named-entity heuristics that stay linear in the text size
+
+    Every pattern is compiled once at module level and each one makes a single
+    pass over the text; duplicates are dropped through a dict rather than list
+    lookups. Extra names can be taught through a gazetteer.
+    """
+
+    def __init__(self, gazetteer=None):
+        self.gazetteer = {}          # lowercase phrase -> (display name, role)
+        self.gazetteer_max_words = 0
+        for name, role in (gazetteer or {}).items():
+            self.add_gazetteer(name, role)
+
+    def add_gazetteer(self, name, role):
+        words = WORD_PATTERN.findall(name.lower())
+        if not words:
+            return
+        self.gazetteer[' '.join(words)] = (name, role)
+        self.gazetteer_max_words = max(self.gazetteer_max_words, len(words))
+
+    def extract(self, text):
+        """(entity, role) pairs in first-seen order, each entity reported once"""
+        found = {}
+        titled = set()
+
+        # Honorific + name: "Detective Sarah Chen", "Dr. Watson"
+        for match in HONORIFIC_PATTERN.finditer(text):
+            name = match.group(2)
+            if name.split()[0].lower() in HONORIFICS:
+                continue
+            title = text[match.start(1):match.start(2)].strip()
+            found.setdefault(f"{title} {name}", HONORIFICS[match.group(1).lower()])
+            titled.add(name)
+
+        # Runs of title-case words: "Server Room", "Sarah Chen", "Elara said"
+        for match in TITLE_CASE_RUN.finditer(text):
+            words = match.group(0).split()
+            stripped = False
+            while words and words[0].lower() in SKIP_LEADING:
+                words.pop(0)
+                stripped = True
+            if not words:
+                continue
+            entity = POSSESSIVE.sub('', ' '.join(words))
+            if len(entity) < 3 or entity in titled:
+                continue
+
+            if len(words) > 1:
+                found.setdefault(entity, 'person' if len(words) <= 3 else 'name')
+            elif SPEECH_VERB.match(text, match.end()):
+                found.setdefault(entity, 'person')
+            elif stripped or not self._starts_sentence(text, match.start()):
+                # A lone capital mid-sentence is a name; at a sentence start it is just grammar
+                found.setdefault(entity, 'name')
+
+        if self.gazetteer:
+            self._match_gazetteer(text, found)
+        return list(found.items())
+
+    def _starts_sentence(self, text, position):
+        position -= 1
+        while position >= 0 and text[position].isspace():
+            position -= 1
+        return position < 0 or text[position] in '.!?:;"“”\''
+
+    def _match_gazetteer(self, text, found):
+        words = WORD_PATTERN.findall(text.lower())
+        max_words = self.gazetteer_max_words
+        for i in range(len(words)):
+            for size in range(min(max_words, len(words) - i), 0, -1):
+                entry = self.gazetteer.get(' '.join(words[i:i + size]))
+                if entry:
+                    found[entry[0]] = entry[1]
+                    break
+
+
+# Shared instance used by both analyzers
+ENTITY_EXTRACTOR = EntityExtractor()
@@ -0,0 +1,105 @@
+import re
+from collections import Counter
+
+KINDS = ('entities', 'keywords', 'events')
+
+# Role suffixes added by the rule-based analysis, e.g. "John Smith (detective)"
+ROLE_SUFFIX = re.compile(r'\s*\([^)]*\)\s*$')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(value):
+    """Key used to merge spellings of the same entity/keyword/event"""
+    text = value if isinstance(value, str) else str(value)
+    text = ROLE_SUFFIX.sub('', text)
+    text = WHITESPACE.sub(' ', text).strip(' .,;:!?"\'-')
+    return text.casefold()
+
+
+class EntityStore:
+    """Aggregated entities, keywords and events for one document
+
+    Keeps occurrence counts, the pages each item appears on and a sparse
+    entity co-occurrence matrix, all updated page by page during analysis.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.labels = {kind: {} for kind in KINDS}     # key -> first seen spelling
+        self.counts = {kind: Counter() for kind in KINDS}
+        self.postings = {kind: {} for kind in KINDS}   # key -> set of pages
+        self.cooccurrence = {}                         # entity key -> Counter of entity keys
+        self.pages = 0
+
+    def add_page(self, page_num, analysis):
+        """Fold one page's analysis into the aggregates"""
+        if not analysis:
+            return
+        self.pages += 1
+
+        for kind in KINDS:
+            page_keys = []
+            for value in analysis.get(kind) or []:
+                key = normalize(value)
+                if not key:
+                    continue
+                label = WHITESPACE.sub(' ', ROLE_SUFFIX.sub('', str(value))).strip()
+                self.labels[kind].setdefault(key, label)
+                self.counts[kind][key] += 1
+                self.postings[kind].setdefault(key, set()).add(page_num)
+                page_keys.append(key)
+
+            if kind == 'entities':
+                self._add_cooccurrence(dict.fromkeys(page_keys))
+
+    def _add_cooccurrence(self, keys):
+        keys = list(keys)
+        for i, key in enumerate(keys):
+            row = self.cooccurrence.setdefault(key, Counter())
+            for other in keys[i + 1:]:
+                row[other] += 1
+                self.cooccurrence.setdefault(other, Counter())[key] += 1
+
+    # ==================== QUERIES ====================
+
+    def __len__(self):
+        return sum(len(self.counts[kind]) for kind in KINDS)
+
+    def label(self, kind, key):
+        return self.labels[kind].get(key, key)
+
+    def top(self, kind, n=10):
+        """Most frequent items as (label, count, sorted pages)"""
+        return [
+            (self.label(kind, key), count, sorted(self.postings[kind][key]))
+            for key, count in self.counts[kind].most_common(n)
+        ]
+
+    def pages_for(self, kind, value):
+        return sorted(self.postings[kind].get(normalize(value), ()))
+
+    def related(self, entity, n=5):
+        """Entities that most often share a page with the given one"""
+        row = self.cooccurrence.get(normalize(entity), Counter())
+        return [(self.label('entities', key), count) for key, count in row.most_common(n)]
+
+    def top_pairs(self, n=5):
+        pairs = Counter()
+        for key, row in self.cooccurrence.items():
+            for other, count in row.items():
+                if key < other:
+                    pairs[(key, other)] = count
+        return [
+            (self.label('entities', a), self.label('entities', b), count)
+            for (a, b), count in pairs.most_common(n)
+        ]
+
+    def find(self, kind, query):
+        """Items whose normalized form contains the query"""
+        query_key = normalize(query)
+        if not query_key:
+            return []
+        return [self.label(kind, key) for key, _ in self.counts[kind].most_common()
+                if query_key in key]
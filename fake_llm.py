@@ -0,0 +1,202 @@
+"""In-process fake of an OpenAI-compatible chat API, for offline load tests
+
+    from fake_llm import FakeLLMServer
+    with FakeLLMServer(latency=0.2, error_rate=0.05) as fake:
+        engine.add_provider(providers.openai_compatible("fake", fake.url))
+
+    python fake_llm.py --port 8900 --latency 0.2     # standalone
+
+Serves POST /v1/chat/completions (plain and streamed, with usage) and
+GET /v1/models. Replies are canned but shaped like the real thing: page
+analysis prompts get a JSON analysis, questions get a short answer and
+vision prompts a description. latency/jitter delay every response,
+error_rate answers a share of requests with 429 or 503 so the retry path
+gets exercised, and tokens_per_second paces streamed replies.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+def stub_reply(messages):
+    """Canned reply shaped like what the analyzers expect for these messages"""
+    content = messages[-1]['content']
+    if isinstance(content, list):
+        return "Stub description of the image."
+
+    if "JSON" in content:
+        # Only the page text, not the instructions that follow it
+        page_text = content.split("EXTRACTION TASKS")[0]
+        names = Counter(re.findall(r"\b[A-Z][a-z]{2,}\b", page_text))
+        words = Counter(re.findall(r"\b[a-z]{6,}\b", page_text))
+        return json.dumps({
+            'entities': [name for name, _ in names.most_common(8)],
+            'keywords': [word for word, _ in words.most_common(6)],
+            'events': []
+        })
+
+    question = content.split("QUESTION:")[-1].strip().split("\n")[0]
+    return f"Stub answer to: {question}"
+
+
+def count_tokens(text):
+    """Rough token count (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    server_version = "FakeLLM/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'fake-model', 'object': 'model'}]})
+        else:
+            self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        fake = self.server.fake
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+        fake.count_request()
+        time.sleep(max(0.0, fake.latency + random.uniform(-fake.jitter, fake.jitter)))
+
+        if fake.error_rate and random.random() < fake.error_rate:
+            fake.count_error()
+            if random.random() < 0.5:
+                self._send_json(429, {'error': {'message': 'rate limited (fake)'}}, {'Retry-After': '0.05'})
+            else:
+                self._send_json(503, {'error': {'message': 'overloaded (fake)'}})
+            return
+
+        model = request.get('model', 'fake-model')
+        text = stub_reply(request['messages'])
+        prompt_text = json.dumps(request['messages'])
+        usage = {
+            'prompt_tokens': count_tokens(prompt_text),
+            'completion_tokens': count_tokens(text),
+        }
+        usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+
+        if request.get('stream'):
+            self._stream(model, text, usage)
+        else:
+            self._send_json(200, {
+                'id': f"fake-{fake.requests}",
+                'object': 'chat.completion',
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                             'finish_reason': 'stop'}],
+                'usage': usage
+            })
+
+    def _stream(self, model, text, usage):
+        fake = self.server.fake
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+
+        words = text.split(" ")
+        for position, word in enumerate(words):
+            delta = word if position == 0 else " " + word
+            chunk = {'object': 'chat.completion.chunk', 'model': model,
+                     'choices': [{'index': 0, 'delta': {'content': delta}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            if fake.tokens_per_second:
+                time.sleep(1.0 / fake.tokens_per_second)
+
+        final = {'object': 'chat.completion.chunk', 'model': model,
+                 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}], 'usage': usage}
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode('utf-8'))
+
+
+class FakeLLMServer:
+    """Fake OpenAI-compatible server on a background thread; url is its /v1 base"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.0, error_rate=0.0,
+                 tokens_per_second=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tokens_per_second = tokens_per_second
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), FakeLLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 256
+        self.httpd.fake = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def count_error(self):
+        with self.lock:
+            self.errors += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="fake-llm")
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible chat server")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds before each response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="+/- seconds of random latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered 429/503")
+    parser.add_argument('--tokens-per-second', type=float, default=0, help="pace streamed replies (0 = no pacing)")
+    args = parser.parse_args(argv)
+
+    fake = FakeLLMServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.tokens_per_second)
+    print(f"🧪 Fake LLM on {fake.url}")
+    try:
+        fake.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n⏹ {fake.requests} requests, {fake.errors} simulated errors")
+    finally:
+        fake.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
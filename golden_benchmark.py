@@ -0,0 +1,259 @@
+"""Golden benchmark: fixed questions on the bundled PDFs, latency next to answer quality
+
+    python golden_benchmark.py                        # replay recorded LLM answers
+    python golden_benchmark.py --repeat 20 --output golden.json
+    GROQ_API_KEY=... python golden_benchmark.py --record
+    python golden_benchmark.py --record --llm-url http://localhost:8000/v1 --llm-model llama3
+
+Every question of GOLDEN has the pages its answer is on and the terms a
+correct answer must mention. Each one runs through the three ways the app
+answers: rule_based_answer (index1's fast mode), instant_answer (index2's
+simple search) and the LLM answer. The LLM answer replays responses that
+--record captured from the real API (golden_recordings.json), including
+their latency, so runs are repeatable offline; without recordings the LLM
+column is skipped. Only record against a real model: recordings from
+fake_llm.py would report canned answers and synthetic latency as if they
+were a quality comparison. A method "hits" a question when its answer
+references an expected page and mentions every expected term. Reported
+per document and method: hit rate plus p50/p95 latency over --repeat runs.
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from async_engine import AsyncEngine
+from benchmark import latency_summary, revision
+from engine import PDFEngine, AnswerError
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RECORDINGS_PATH = os.path.join(HERE, "golden_recordings.json")
+
+# Pages are PDF page numbers (guidence.pdf prints its own numbers one lower in the footer)
+GOLDEN = {
+    'story.pdf': [
+        {'question': "Who is Elara?", 'pages': [1], 'terms': ["Elara"]},
+        {'question': "What is the name of the owl?", 'pages': [1], 'terms': ["Hoot"]},
+        {'question': "Where did Elara find the hidden pathway?", 'pages': [2], 'terms': ["pathway"]},
+        {'question': "What did Elara find behind the waterfall?", 'pages': [3], 'terms': ["cave"]},
+        {'question': "What creatures did they encounter in the forest?", 'pages': [3], 'terms': ["sprites"]},
+        {'question': "What color was the lake?", 'pages': [3], 'terms': ["turquoise"]},
+        {'question': "Who is Elarra?", 'pages': [1, 2, 3], 'terms': ["Elara"]},   # Typo on purpose
+    ],
+    'guidence.pdf': [
+        {'question': "What is the minimum RAM?", 'pages': [4], 'terms': ["2 GB"]},
+        {'question': "How many requests per minute does the Groq free tier allow?", 'pages': [6, 10],
+         'terms': ["30 requests"]},
+        {'question': "Where do I get an OpenRouter API key?", 'pages': [6], 'terms': ["openrouter.ai"]},
+        {'question': "How do I fix No module named fitz?", 'pages': [9], 'terms': ["pip install PyMuPDF"]},
+        {'question': "Which Python version is required?", 'pages': [4], 'terms': ["3.8"]},
+        {'question': "What is the keyboard shortcut to quit?", 'pages': [12], 'terms': ["Ctrl+Q"]},
+        {'question': "Can I use it without API keys?", 'pages': [11], 'terms': ["offline"]},
+        {'question': "What version of Pillow is in requirements.txt?", 'pages': [13], 'terms': ["10.1.0"]},
+    ]
+}
+
+METHODS = ['rule_based_answer', 'simple_search', 'llm']
+
+
+# ==================== RECORDED LLM ====================
+
+def recording_key(messages):
+    return hashlib.sha1(json.dumps(messages, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class RecordedEngine(AsyncEngine):
+    """AsyncEngine that replays recorded chat_stream responses (or records them with record=True)
+
+    Responses are keyed by the exact messages, so a recording goes stale (and
+    counts as missing) as soon as the prompt or its context changes. Replays
+    wait the recorded latency unless replay_latency is off.
+    """
+
+    def __init__(self, recordings=None, record=False, replay_latency=True, **kwargs):
+        super().__init__(**kwargs)
+        self.recordings = recordings if recordings is not None else {}
+        self.record = record
+        self.replay_latency = replay_latency
+        self.missing = 0
+
+    async def chat_stream(self, provider, model, messages, on_delta=None, **params):
+        key = recording_key(messages)
+        if self.record:
+            started = time.perf_counter()
+            text = await super().chat_stream(provider, model, messages, on_delta, **params)
+            self.recordings[key] = {'model': model, 'text': text,
+                                    'seconds': round(time.perf_counter() - started, 3)}
+            return text
+
+        recorded = self.recordings.get(key)
+        if recorded is None:
+            self.missing += 1
+            return ""   # Counts as an empty answer; the engine moves on and finally gives up
+        if self.replay_latency:
+            await asyncio.sleep(recorded['seconds'])
+        if on_delta:
+            on_delta(recorded['text'])
+        return recorded['text']
+
+
+def load_recordings(path=RECORDINGS_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# ==================== SCORING ====================
+
+def referenced_pages(answer):
+    """Page numbers an answer points at ("Page 3", "Pages 1, 2", "RELEVANT PAGES: 2, 4")"""
+    # Printed footers like "Page 3 of 12" are document text, not references
+    answer = re.sub(r'Page \d+ of \d+', '', answer)
+    pages = set()
+    for group in re.findall(r'\bpages?\s*:?\s*(\d+(?:\s*(?:,|and)\s*\d+)*)', answer, re.IGNORECASE):
+        pages.update(int(number) for number in re.findall(r'\d+', group))
+    return pages
+
+
+def score(answer, expected):
+    answer_lower = answer.lower()
+    page_hit = bool(referenced_pages(answer) & set(expected['pages']))
+    term_hit = all(term.lower() in answer_lower for term in expected['terms'])
+    return {'page_hit': page_hit, 'term_hit': term_hit, 'hit': page_hit and term_hit}
+
+
+# ==================== RUNNING ====================
+
+def answer_with(engine, method, question, document):
+    if method == 'rule_based_answer':
+        return engine.rule_based_answer(question, document.pages)
+    if method == 'simple_search':
+        return engine.instant_answer(question, document)
+    try:
+        return engine.answer(question, document)[0]
+    except AnswerError:
+        return ""
+
+
+def run_golden(repeat=5, record=False, replay_latency=True, recordings_path=RECORDINGS_PATH,
+               llm_url=None, llm_model=None):
+    """Run every golden question through every method; returns the results dict"""
+    recordings = {} if record else load_recordings(recordings_path)
+    llm = RecordedEngine(recordings, record=record, replay_latency=replay_latency)
+    engine = PDFEngine(llm=llm, journal_dir=None)
+    if llm_url:
+        engine.use_endpoint(llm_url, os.environ.get('INTELLEX_LLM_KEY', ''), model=llm_model)
+    methods = list(METHODS)
+    if record:
+        if not engine.check_groq():
+            raise RuntimeError("Recording needs a working LLM connection (GROQ_API_KEY or --llm-url)")
+        repeat = 1
+    elif not recordings:
+        methods.remove('llm')
+        print("⚠️ No recorded LLM answers, skipping the LLM method (record them with --record)", file=sys.stderr)
+
+    results = {
+        'benchmark': 'intellex-golden',
+        'revision': revision(),
+        'settings': {'repeat': repeat, 'replay_latency': replay_latency, 'recorded': len(recordings)},
+        'documents': []
+    }
+
+    try:
+        for pdf_name, questions in GOLDEN.items():
+            # The documents are analyzed offline so the indexes do not depend on the API
+            engine.groq_ready = False
+            document = engine.analyze_document(os.path.join(HERE, pdf_name), add_to_library=False)
+            engine.groq_ready = True
+
+            entry = {'pdf': pdf_name, 'methods': {}}
+            for method in methods:
+                seconds = []
+                details = []
+                for expected in questions:
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        answer = answer_with(engine, method, expected['question'], document)
+                        seconds.append(time.perf_counter() - started)
+                    details.append({'question': expected['question'], **score(answer, expected)})
+
+                entry['methods'][method] = {
+                    'hit_rate': round(sum(item['hit'] for item in details) / len(details), 3),
+                    'page_hit_rate': round(sum(item['page_hit'] for item in details) / len(details), 3),
+                    'term_hit_rate': round(sum(item['term_hit'] for item in details) / len(details), 3),
+                    'latency': latency_summary(seconds),
+                    'questions': details
+                }
+            results['documents'].append(entry)
+    finally:
+        llm.stop()
+
+    if record:
+        with open(recordings_path, 'w', encoding='utf-8') as f:
+            json.dump(recordings, f, indent=1, ensure_ascii=False)
+        print(f"💾 {len(recordings)} responses recorded to {recordings_path}", file=sys.stderr)
+    elif llm.missing:
+        print(f"⚠️ {llm.missing} LLM prompts had no recording (stale recordings? re-run --record)", file=sys.stderr)
+    results['settings']['missing_recordings'] = llm.missing
+    return results
+
+
+def print_results(results):
+    print(f"Revision {results['revision'] or '?'}, {results['settings']['repeat']} run(s) per question\n")
+    header = f"{'document':<14}{'method':<20}{'hit rate':>9}{'pages':>8}{'terms':>8}{'p50 ms':>10}{'p95 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for entry in results['documents']:
+        for method, summary in entry['methods'].items():
+            print(f"{entry['pdf']:<14}{method:<20}{summary['hit_rate']:>9.0%}{summary['page_hit_rate']:>8.0%}"
+                  f"{summary['term_hit_rate']:>8.0%}{summary['latency']['p50_ms']:>10.2f}"
+                  f"{summary['latency']['p95_ms']:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency and hit rate on the bundled PDFs")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per question (for the latency percentiles)")
+    parser.add_argument('--record', action='store_true', help="call the real API and record its answers")
+    parser.add_argument('--no-replay-latency', action='store_true',
+                        help="replay recorded answers instantly instead of at their recorded speed")
+    parser.add_argument('--recordings', default=RECORDINGS_PATH, help="recorded LLM answers (JSON)")
+    parser.add_argument('--llm-url', help="record from this OpenAI-compatible base URL instead of Groq")
+    parser.add_argument('--llm-model', help="model name to use with --llm-url")
+    parser.add_argument('--output', help="write the results JSON to this file")
+    parser.add_argument('--verbose', action='store_true', help="list the questions each method missed")
+    args = parser.parse_args(argv)
+
+    try:
+        # Engine progress messages would mix into the table
+        with contextlib.redirect_stdout(sys.stderr):
+            results = run_golden(max(1, args.repeat), args.record, not args.no_replay_latency, args.recordings,
+                                 args.llm_url, args.llm_model)
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Results saved to {args.output}", file=sys.stderr)
+
+    print_results(results)
+    if args.verbose:
+        for entry in results['documents']:
+            for method, summary in entry['methods'].items():
+                for item in summary['questions']:
+                    if not item['hit']:
+                        reason = "wrong page" if item['term_hit'] else "missing terms" if item['page_hit'] else "both"
+                        print(f"  ✗ {entry['pdf']} {method}: {item['question']} ({reason})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
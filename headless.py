@@ -0,0 +1,156 @@
+"""Analyze a PDF without any window
+
+    python headless.py story.pdf
+    python headless.py story.pdf --ask "Who is Elara?" --ask "What happens at the end?"
+    python headless.py guidence.pdf --json > report.json
+
+Uses the same engine as both windows. With GROQ_API_KEY set, pages are
+analyzed and questions answered by Groq; otherwise everything runs offline
+with the rule-based analysis and local search. Documents are only added to
+the persistent library with --library. Groq page results are checkpointed,
+so a run that died halfway resumes where it stopped (--no-checkpoint to
+start over).
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from engine import PDFEngine, AnswerError
+from fake_llm import FakeLLMServer
+from memory import MEMORY, MB, deep_size
+from telemetry import TELEMETRY
+from tracing import TRACER
+
+
+def run(pdf_path, questions=(), use_llm=True, add_to_library=False, checkpoint=True, llm_url=None, llm_model=None):
+    """Analyze one PDF and answer questions; returns a JSON-friendly report"""
+    engine = PDFEngine() if checkpoint else PDFEngine(journal_dir=None)
+    if llm_url:
+        engine.use_endpoint(llm_url, os.environ.get('INTELLEX_LLM_KEY', ''), model=llm_model)
+    started = time.perf_counter()
+
+    if use_llm:
+        engine.check_groq()
+    else:
+        engine.groq_status = "Disabled"
+
+    document = engine.analyze_document(pdf_path, add_to_library=add_to_library)
+    analyzed = time.perf_counter()
+    MEMORY.track('pages', deep_size(document.pages))
+    MEMORY.track('all_text', deep_size(document.all_text))
+
+    store = document.entity_store
+    report = {
+        'pdf': pdf_path,
+        'pages': len(document),
+        'groq': engine.groq_status,
+        'analysis_seconds': round(analyzed - started, 3),
+        'entities': [{'label': label, 'count': count, 'pages': pages} for label, count, pages in store.top('entities', 10)],
+        'keywords': [{'label': label, 'count': count, 'pages': pages} for label, count, pages in store.top('keywords', 10)],
+        'answers': []
+    }
+
+    for question in questions:
+        entry = {'question': question}
+        question_start = time.perf_counter()
+        entry['local'] = engine.instant_answer(question, document)
+        entry['local_ms'] = round((time.perf_counter() - question_start) * 1000, 2)
+
+        if engine.groq_ready:
+            try:
+                entry['llm'], entry['model'] = engine.answer(question, document)
+            except AnswerError as e:
+                entry['llm_error'] = str(e)
+        entry['seconds'] = round(time.perf_counter() - question_start, 3)
+        report['answers'].append(entry)
+
+    report['llm_usage'] = {name: usage for name, usage in engine.llm.usage().items() if usage['requests'] or usage['failures']}
+    report['models'] = TELEMETRY.snapshot()
+    report['memory'] = {**MEMORY.usage(), 'largest': MEMORY.largest_allocations()}
+
+    root = TRACER.last_root('document')
+    report['timing'] = [{'span': entry['name'], 'count': entry['count'], 'seconds': round(entry['total'], 4)}
+                        for entry in TRACER.summary(TRACER.run_spans(root))] if root else []
+    return report
+
+
+def print_report(report):
+    print(f"📄 {report['pdf']}: {report['pages']} pages analyzed in {report['analysis_seconds']:.2f}s "
+          f"(Groq: {report['groq']})")
+    print("👤 Entities: " + ", ".join(f"{item['label']} x{item['count']}" for item in report['entities']))
+    print("🔑 Keywords: " + ", ".join(f"{item['label']} x{item['count']}" for item in report['keywords']))
+
+    for entry in report['answers']:
+        print(f"\n❓ {entry['question']}")
+        print(f"⚡ Local answer ({entry['local_ms']:.1f} ms):\n{entry['local']}")
+        if 'llm' in entry:
+            print(f"\n🧠 Groq answer ({entry['model']}, {entry['seconds']:.2f}s):\n{entry['llm']}")
+        elif 'llm_error' in entry:
+            print(f"\n⚠️ {entry['llm_error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a PDF without the GUI")
+    parser.add_argument('pdf', help="PDF file to analyze")
+    parser.add_argument('--ask', action='append', default=[], metavar='QUESTION',
+                        help="question to answer (repeatable)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--offline', action='store_true', help="never call Groq, even with GROQ_API_KEY set")
+    parser.add_argument('--library', action='store_true', help="add the document to the persistent library")
+    parser.add_argument('--no-checkpoint', action='store_true', help="ignore and do not write the checkpoint journal")
+    parser.add_argument('--llm-url', help="OpenAI-compatible base URL for all LLM calls (key: INTELLEX_LLM_KEY)")
+    parser.add_argument('--llm-model', help="model name to use with --llm-url")
+    parser.add_argument('--fake-llm', type=float, metavar='LATENCY',
+                        help="use an in-process fake LLM endpoint with this latency (seconds)")
+    parser.add_argument('--trace', metavar='FILE', help="write every span as a Chrome trace (JSON)")
+    parser.add_argument('--metrics', metavar='FILE', help="write span timings in Prometheus text format")
+    parser.add_argument('--timing', action='store_true', help="print where the analysis spent its time")
+    parser.add_argument('--memory-budget', type=float, metavar='MB', help="memory budget (default 1024 MB)")
+    parser.add_argument('--memory-report', action='store_true',
+                        help="trace allocations and print the largest memory holders")
+    args = parser.parse_args(argv)
+
+    if args.memory_budget is not None:
+        MEMORY.limit = int(args.memory_budget * MB)
+    if args.memory_report:
+        tracemalloc.start()
+
+    fake = FakeLLMServer(latency=args.fake_llm).start() if args.fake_llm is not None else None
+    try:
+        # Engine progress messages would corrupt the JSON on stdout
+        with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+            # Fake answers must never end up in the real checkpoint journal
+            report = run(args.pdf, args.ask, use_llm=not args.offline, add_to_library=args.library,
+                         checkpoint=not args.no_checkpoint and fake is None,
+                         llm_url=fake.url if fake else args.llm_url, llm_model=args.llm_model)
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        if fake:
+            fake.stop()
+
+    if args.trace:
+        TRACER.export_json(args.trace)
+        print(f"💾 Trace written to {args.trace}", file=sys.stderr)
+    if args.metrics:
+        TRACER.export_prometheus(args.metrics)
+        print(f"💾 Metrics written to {args.metrics}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+        if args.timing:
+            print("\n" + TRACER.report())
+        if args.memory_report:
+            print("\n" + MEMORY.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
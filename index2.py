@@ -1,779 +1,772 @@
-import customtkinter as ctk
-import tkinter as tk
-from tkinter import filedialog, messagebox
-import fitz  # PyMuPDF
-import threading
-import os
-import re
-import requests
-import base64
-import json
-from datetime import datetime
-import warnings
-from io import BytesIO
-from PIL import Image
-
-# Hide deprecation warnings
-warnings.filterwarnings("ignore")
-
-# Configuration for CustomTkinter
-ctk.set_appearance_mode("Dark")  # Modes: "System" (standard), "Dark", "Light"
-ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
-
-class SmartPDFAnalyzer(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-
-        # Window Setup
-        self.title("Smart PDF Analyzer - Competition Edition")
-        self.geometry("1400x900")
-        
-        # Data storage
-        self.pdf_data = []
-        self.current_pdf = None
-        self.current_page = 0
-        self.total_pages = 0
-        self.all_text = ""
-        self.images_data = []
-        self.current_image_index = 0
-        self.image_descriptions = {}
-        self.all_entities = []
-        self.all_keywords = []
-        self.all_events = []
-        
-        # API Keys
-        self.groq_api_key = ""
-        self.openrouter_api_key = ""
-        
-        # Initialize APIs
-        self.groq_client = None
-        self.groq_status = "Not Initialized"
-        self.setup_groq()
-        
-        # Image Models
-        self.image_models = [
-            "qwen/qwen-2.5-vl-72b-instruct",
-               "anthropic/claude-3-haiku", # Free tier available
-    "openai/gpt-4o-mini",   
-            "meta-llama/llama-3.2-11b-vision-instruct"
-        ]
-        
-        self.create_gui()
-
-    def setup_groq(self):
-        """Setup Groq API"""
-        try:
-            from groq import Groq
-            self.groq_client = Groq(api_key=self.groq_api_key)
-            
-            # Test the connection immediately
-            test_response = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[{"role": "user", "content": "Test"}],
-                max_tokens=5
-            )
-            self.groq_status = "Connected ✅"
-            print("Groq API Connection: SUCCESS")
-            return True
-        except ImportError:
-            self.groq_status = "Package Missing ❌"
-            print("ERROR: Please run: pip install groq")
-            return False
-        except Exception as e:
-            self.groq_status = f"Error: {str(e)[:50]} ❌"
-            print(f"Groq API Connection Error: {e}")
-            return False
-
-    def create_gui(self):
-        # Configure grid layout (1x2)
-        self.grid_columnconfigure(1, weight=1)
-        self.grid_rowconfigure(0, weight=1)
-
-        # ============ SIDEBAR (LEFT) ============
-        self.sidebar_frame = ctk.CTkFrame(self, width=280, corner_radius=0)
-        self.sidebar_frame.grid(row=0, column=0, sticky="nsew")
-        self.sidebar_frame.grid_rowconfigure(9, weight=1)
-
-        # Logo / Title
-        self.logo_label = ctk.CTkLabel(self.sidebar_frame, text="🚀 PDF ANALYZER", 
-                                     font=ctk.CTkFont(size=20, weight="bold"))
-        self.logo_label.grid(row=0, column=0, padx=20, pady=(20, 10))
-        
-        self.subtitle_label = ctk.CTkLabel(self.sidebar_frame, text="Competition Edition", 
-                                         text_color="gray")
-        self.subtitle_label.grid(row=1, column=0, padx=20, pady=(0, 20))
-
-        # File Selection
-        self.btn_browse = ctk.CTkButton(self.sidebar_frame, text="📂 Open PDF File", 
-                                      command=self.browse_pdf, height=40,
-                                      fg_color="#2E7D32", hover_color="#1B5E20")
-        self.btn_browse.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
-        
-        self.label_filename = ctk.CTkLabel(self.sidebar_frame, text="No File Selected", 
-                                         text_color="gray", wraplength=200)
-        self.label_filename.grid(row=3, column=0, padx=20, pady=(0, 10))
-
-        # Start Analysis Button
-        self.btn_analyze = ctk.CTkButton(self.sidebar_frame, text="▶ Start Text Analysis", 
-                                       command=self.start_analysis, state="disabled",
-                                       height=40)
-        self.btn_analyze.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
-
-        # Image Analysis Settings
-        self.separator_1 = ctk.CTkLabel(self.sidebar_frame, text="🖼️ IMAGE ANALYSIS", 
-                                      font=ctk.CTkFont(size=12, weight="bold"))
-        self.separator_1.grid(row=5, column=0, padx=20, pady=(20, 5), sticky="w")
-        
-        self.option_model = ctk.CTkOptionMenu(self.sidebar_frame, values=self.image_models)
-        self.option_model.grid(row=6, column=0, padx=20, pady=5, sticky="ew")
-        
-        self.btn_analyze_img = ctk.CTkButton(self.sidebar_frame, text="🔍 Analyze Images", 
-                                           command=self.analyze_images, state="disabled",
-                                           fg_color="#C62828", hover_color="#B71C1C")
-        self.btn_analyze_img.grid(row=7, column=0, padx=20, pady=10, sticky="ew")
-
-        # Progress Bar (Bottom of Sidebar)
-        self.progress_bar = ctk.CTkProgressBar(self.sidebar_frame)
-        self.progress_bar.grid(row=10, column=0, padx=20, pady=10, sticky="ew")
-        self.progress_bar.set(0)
-        
-        # API Status Display
-        self.api_status_label = ctk.CTkLabel(self.sidebar_frame, text=f"Groq: {self.groq_status}", 
-                                           font=("Arial", 10))
-        self.api_status_label.grid(row=11, column=0, padx=20, pady=(10, 5))
-        
-        self.status_label = ctk.CTkLabel(self.sidebar_frame, text="Ready", font=("Arial", 10))
-        self.status_label.grid(row=12, column=0, padx=20, pady=(0, 20))
-
-        # ============ MAIN CONTENT (RIGHT) ============
-        self.main_view = ctk.CTkTabview(self, corner_radius=10)
-        self.main_view.grid(row=0, column=1, padx=20, pady=20, sticky="nsew")
-        
-        self.tab_dashboard = self.main_view.add("📊 Dashboard")
-        self.tab_reader = self.main_view.add("📖 Reader & Images")
-        self.tab_search = self.main_view.add("❓ Smart Search")
-
-        self.setup_reader_tab()
-        self.setup_dashboard_tab()
-        self.setup_search_tab()
-
-    def setup_reader_tab(self):
-        """Setup the Reader Tab (Split Text and Image)"""
-        self.tab_reader.grid_columnconfigure(0, weight=1)
-        self.tab_reader.grid_columnconfigure(1, weight=1)
-        self.tab_reader.grid_rowconfigure(1, weight=1)
-
-        # Navigation Bar
-        nav_frame = ctk.CTkFrame(self.tab_reader, height=50, fg_color="transparent")
-        nav_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 10))
-        
-        self.btn_prev_page = ctk.CTkButton(nav_frame, text="◀ Prev", width=80, 
-                                         command=self.prev_page, state="disabled")
-        self.btn_prev_page.pack(side="left")
-        
-        self.lbl_page_counter = ctk.CTkLabel(nav_frame, text="Page 0 / 0", font=("Arial", 14, "bold"))
-        self.lbl_page_counter.pack(side="left", padx=20)
-        
-        self.btn_next_page = ctk.CTkButton(nav_frame, text="Next ▶", width=80, 
-                                         command=self.next_page, state="disabled")
-        self.btn_next_page.pack(side="left")
-
-        # Text Area (Left)
-        text_frame = ctk.CTkFrame(self.tab_reader)
-        text_frame.grid(row=1, column=0, sticky="nsew", padx=(0, 5))
-        
-        ctk.CTkLabel(text_frame, text="TEXT CONTENT", font=("Arial", 12, "bold")).pack(pady=5)
-        self.textbox_content = ctk.CTkTextbox(text_frame, font=("Courier New", 13))
-        self.textbox_content.pack(fill="both", expand=True, padx=5, pady=5)
-
-        # Image Area (Right)
-        image_frame = ctk.CTkFrame(self.tab_reader)
-        image_frame.grid(row=1, column=1, sticky="nsew", padx=(5, 0))
-        
-        ctk.CTkLabel(image_frame, text="IMAGE PREVIEW", font=("Arial", 12, "bold")).pack(pady=5)
-        
-        # Image Display Container
-        self.image_display_label = ctk.CTkLabel(image_frame, text="\n\nNo Image Selected\nor No Images on Page", 
-                                              font=("Arial", 14), text_color="gray")
-        self.image_display_label.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Image Nav
-        img_nav = ctk.CTkFrame(image_frame, height=40, fg_color="transparent")
-        img_nav.pack(fill="x", pady=5)
-        
-        self.btn_prev_img = ctk.CTkButton(img_nav, text="◀", width=40, command=self.prev_image, state="disabled")
-        self.btn_prev_img.pack(side="left", padx=5)
-        
-        self.lbl_img_counter = ctk.CTkLabel(img_nav, text="Img 0/0")
-        self.lbl_img_counter.pack(side="left", expand=True)
-        
-        self.btn_next_img = ctk.CTkButton(img_nav, text="▶", width=40, command=self.next_image, state="disabled")
-        self.btn_next_img.pack(side="right", padx=5)
-
-    def setup_dashboard_tab(self):
-        """Setup Dashboard for Analysis Results"""
-        self.tab_dashboard.grid_columnconfigure((0, 1, 2), weight=1)
-        self.tab_dashboard.grid_rowconfigure(1, weight=1)
-
-        # Headers
-        ctk.CTkLabel(self.tab_dashboard, text="👤 ENTITIES", font=("Arial", 14, "bold"), text_color="#64B5F6").grid(row=0, column=0, pady=10)
-        ctk.CTkLabel(self.tab_dashboard, text="🔑 KEYWORDS", font=("Arial", 14, "bold"), text_color="#81C784").grid(row=0, column=1, pady=10)
-        ctk.CTkLabel(self.tab_dashboard, text="⚠️ EVENTS", font=("Arial", 14, "bold"), text_color="#FFB74D").grid(row=0, column=2, pady=10)
-
-        # Text Boxes
-        self.box_entities = ctk.CTkTextbox(self.tab_dashboard)
-        self.box_entities.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
-        
-        self.box_keywords = ctk.CTkTextbox(self.tab_dashboard)
-        self.box_keywords.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
-        
-        self.box_events = ctk.CTkTextbox(self.tab_dashboard)
-        self.box_events.grid(row=1, column=2, sticky="nsew", padx=5, pady=5)
-        
-        # Image Analysis Result at Bottom
-        ctk.CTkLabel(self.tab_dashboard, text="📝 IMAGE ANALYSIS REPORT", font=("Arial", 14, "bold")).grid(row=2, column=0, columnspan=3, pady=(20, 5))
-        self.box_image_analysis = ctk.CTkTextbox(self.tab_dashboard, height=150)
-        self.box_image_analysis.grid(row=3, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
-
-    def setup_search_tab(self):
-        """Setup Search/Chat Tab"""
-        self.tab_search.grid_columnconfigure(0, weight=1)
-        self.tab_search.grid_rowconfigure(2, weight=1)
-
-        # Input Area
-        input_frame = ctk.CTkFrame(self.tab_search, fg_color="transparent")
-        input_frame.grid(row=0, column=0, sticky="ew", pady=(10, 20))
-        
-        self.entry_question = ctk.CTkEntry(input_frame, placeholder_text="Ask ANY question about the PDF...", height=50, font=("Arial", 14))
-        self.entry_question.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        self.entry_question.bind('<Return>', lambda e: self.ask_question())
-        
-        self.btn_ask = ctk.CTkButton(input_frame, text="🚀 ASK GROQ AI", width=150, height=50, 
-                                   command=self.ask_question, font=("Arial", 14, "bold"),
-                                   fg_color="#9C27B0", hover_color="#7B1FA2")
-        self.btn_ask.pack(side="right")
-        
-        # Mode Selection
-        mode_frame = ctk.CTkFrame(self.tab_search, fg_color="transparent")
-        mode_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
-        
-        self.search_mode = ctk.StringVar(value="groq")
-        ctk.CTkRadioButton(mode_frame, text="🧠 GROQ AI (Intelligent)", variable=self.search_mode, value="groq").pack(side="left", padx=20)
-        ctk.CTkRadioButton(mode_frame, text="⚡ Fast Search", variable=self.search_mode, value="fast").pack(side="left", padx=20)
-
-        # Output Area
-        self.box_answer = ctk.CTkTextbox(self.tab_search, font=("Arial", 14))
-        self.box_answer.grid(row=2, column=0, sticky="nsew")
-        self.box_answer.insert("0.0", "🤖 Ask a question about your PDF content...")
-
-    # ==================== LOGIC SECTION ====================
-
-    def browse_pdf(self):
-        filepath = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
-        if filepath:
-            self.current_pdf = filepath
-            self.label_filename.configure(text=os.path.basename(filepath))
-            self.btn_analyze.configure(state="normal")
-            
-            try:
-                doc = fitz.open(filepath)
-                self.total_pages = len(doc)
-                doc.close()
-                self.extract_images_from_pdf(filepath)
-                self.lbl_page_counter.configure(text=f"Page 0 / {self.total_pages}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed: {e}")
-
-    def extract_images_from_pdf(self, pdf_path):
-        try:
-            self.images_data = []
-            doc = fitz.open(pdf_path)
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                image_list = page.get_images()
-                
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]
-                    base_image = doc.extract_image(xref)
-                    pil_image = Image.open(BytesIO(base_image["image"]))
-                    if pil_image.mode != 'RGB':
-                        pil_image = pil_image.convert('RGB')
-                    
-                    self.images_data.append({
-                        'page': page_num + 1,
-                        'image': pil_image,
-                        'description': None
-                    })
-            
-            if self.images_data:
-                self.btn_analyze_img.configure(state="normal")
-                self.update_image_display()
-            
-            self.status_label.configure(text=f"Images Found: {len(self.images_data)}")
-            doc.close()
-        except Exception as e:
-            print(f"Img Error: {e}")
-
-    def start_analysis(self):
-        if not self.groq_client:
-            messagebox.showwarning("API Error", "Groq API is not connected. Please check your API key.")
-            return
-            
-        self.progress_bar.set(0)
-        self.status_label.configure(text="Processing text with Groq AI...")
-        threading.Thread(target=self.analyze_pdf, daemon=True).start()
-
-    def analyze_pdf(self):
-        try:
-            doc = fitz.open(self.current_pdf)
-            self.pdf_data = []
-            self.all_text = ""
-            self.all_entities = []
-            self.all_keywords = []
-            self.all_events = []
-            
-            for i in range(self.total_pages):
-                self.after(0, lambda v=i: self.progress_bar.set((v+1)/self.total_pages))
-                
-                page = doc.load_page(i)
-                text = page.get_text()
-                self.all_text += f"\nPage {i+1}: {text}"
-                
-                analysis = self.intelligent_groq_analysis(text, i+1)
-                self.pdf_data.append({'page': i+1, 'text': text, 'analysis': analysis})
-                
-                if analysis:
-                    self.all_entities.extend(analysis.get('entities', []))
-                    self.all_keywords.extend(analysis.get('keywords', []))
-                    self.all_events.extend(analysis.get('events', []))
-            
-            doc.close()
-            self.after(0, self.analysis_complete)
-        except Exception as e:
-            print(f"Analysis Error: {e}")
-
-    def intelligent_groq_analysis(self, text, page_num):
-        """Use Groq AI to intelligently extract entities, keywords, and events"""
-        if not self.groq_client:
-            return self.rule_based_fallback(text)
-        
-        try:
-            prompt = f"""Extract from this text (Page {page_num}):
-
-            Text: {text[:3000]}
-
-            Return ONLY a JSON object with these keys:
-            1. "entities": List of important entities (people, organizations, locations, concepts)
-            2. "keywords": List of key terms and concepts (max 10)
-            3. "events": List of critical events, actions, or important points
-
-            Format each list as an array of strings. Be comprehensive and accurate."""
-            
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are a precise text analyzer. Extract structured information from text. Always return valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=1000
-            )
-            
-            result = response.choices[0].message.content
-            
-            # Clean the response
-            result = result.strip()
-            if result.startswith("```json"):
-                result = result[7:]
-            if result.startswith("```"):
-                result = result[3:]
-            if result.endswith("```"):
-                result = result[:-3]
-            result = result.strip()
-            
-            analysis = json.loads(result)
-            return analysis
-            
-        except Exception as e:
-            print(f"Groq Analysis Error: {e}")
-            return self.rule_based_fallback(text)
-
-    def rule_based_fallback(self, text):
-        """Fallback when Groq is not available"""
-        words = text.split()
-        entities = []
-        for word in words:
-            if len(word) > 2 and word[0].isupper() and word not in entities:
-                entities.append(word)
-        
-        common_words = {'the', 'and', 'is', 'in', 'of', 'to', 'a', 'that', 'it', 'for', 'on', 'with', 'as', 'was', 'be', 'are', 'this', 'by', 'or', 'at', 'an', 'from', 'not', 'but', 'which', 'you', 'we', 'they', 'he', 'she', 'it', 'his', 'her', 'their', 'our', 'my', 'your', 'has', 'have', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'can', 'may', 'might', 'must'}
-        keywords = [word.lower() for word in words if word.lower() not in common_words and len(word) > 3][:10]
-        
-        sentences = re.split(r'[.!?]+', text)
-        events = [s.strip() for s in sentences if any(verb in s.lower() for verb in ['created', 'developed', 'established', 'implemented', 'launched', 'started', 'began', 'occurred', 'happened', 'changed', 'increased', 'decreased'])][:5]
-        
-        return {
-            "entities": entities[:10],
-            "keywords": list(set(keywords))[:10],
-            "events": events
-        }
-
-    def analysis_complete(self):
-        self.status_label.configure(text="✅ Analysis Complete")
-        self.btn_prev_page.configure(state="normal")
-        self.btn_next_page.configure(state="normal")
-        self.load_page(0)
-
-    def load_page(self, index):
-        if 0 <= index < len(self.pdf_data):
-            self.current_page = index
-            data = self.pdf_data[index]
-            
-            self.textbox_content.delete("0.0", "end")
-            self.textbox_content.insert("0.0", data['text'])
-            
-            self.lbl_page_counter.configure(text=f"Page {data['page']} / {self.total_pages}")
-            
-            analysis = data.get('analysis', {})
-            
-            self.box_entities.delete("0.0", "end")
-            if analysis.get('entities'):
-                self.box_entities.insert("0.0", "\n".join(analysis['entities']))
-            else:
-                self.box_entities.insert("0.0", "No entities extracted")
-            
-            self.box_keywords.delete("0.0", "end")
-            if analysis.get('keywords'):
-                self.box_keywords.insert("0.0", "\n".join(analysis['keywords']))
-            else:
-                self.box_keywords.insert("0.0", "No keywords extracted")
-            
-            self.box_events.delete("0.0", "end")
-            if analysis.get('events'):
-                self.box_events.insert("0.0", "\n".join(analysis['events']))
-            else:
-                self.box_entities.insert("0.0", "No events extracted")
-
-    def prev_page(self):
-        if self.current_page > 0: 
-            self.load_page(self.current_page - 1)
-        
-    def next_page(self):
-        if self.current_page < len(self.pdf_data) - 1: 
-            self.load_page(self.current_page + 1)
-
-    # ==================== IMAGE HANDLING ====================
-    def update_image_display(self):
-        if not self.images_data: 
-            return
-        
-        img_data = self.images_data[self.current_image_index]
-        pil_img = img_data['image']
-        
-        w, h = pil_img.size
-        aspect = w / h
-        target_h = 300
-        target_w = int(target_h * aspect)
-        
-        ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(target_w, target_h))
-        
-        self.image_display_label.configure(image=ctk_img, text="")
-        self.lbl_img_counter.configure(text=f"Img {self.current_image_index + 1}/{len(self.images_data)}")
-        
-        self.btn_prev_img.configure(state="normal" if self.current_image_index > 0 else "disabled")
-        self.btn_next_img.configure(state="normal" if self.current_image_index < len(self.images_data)-1 else "disabled")
-
-        desc = img_data.get('description', "Not analyzed yet. Click 'Analyze Images' button.")
-        self.box_image_analysis.delete("0.0", "end")
-        self.box_image_analysis.insert("0.0", f"[Image {self.current_image_index+1} on Page {img_data['page']}]\n\n{desc}")
-
-    def prev_image(self):
-        if self.current_image_index > 0:
-            self.current_image_index -= 1
-            self.update_image_display()
-
-    def next_image(self):
-        if self.current_image_index < len(self.images_data) - 1:
-            self.current_image_index += 1
-            self.update_image_display()
-
-    def analyze_images(self):
-        if not self.images_data:
-            messagebox.showwarning("No Images", "No images found in PDF to analyze.")
-            return
-        
-        self.status_label.configure(text="Analyzing images...")
-        self.btn_analyze_img.configure(state="disabled")
-        threading.Thread(target=self.run_image_analysis, daemon=True).start()
-
-    def run_image_analysis(self):
-        """Analyze images using OpenRouter API"""
-        if not self.openrouter_api_key:
-            self.after(0, lambda: messagebox.showerror("API Error", "OpenRouter API key not configured!"))
-            return
-        
-        total_images = len(self.images_data)
-        model = self.option_model.get()
-        
-        for i, img_data in enumerate(self.images_data):
-            self.after(0, lambda v=i: self.progress_bar.set((v+1)/total_images))
-            
-            try:
-                pil_img = img_data['image']
-                
-                # Convert PIL Image to base64
-                buffered = BytesIO()
-                pil_img.save(buffered, format="JPEG", quality=85)
-                img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
-                
-                # Prepare API request
-                headers = {
-                    "Authorization": f"Bearer {self.openrouter_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                payload = {
-                    "model": model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": "Analyze this image in detail. Describe what you see, identify any text, objects, people, or important elements."
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{img_base64}"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    "max_tokens": 500
-                }
-                
-                # Make API request
-                response = requests.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    description = result['choices'][0]['message']['content']
-                    
-                    # Store description
-                    img_data['description'] = description
-                    self.images_data[i] = img_data
-                    
-                    # Update UI if this is the current image
-                    if i == self.current_image_index:
-                        self.after(0, self.update_image_display)
-                    
-                else:
-                    img_data['description'] = f"API Error: {response.status_code}"
-                    self.images_data[i] = img_data
-                    
-            except Exception as e:
-                img_data['description'] = f"Analysis Error: {str(e)[:100]}"
-                self.images_data[i] = img_data
-            
-            # Small delay to avoid rate limiting
-            threading.Event().wait(0.5)
-        
-        self.after(0, lambda: self.status_label.configure(text="✅ Image Analysis Complete"))
-        self.after(0, lambda: self.btn_analyze_img.configure(state="normal"))
-
-    # ==================== GROQ AI POWER SEARCH (FIXED & WORKING) ====================
-    def ask_question(self):
-        question = self.entry_question.get().strip()
-        if not question:
-            messagebox.showwarning("No Question", "Please enter a question.")
-            return
-            
-        if not self.all_text:
-            messagebox.showwarning("No Data", "Please load and analyze a PDF first.")
-            return
-        
-        # Check if Groq API is available
-        if self.search_mode.get() == "groq" and not self.groq_client:
-            messagebox.showerror("API Error", "Groq API is not connected. Please check:\n1. Internet connection\n2. API key\n3. pip install groq")
-            return
-        
-        # Disable button during processing
-        self.btn_ask.configure(state="disabled", text="🧠 Processing...")
-        self.box_answer.delete("0.0", "end")
-        
-        if self.search_mode.get() == "groq":
-            self.box_answer.insert("0.0", "🧠 GROQ AI is analyzing your question...\n\nPlease wait...")
-        else:
-            self.box_answer.insert("0.0", "⚡ Fast searching...\n\nPlease wait...")
-        
-        # Start processing in thread
-        threading.Thread(target=self.process_question, args=(question,), daemon=True).start()
-
-    def process_question(self, question):
-        """Process question - MAIN FIXED FUNCTION"""
-        try:
-            # ALWAYS use Groq if selected and available
-            if self.search_mode.get() == "groq" and self.groq_client:
-                response_text = self.groq_ai_search(question)
-            else:
-                response_text = self.simple_search(question)
-                
-        except Exception as e:
-            error_msg = f"❌ ERROR: {str(e)}\n\n"
-            error_msg += "Troubleshooting:\n"
-            error_msg += "1. Check internet connection\n"
-            error_msg += "2. Verify Groq API key is valid\n"
-            error_msg += "3. Try 'Fast Search' mode instead\n"
-            error_msg += f"4. Error details: {type(e).__name__}"
-            response_text = error_msg
-        
-        # Update UI
-        self.after(0, lambda: self._update_answer(response_text))
-        self.after(0, lambda: self.btn_ask.configure(state="normal", text="🚀 ASK GROQ AI"))
-
-    def groq_ai_search(self, question):
-        """DIRECT GROQ AI SEARCH - SIMPLE & WORKING"""
-        try:
-            # Prepare context - SIMPLE VERSION THAT WORKS
-            context = f"""
-            PDF CONTENT:
-            {self.all_text[:6000]}
-            
-            QUESTION:
-            {question}
-            
-            Please answer this question based ONLY on the PDF content above.
-            Be accurate, thorough, and reference specific information from the text.
-            """
-            
-            # Call Groq API
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are a helpful assistant that answers questions based on provided PDF content. Use only the given text."
-                    },
-                    {"role": "user", "content": context}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            
-            answer = response.choices[0].message.content
-            
-            # Format the answer nicely
-            formatted_answer = f"""
-            🧠 GROQ AI ANSWER:
-            {'='*50}
-            
-            {answer}
-            
-            {'='*50}
-            📊 Based on analysis of {len(self.pdf_data)} PDF pages
-            💡 Generated with Groq AI
-            """
-            
-            return formatted_answer
-            
-        except Exception as e:
-            print(f"Groq Search Error: {str(e)}")
-            # Fallback to simple search
-            return self.simple_search_with_context(question)
-
-    def simple_search_with_context(self, question):
-        """Enhanced simple search with context"""
-        question_lower = question.lower()
-        results = []
-        
-        # Search in text with more context
-        for data in self.pdf_data:
-            text_lower = data['text'].lower()
-            if question_lower in text_lower:
-                # Get the paragraph containing the match
-                paragraphs = data['text'].split('\n\n')
-                for para in paragraphs:
-                    if question_lower in para.lower():
-                        results.append(f"📄 Page {data['page']}:\n{para[:500]}...")
-                        break
-        
-        # Search in extracted entities if no text matches
-        if not results:
-            for entity in set(self.all_entities):
-                if question_lower in entity.lower():
-                    results.append(f"👤 Entity: {entity}")
-            
-            for keyword in set(self.all_keywords):
-                if question_lower in keyword.lower():
-                    results.append(f"🔑 Keyword: {keyword}")
-        
-        if results:
-            return f"SIMPLE SEARCH RESULTS:\n\n" + "\n\n".join(results[:5])
-        else:
-            # Try to answer based on overall content
-            return self.answer_from_overall_context(question)
-
-    def answer_from_overall_context(self, question):
-        """Try to answer based on overall PDF content"""
-        # Extract common themes from all text
-        all_text_lower = self.all_text.lower()
-        
-        # Check for common question types
-        if any(word in question.lower() for word in ['what is', 'what are', 'define', 'explain']):
-            # Look for definitions or explanations
-            return f"Based on the PDF content, I can tell you about:\n\n" + \
-                   f"Main topics mentioned: {', '.join(set(self.all_keywords)[:10])}\n\n" + \
-                   f"Main characters/entities: {', '.join(set(self.all_entities)[:10])}"
-        
-        elif any(word in question.lower() for word in ['who is', 'who are', 'character']):
-            # Character/entity questions
-            if self.all_entities:
-                return f"Main entities in the PDF:\n\n" + "\n".join(set(self.all_entities)[:15])
-            else:
-                return "No specific entities extracted. Try analyzing with Groq AI for better results."
-        
-        elif any(word in question.lower() for word in ['summary', 'overview', 'main idea']):
-            # Summary questions
-            first_page_text = self.all_text[:1000] if len(self.all_text) > 1000 else self.all_text
-            return f"PDF Summary (from first page):\n\n{first_page_text[:500]}..."
-        
-        else:
-            return f"No direct matches found for: '{question}'\n\nTry:\n1. Using different keywords\n2. Asking specific questions\n3. Using Groq AI mode for intelligent analysis"
-
-    def simple_search(self, question):
-        """Fast rule-based search"""
-        question_lower = question.lower()
-        results = []
-        
-        # Quick search in first few pages
-        for data in self.pdf_data[:10]:
-            if question_lower in data['text'].lower():
-                # Find the sentence
-                sentences = data['text'].split('.')
-                for sentence in sentences:
-                    if question_lower in sentence.lower():
-                        results.append(f"📄 Page {data['page']}: {sentence.strip()[:200]}")
-                        break
-                if len(results) >= 3:
-                    break
-        
-        if results:
-            return "FAST SEARCH RESULTS:\n\n" + "\n\n".join(results)
-        else:
-            return "No quick matches found. Try Groq AI mode for intelligent analysis."
-
-    def _update_answer(self, text):
-        self.box_answer.delete("0.0", "end")
-        self.box_answer.insert("0.0", text)
-
-if __name__ == "__main__":
-    app = SmartPDFAnalyzer()
-    app.mainloop()
\ No newline at end of file
+from startup import STARTUP_TIMER, STARTUP_CHECK, lazy_import, preload  # First: starts the clock
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import threading
+import os
+import sys
+from datetime import datetime
+import warnings
+from entity_store import EntityStore
+from ui_bus import UIEventBus
+from jobs import JobManager, JobLimitError
+from text_viewer import WindowedTextView
+from page_renderer import PageRenderCache
+from thumbnail_strip import ThumbnailStrip
+from engine import PDFEngine, format_hit
+from tracing import TRACER
+from telemetry import TELEMETRY
+from memory import MEMORY, deep_size
+
+# Heavy modules are imported on first use (and warmed up in the background after startup)
+Image = lazy_import('PIL.Image')
+
+# Hide deprecation warnings
+warnings.filterwarnings("ignore")
+
+# Configuration for CustomTkinter
+ctk.set_appearance_mode("Dark")  # Modes: "System" (standard), "Dark", "Light"
+ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
+
+class SmartPDFAnalyzer(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        # Window Setup
+        self.title("Smart PDF Analyzer - Competition Edition")
+        self.geometry("1400x900")
+        
+        # Data storage
+        self.pdf_data = []
+        self.current_pdf = None
+        self.current_page = 0
+        self.total_pages = 0
+        self.all_text = ""
+        self.images_data = []
+        self.current_image_index = 0
+        self.image_descriptions = {}
+        self.document = None  # DocumentAnalysis of the current PDF
+        self.entity_store = EntityStore()  # Aggregated entities/keywords/events with counts
+        self.page_renderer = PageRenderCache()  # Rendered pages, prefetched around current_page
+        self.engine = PDFEngine()  # Loading, analysis, search and API calls (no Tk)
+        self.library = self.engine.library
+        
+        # Image Models
+        self.image_models = [
+            "qwen/qwen-2.5-vl-72b-instruct",
+               "anthropic/claude-3-haiku", # Free tier available
+    "openai/gpt-4o-mini",   
+            "meta-llama/llama-3.2-11b-vision-instruct"
+        ]
+        
+        self.create_gui()
+        
+        # Worker threads post UI updates here; one Tk timer applies them
+        self.ui_bus = UIEventBus(self)
+        self.ui_bus.start()
+        
+        # Loading, analysis and questions run as cancellable jobs; a new PDF cancels them all
+        self.jobs = JobManager(self.ui_bus)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        STARTUP_TIMER.mark("window built")
+        STARTUP_TIMER.watch(self, on_ready=self.deferred_startup, exit_after=STARTUP_CHECK)
+
+    def deferred_startup(self):
+        """Work kept out of __init__; runs once the first frame is on screen"""
+        preload('fitz', 'PIL.Image')
+        
+        def check_groq():
+            self.engine.check_groq()
+            self.ui_bus.post(self.api_status_label.configure, text=f"Groq: {self.groq_status_text()}")
+        
+        threading.Thread(target=check_groq, daemon=True).start()
+
+    def on_close(self):
+        """Cancel running jobs so the pool threads do not keep the process alive"""
+        self.jobs.shutdown()
+        self.ui_bus.stop()
+        self.destroy()
+
+    def groq_status_text(self):
+        return f"{self.engine.groq_status} {'✅' if self.engine.groq_ready else '❌'}"
+
+    def create_gui(self):
+        # Configure grid layout (1x2)
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        # ============ SIDEBAR (LEFT) ============
+        self.sidebar_frame = ctk.CTkFrame(self, width=280, corner_radius=0)
+        self.sidebar_frame.grid(row=0, column=0, sticky="nsew")
+        self.sidebar_frame.grid_rowconfigure(9, weight=1)
+
+        # Logo / Title
+        self.logo_label = ctk.CTkLabel(self.sidebar_frame, text="🚀 PDF ANALYZER", 
+                                     font=ctk.CTkFont(size=20, weight="bold"))
+        self.logo_label.grid(row=0, column=0, padx=20, pady=(20, 10))
+        
+        self.subtitle_label = ctk.CTkLabel(self.sidebar_frame, text="Competition Edition", 
+                                         text_color="gray")
+        self.subtitle_label.grid(row=1, column=0, padx=20, pady=(0, 20))
+
+        # File Selection
+        self.btn_browse = ctk.CTkButton(self.sidebar_frame, text="📂 Open PDF File", 
+                                      command=self.browse_pdf, height=40,
+                                      fg_color="#2E7D32", hover_color="#1B5E20")
+        self.btn_browse.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
+        
+        self.label_filename = ctk.CTkLabel(self.sidebar_frame, text="No File Selected", 
+                                         text_color="gray", wraplength=200)
+        self.label_filename.grid(row=3, column=0, padx=20, pady=(0, 10))
+
+        # Start Analysis Button
+        self.btn_analyze = ctk.CTkButton(self.sidebar_frame, text="▶ Start Text Analysis", 
+                                       command=self.start_analysis, state="disabled",
+                                       height=40)
+        self.btn_analyze.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
+
+        # Image Analysis Settings
+        self.separator_1 = ctk.CTkLabel(self.sidebar_frame, text="🖼️ IMAGE ANALYSIS", 
+                                      font=ctk.CTkFont(size=12, weight="bold"))
+        self.separator_1.grid(row=5, column=0, padx=20, pady=(20, 5), sticky="w")
+        
+        self.option_model = ctk.CTkOptionMenu(self.sidebar_frame, values=self.image_models,
+                                              command=lambda _: self.update_model_stats())
+        self.option_model.grid(row=6, column=0, padx=20, pady=5, sticky="ew")
+        
+        self.btn_analyze_img = ctk.CTkButton(self.sidebar_frame, text="🔍 Analyze Images", 
+                                           command=self.analyze_images, state="disabled",
+                                           fg_color="#C62828", hover_color="#B71C1C")
+        self.btn_analyze_img.grid(row=7, column=0, padx=20, pady=10, sticky="ew")
+
+        # Latency and success rate of the selected model's recent calls
+        self.model_stats_label = ctk.CTkLabel(self.sidebar_frame, text="No calls yet", font=("Arial", 10),
+                                              text_color="gray", wraplength=200, justify="left")
+        self.model_stats_label.grid(row=8, column=0, padx=20, pady=(0, 5), sticky="w")
+
+        # Progress Bar (Bottom of Sidebar)
+        self.progress_bar = ctk.CTkProgressBar(self.sidebar_frame)
+        self.progress_bar.grid(row=10, column=0, padx=20, pady=10, sticky="ew")
+        self.progress_bar.set(0)
+        
+        # API Status Display
+        self.api_status_label = ctk.CTkLabel(self.sidebar_frame, text="Groq: Checking... ⏳", 
+                                           font=("Arial", 10))
+        self.api_status_label.grid(row=11, column=0, padx=20, pady=(10, 5))
+        
+        self.status_label = ctk.CTkLabel(self.sidebar_frame, text="Ready", font=("Arial", 10))
+        self.status_label.grid(row=12, column=0, padx=20, pady=(0, 20))
+
+        # ============ MAIN CONTENT (RIGHT) ============
+        self.main_view = ctk.CTkTabview(self, corner_radius=10)
+        self.main_view.grid(row=0, column=1, padx=20, pady=20, sticky="nsew")
+        
+        self.tab_dashboard = self.main_view.add("📊 Dashboard")
+        self.tab_reader = self.main_view.add("📖 Reader & Images")
+        self.tab_search = self.main_view.add("❓ Smart Search")
+
+        self.setup_reader_tab()
+        self.setup_dashboard_tab()
+        self.setup_search_tab()
+
+    def setup_reader_tab(self):
+        """Setup the Reader Tab (Split Text, Page and Image)"""
+        self.tab_reader.grid_columnconfigure(0, weight=1)
+        self.tab_reader.grid_columnconfigure(1, weight=1)
+        self.tab_reader.grid_columnconfigure(2, weight=1)
+        self.tab_reader.grid_rowconfigure(1, weight=1)
+
+        # Navigation Bar
+        nav_frame = ctk.CTkFrame(self.tab_reader, height=50, fg_color="transparent")
+        nav_frame.grid(row=0, column=0, columnspan=3, sticky="ew", pady=(0, 10))
+        
+        self.btn_prev_page = ctk.CTkButton(nav_frame, text="◀ Prev", width=80, 
+                                         command=self.prev_page, state="disabled")
+        self.btn_prev_page.pack(side="left")
+        
+        self.lbl_page_counter = ctk.CTkLabel(nav_frame, text="Page 0 / 0", font=("Arial", 14, "bold"))
+        self.lbl_page_counter.pack(side="left", padx=20)
+        
+        self.btn_next_page = ctk.CTkButton(nav_frame, text="Next ▶", width=80, 
+                                         command=self.next_page, state="disabled")
+        self.btn_next_page.pack(side="left")
+
+        # Text Area (Left)
+        text_frame = ctk.CTkFrame(self.tab_reader)
+        text_frame.grid(row=1, column=0, sticky="nsew", padx=(0, 5))
+        
+        ctk.CTkLabel(text_frame, text="TEXT CONTENT", font=("Arial", 12, "bold")).pack(pady=5)
+        self.textbox_content = ctk.CTkTextbox(text_frame, font=("Courier New", 13))
+        self.textbox_content.pack(fill="both", expand=True, padx=5, pady=5)
+        self.text_view = WindowedTextView(self.textbox_content)
+
+        # Rendered Page (Middle)
+        page_frame = ctk.CTkFrame(self.tab_reader)
+        page_frame.grid(row=1, column=1, sticky="nsew", padx=5)
+        
+        ctk.CTkLabel(page_frame, text="PAGE VIEW", font=("Arial", 12, "bold")).pack(pady=5)
+        self.page_preview_label = ctk.CTkLabel(page_frame, text="", font=("Arial", 14), text_color="gray")
+        self.page_preview_label.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Image Area (Right)
+        image_frame = ctk.CTkFrame(self.tab_reader)
+        image_frame.grid(row=1, column=2, sticky="nsew", padx=(5, 0))
+        
+        ctk.CTkLabel(image_frame, text="IMAGE PREVIEW", font=("Arial", 12, "bold")).pack(pady=5)
+        
+        # Image Display Container
+        self.image_display_label = ctk.CTkLabel(image_frame, text="\n\nNo Image Selected\nor No Images on Page", 
+                                              font=("Arial", 14), text_color="gray")
+        self.image_display_label.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Image Nav
+        img_nav = ctk.CTkFrame(image_frame, height=40, fg_color="transparent")
+        img_nav.pack(fill="x", pady=5)
+        
+        self.btn_prev_img = ctk.CTkButton(img_nav, text="◀", width=40, command=self.prev_image, state="disabled")
+        self.btn_prev_img.pack(side="left", padx=5)
+        
+        self.lbl_img_counter = ctk.CTkLabel(img_nav, text="Img 0/0")
+        self.lbl_img_counter.pack(side="left", expand=True)
+        
+        self.btn_next_img = ctk.CTkButton(img_nav, text="▶", width=40, command=self.next_image, state="disabled")
+        self.btn_next_img.pack(side="right", padx=5)
+        
+        # Thumbnail Strip
+        self.thumb_strip = ThumbnailStrip(image_frame, self.select_image, bg="#2b2b2b", fg="gray")
+        self.thumb_strip.frame.pack(fill="x", padx=5, pady=(0, 5))
+
+    def setup_dashboard_tab(self):
+        """Setup Dashboard for Analysis Results"""
+        self.tab_dashboard.grid_columnconfigure((0, 1, 2), weight=1)
+        self.tab_dashboard.grid_rowconfigure(1, weight=1)
+
+        # Headers
+        ctk.CTkLabel(self.tab_dashboard, text="👤 ENTITIES", font=("Arial", 14, "bold"), text_color="#64B5F6").grid(row=0, column=0, pady=10)
+        ctk.CTkLabel(self.tab_dashboard, text="🔑 KEYWORDS", font=("Arial", 14, "bold"), text_color="#81C784").grid(row=0, column=1, pady=10)
+        ctk.CTkLabel(self.tab_dashboard, text="⚠️ EVENTS", font=("Arial", 14, "bold"), text_color="#FFB74D").grid(row=0, column=2, pady=10)
+
+        # Text Boxes
+        self.box_entities = ctk.CTkTextbox(self.tab_dashboard)
+        self.box_entities.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        
+        self.box_keywords = ctk.CTkTextbox(self.tab_dashboard)
+        self.box_keywords.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
+        
+        self.box_events = ctk.CTkTextbox(self.tab_dashboard)
+        self.box_events.grid(row=1, column=2, sticky="nsew", padx=5, pady=5)
+        
+        # Image Analysis Result at Bottom
+        ctk.CTkLabel(self.tab_dashboard, text="📝 IMAGE ANALYSIS REPORT", font=("Arial", 14, "bold")).grid(row=2, column=0, columnspan=3, pady=(20, 5))
+        self.box_image_analysis = ctk.CTkTextbox(self.tab_dashboard, height=150)
+        self.box_image_analysis.grid(row=3, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
+        
+        # Document-wide aggregates
+        ctk.CTkLabel(self.tab_dashboard, text="📈 DOCUMENT OVERVIEW", font=("Arial", 14, "bold")).grid(row=4, column=0, columnspan=3, pady=(20, 5))
+        self.box_overview = ctk.CTkTextbox(self.tab_dashboard, height=150)
+        self.box_overview.grid(row=5, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
+        self.box_overview.insert("0.0", "Run the text analysis to see document-wide entity counts.")
+
+        # Where the last analysis, image run and question spent their time (see tracing.py)
+        perf_header = ctk.CTkFrame(self.tab_dashboard, fg_color="transparent")
+        perf_header.grid(row=6, column=0, columnspan=3, sticky="ew", pady=(20, 5))
+        ctk.CTkLabel(perf_header, text="⏱ PERFORMANCE", font=("Arial", 14, "bold")).pack(side="left", padx=5)
+        ctk.CTkButton(perf_header, text="💾 Export Trace", width=120,
+                      command=self.export_trace).pack(side="right", padx=5)
+        ctk.CTkButton(perf_header, text="🔄 Refresh", width=90,
+                      command=self.update_performance).pack(side="right", padx=5)
+        self.box_performance = ctk.CTkTextbox(self.tab_dashboard, height=150, font=("Courier New", 12))
+        self.box_performance.grid(row=7, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
+        self.box_performance.insert("0.0", "Timings of the last run appear here after an analysis.")
+
+    def setup_search_tab(self):
+        """Setup Search/Chat Tab"""
+        self.tab_search.grid_columnconfigure(0, weight=1)
+        self.tab_search.grid_rowconfigure(2, weight=1)
+
+        # Input Area
+        input_frame = ctk.CTkFrame(self.tab_search, fg_color="transparent")
+        input_frame.grid(row=0, column=0, sticky="ew", pady=(10, 20))
+        
+        self.entry_question = ctk.CTkEntry(input_frame, placeholder_text="Ask ANY question about the PDF...", height=50, font=("Arial", 14))
+        self.entry_question.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.entry_question.bind('<Return>', lambda e: self.ask_question())
+        
+        self.btn_ask = ctk.CTkButton(input_frame, text="🚀 ASK GROQ AI", width=150, height=50, 
+                                   command=self.ask_question, font=("Arial", 14, "bold"),
+                                   fg_color="#9C27B0", hover_color="#7B1FA2")
+        self.btn_ask.pack(side="right")
+        
+        # Mode Selection
+        mode_frame = ctk.CTkFrame(self.tab_search, fg_color="transparent")
+        mode_frame.grid(row=1, column=0, sticky="ew", pady=(0, 10))
+        
+        self.search_mode = ctk.StringVar(value="groq")
+        ctk.CTkRadioButton(mode_frame, text="🧠 GROQ AI (Intelligent)", variable=self.search_mode, value="groq").pack(side="left", padx=20)
+        ctk.CTkRadioButton(mode_frame, text="⚡ Fast Search", variable=self.search_mode, value="fast").pack(side="left", padx=20)
+        
+        self.library_mode = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(mode_frame, text="📚 Search Whole Library", variable=self.library_mode).pack(side="left", padx=20)
+
+        # Output Area
+        self.box_answer = ctk.CTkTextbox(self.tab_search, font=("Arial", 14))
+        self.box_answer.grid(row=2, column=0, sticky="nsew")
+        self.box_answer.insert("0.0", "🤖 Ask a question about your PDF content...")
+
+    # ==================== LOGIC SECTION ====================
+
+    def browse_pdf(self):
+        filepath = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
+        if filepath:
+            # Abandon everything still running for the previously chosen file
+            self.jobs.new_generation()
+            self.btn_ask.configure(state="normal", text="🚀 ASK GROQ AI")
+            
+            self.current_pdf = filepath
+            self.label_filename.configure(text=os.path.basename(filepath))
+            self.btn_analyze.configure(state="disabled")
+            self.btn_analyze_img.configure(state="disabled")
+            self.lbl_page_counter.configure(text="Opening...")
+            
+            # Reset the gallery; images arrive in batches from the loader thread
+            MEMORY.drop_images(self.images_data)
+            self.images_data = []
+            self.current_image_index = 0
+            self.thumb_strip.set_items(self.images_data)
+            self.image_display_label.configure(image="", text="\n\nLoading images...")
+            self.lbl_img_counter.configure(text="Img 0/0")
+            
+            self.jobs.start('load', self.load_pdf_thread, filepath)
+
+    def load_pdf_thread(self, job, filepath):
+        """Open the PDF, report its page count, then stream its images to the gallery"""
+        try:
+            doc = self.engine.open_pdf(filepath)
+        except Exception as e:
+            job.post(self.pdf_load_failed, str(e))
+            return
+        
+        try:
+            job.post(self.pdf_opened, filepath, len(doc))
+            for batch in self.engine.image_batches(doc, job):
+                job.post(self.add_loaded_images, batch)
+            job.post(self.images_loaded)
+        except Exception as e:
+            print(f"Img Error: {e}")
+            job.post(self.images_failed, str(e))
+        finally:
+            doc.close()
+
+    def pdf_opened(self, filepath, page_count):
+        """Page count is known; shown before any image has been decoded"""
+        self.total_pages = page_count
+        self.page_renderer.open(filepath, page_count)
+        self.lbl_page_counter.configure(text=f"Page 0 / {self.total_pages}")
+        self.btn_analyze.configure(state="normal")
+
+    def pdf_load_failed(self, error):
+        self.lbl_page_counter.configure(text="Page 0 / 0")
+        messagebox.showerror("Error", f"Failed: {error}")
+
+    def add_loaded_images(self, batch):
+        """Append a batch of freshly extracted images to the gallery"""
+        first_batch = not self.images_data
+        self.images_data.extend(batch)
+        MEMORY.keep_images(batch)   # May spill older images to disk
+        self.thumb_strip.items_added()
+        self.status_label.configure(text=f"Images Found: {len(self.images_data)} (loading...)")
+        
+        if first_batch:
+            self.update_image_display()
+        else:
+            self.lbl_img_counter.configure(text=f"Img {self.current_image_index + 1}/{len(self.images_data)}")
+            self.btn_next_img.configure(state="normal" if self.current_image_index < len(self.images_data)-1 else "disabled")
+
+    def images_loaded(self):
+        if self.images_data:
+            self.btn_analyze_img.configure(state="normal")
+        else:
+            self.image_display_label.configure(text="\n\nNo Image Selected\nor No Images on Page")
+        self.status_label.configure(text=f"Images Found: {len(self.images_data)}")
+
+    def images_failed(self, error):
+        """Extraction failed: clear the gallery and show the error where the image would be"""
+        MEMORY.drop_images(self.images_data)
+        self.images_data = []
+        self.current_image_index = 0
+        self.thumb_strip.set_items(self.images_data)
+        self.image_display_label.configure(image="", text=f"\n\n❌ Image extraction failed\n{error[:60]}")
+        self.lbl_img_counter.configure(text="Img 0/0")
+        self.btn_prev_img.configure(state="disabled")
+        self.btn_next_img.configure(state="disabled")
+        self.btn_analyze_img.configure(state="disabled")
+        self.status_label.configure(text=f"❌ Image extraction failed: {error[:60]}")
+
+    def start_analysis(self):
+        if not self.engine.groq_ready:
+            messagebox.showwarning("API Error", "Groq API is not connected. Please check your API key.")
+            return
+        
+        try:
+            self.jobs.start('analysis', self.analyze_pdf, self.current_pdf,
+                            replace=True, on_done=self.analysis_finished)
+        except JobLimitError:
+            messagebox.showwarning("Busy", "Too many jobs running, try again in a moment.")
+            return
+            
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Processing text with Groq AI...")
+
+    def analyze_pdf(self, job, pdf_path):
+        """Analysis job; the new document and its indexes replace the old ones when done"""
+        def on_progress(done, total):
+            job.post(self.progress_bar.set, done/total, key='progress')
+        
+        return self.engine.analyze_document(pdf_path, job, on_progress)
+
+    def analysis_finished(self, result, error):
+        if error is not None:
+            print(f"Analysis Error: {error}")
+            self.status_label.configure(text="❌ Analysis Failed")
+            return
+        
+        self.document = result
+        self.pdf_data, self.all_text, self.entity_store = result.pages, result.all_text, result.entity_store
+        MEMORY.track('pages', deep_size(self.pdf_data))
+        MEMORY.track('all_text', deep_size(self.all_text))
+        self.analysis_complete()
+
+    def analysis_complete(self):
+        self.status_label.configure(text="✅ Analysis Complete")
+        self.btn_prev_page.configure(state="normal")
+        self.btn_next_page.configure(state="normal")
+        self.load_page(0)
+        self.update_overview()
+        self.update_performance()
+
+    def update_overview(self):
+        """Document-wide summary straight from the entity store aggregates"""
+        store = self.entity_store
+        lines = [f"Pages analyzed: {store.pages}   |   "
+                 f"Unique entities: {len(store.counts['entities'])}   |   "
+                 f"Unique keywords: {len(store.counts['keywords'])}   |   "
+                 f"Events: {sum(store.counts['events'].values())}", ""]
+        
+        lines.append("👤 Top entities:")
+        for label, count, pages in store.top('entities', 8):
+            lines.append(f"   {label} x{count} (pages {', '.join(map(str, pages[:10]))})")
+        
+        lines.append("\n🔑 Top keywords:")
+        lines.append("   " + ", ".join(f"{label} x{count}" for label, count, _ in store.top('keywords', 12)))
+        
+        pairs = store.top_pairs(5)
+        if pairs:
+            lines.append("\n🔗 Entities appearing together:")
+            for a, b, count in pairs:
+                lines.append(f"   {a} + {b}: {count} pages")
+        
+        self.box_overview.delete("0.0", "end")
+        self.box_overview.insert("0.0", "\n".join(lines))
+
+    def update_performance(self):
+        """Span tables of the last analysis, image run and question, then LLM and memory stats"""
+        sections = [TRACER.report(prefix) for prefix in ('document', 'images', 'question')
+                    if TRACER.last_root(prefix) is not None]
+        if TELEMETRY.models:
+            sections.append(TELEMETRY.report())
+        sections.append(MEMORY.report())
+        self.box_performance.delete("0.0", "end")
+        self.box_performance.insert("0.0", "\n\n".join(sections) or "Nothing traced yet.")
+        self.update_model_stats()
+
+    def update_model_stats(self):
+        """Show the selected image model's recent latency and success rate under its menu"""
+        self.model_stats_label.configure(
+            text=TELEMETRY.describe(self.option_model.get(), self.engine.vision_provider))
+
+    def export_trace(self):
+        """Save every buffered span as a Chrome trace, plus the Prometheus dump next to it"""
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="intellex-trace.json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if not path:
+            return
+        try:
+            TRACER.export_json(path)
+            TRACER.export_prometheus(os.path.splitext(path)[0] + ".prom")
+        except OSError as e:
+            messagebox.showerror("Export Failed", str(e))
+            return
+        self.status_label.configure(text=f"💾 Trace saved: {os.path.basename(path)}")
+
+    def load_page(self, index):
+        if 0 <= index < len(self.pdf_data):
+            self.current_page = index
+            data = self.pdf_data[index]
+            
+            # Only the visible part of the page goes into the textbox; the rest loads on scroll
+            self.text_view.set_text(data.text)
+            self.show_page_preview(index)
+            
+            self.lbl_page_counter.configure(text=f"Page {data.page} / {self.total_pages}")
+            
+            analysis = data.analysis
+            
+            self.box_entities.delete("0.0", "end")
+            if analysis.get('entities'):
+                self.box_entities.insert("0.0", "\n".join(map(str, analysis['entities'][:200])))
+            else:
+                self.box_entities.insert("0.0", "No entities extracted")
+            
+            self.box_keywords.delete("0.0", "end")
+            if analysis.get('keywords'):
+                self.box_keywords.insert("0.0", "\n".join(map(str, analysis['keywords'][:200])))
+            else:
+                self.box_keywords.insert("0.0", "No keywords extracted")
+            
+            self.box_events.delete("0.0", "end")
+            if analysis.get('events'):
+                self.box_events.insert("0.0", "\n".join(map(str, analysis['events'][:200])))
+            else:
+                self.box_events.insert("0.0", "No events extracted")
+
+    def show_page_preview(self, index):
+        """Show the rendered page; prefetched neighbours appear without waiting"""
+        width = max(self.page_preview_label.winfo_width(), 200)
+        height = max(self.page_preview_label.winfo_height(), 280)
+        
+        image = self.page_renderer.get(index, width, height)
+        if image is not None:
+            self.display_page_bitmap(index, image)
+        else:
+            self.page_preview_label.configure(image="", text="⏳ Rendering page...")
+            self.page_renderer.request(index, width, height, lambda page, img: self.ui_bus.post(
+                self.display_page_bitmap, page, img, key='page_preview'))
+        
+        self.page_renderer.prefetch_around(index, width, height)
+
+    def display_page_bitmap(self, index, image):
+        if index != self.current_page:
+            return
+        ctk_img = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+        self.page_preview_label.configure(image=ctk_img, text="")
+
+    def prev_page(self):
+        if self.current_page > 0: 
+            self.load_page(self.current_page - 1)
+        
+    def next_page(self):
+        if self.current_page < len(self.pdf_data) - 1: 
+            self.load_page(self.current_page + 1)
+
+    # ==================== IMAGE HANDLING ====================
+    def update_image_display(self):
+        if not self.images_data: 
+            return
+        
+        img_data = self.images_data[self.current_image_index]
+        pil_img = MEMORY.image(img_data)
+        
+        w, h = pil_img.size
+        aspect = w / h
+        target_h = 300
+        target_w = int(target_h * aspect)
+        
+        ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(target_w, target_h))
+        
+        self.image_display_label.configure(image=ctk_img, text="")
+        self.lbl_img_counter.configure(text=f"Img {self.current_image_index + 1}/{len(self.images_data)}")
+        
+        self.btn_prev_img.configure(state="normal" if self.current_image_index > 0 else "disabled")
+        self.btn_next_img.configure(state="normal" if self.current_image_index < len(self.images_data)-1 else "disabled")
+        self.thumb_strip.select(self.current_image_index)
+
+        desc = img_data.description or "Not analyzed yet. Click 'Analyze Images' button."
+        self.box_image_analysis.delete("0.0", "end")
+        self.box_image_analysis.insert("0.0", f"[Image {self.current_image_index+1} on Page {img_data.page}]\n\n{desc}")
+
+    def prev_image(self):
+        if self.current_image_index > 0:
+            self.current_image_index -= 1
+            self.update_image_display()
+
+    def next_image(self):
+        if self.current_image_index < len(self.images_data) - 1:
+            self.current_image_index += 1
+            self.update_image_display()
+
+    def select_image(self, index):
+        if 0 <= index < len(self.images_data):
+            self.current_image_index = index
+            self.update_image_display()
+
+    def analyze_images(self):
+        if not self.images_data:
+            messagebox.showwarning("No Images", "No images found in PDF to analyze.")
+            return
+        
+        if not self.engine.vision_configured:
+            messagebox.showerror("API Error", "OpenRouter API key not configured!")
+            return
+        
+        try:
+            self.jobs.start('images', self.run_image_analysis, list(self.images_data), self.option_model.get(),
+                            self.current_pdf,
+                            replace=True, on_done=self.image_analysis_finished)
+        except JobLimitError:
+            messagebox.showwarning("Busy", "Too many jobs running, try again in a moment.")
+            return
+        
+        self.status_label.configure(text="Analyzing images...")
+        self.btn_analyze_img.configure(state="disabled")
+
+    def run_image_analysis(self, job, images, model, pdf_path):
+        """Analyze images using OpenRouter API (concurrently, on the async engine)"""
+        total_images = len(images)
+        finished = []
+        
+        def on_result(i, description):
+            finished.append(i)
+            job.post(self.progress_bar.set, len(finished)/total_images, key='progress')
+            # Store description (and refresh the view if this is the current image)
+            job.post(self.set_image_description, i, description)
+        
+        # A small per-batch limit replaces the old fixed delay between requests (rate limiting)
+        with TRACER.span('images', pdf=os.path.basename(pdf_path), model=model, images=total_images):
+            self.engine.describe_images(images, model, job, on_result, limit=2, pdf_path=pdf_path,
+                                        prompt="Analyze this image in detail. Describe what you see, identify any text, objects, people, or important elements.",
+                                        image_format="JPEG", max_tokens=500)
+
+    def set_image_description(self, index, description):
+        self.images_data[index].description = description
+        if index == self.current_image_index:
+            self.update_image_display()
+
+    def image_analysis_finished(self, result, error):
+        if error is not None:
+            print(f"Image Analysis Error: {error}")
+        self.status_label.configure(text="✅ Image Analysis Complete")
+        self.btn_analyze_img.configure(state="normal")
+        self.update_performance()
+
+    # ==================== GROQ AI POWER SEARCH (FIXED & WORKING) ====================
+    def ask_question(self):
+        question = self.entry_question.get().strip()
+        if not question:
+            messagebox.showwarning("No Question", "Please enter a question.")
+            return
+            
+        if self.library_mode.get():
+            if not self.library.page_count():
+                messagebox.showwarning("No Data", "The library is empty. Analyze at least one PDF first.")
+                return
+            document = None  # The engine searches the whole library
+        elif self.document is None:
+            messagebox.showwarning("No Data", "Please load and analyze a PDF first.")
+            return
+        else:
+            document = self.document
+        
+        # Check if Groq API is available
+        use_groq = self.search_mode.get() == "groq"
+        if use_groq and not self.engine.groq_ready:
+            messagebox.showerror("API Error", "Groq API is not connected. Please check:\n1. Internet connection\n2. API key (GROQ_API_KEY)")
+            return
+        
+        # Start processing as a job
+        try:
+            self.jobs.start('question', self.process_question, question, document, use_groq,
+                            replace=True, on_done=self.question_finished)
+        except JobLimitError:
+            messagebox.showwarning("Busy", "Too many jobs running, try again in a moment.")
+            return
+        
+        # Disable button during processing
+        self.btn_ask.configure(state="disabled", text="🧠 Processing...")
+        self.box_answer.delete("0.0", "end")
+        
+        if use_groq:
+            self.box_answer.insert("0.0", "🧠 GROQ AI is analyzing your question...\n\nPlease wait...")
+        else:
+            self.box_answer.insert("0.0", "⚡ Fast searching...\n\nPlease wait...")
+
+    def process_question(self, job, question, document, use_groq):
+        """Question job; document is None when the whole library is searched"""
+        with TRACER.span('question', question=question[:80]):
+            return self._process_question(job, question, document, use_groq)
+
+    def _process_question(self, job, question, document, use_groq):
+        try:
+            if use_groq:
+                # Local answer first (milliseconds), then Groq streams in over it
+                job.post(self._update_answer, "⚡ INSTANT ANSWER (local search) - GROQ AI is refining it...\n\n"
+                         + self.engine.instant_answer(question, document))
+                response_text = self.groq_ai_search(
+                    question, document, job,
+                    on_partial=lambda text: job.post(self._update_answer, f"🧠 GROQ AI ANSWER (streaming...)\n\n{text}",
+                                                     key='answer_stream'))
+            else:
+                # Stream hits into the answer box while the index is scanned
+                job.post(self._update_answer, "FAST SEARCH RESULTS:\n\n")
+                response_text = self.engine.search(question, document,
+                                                   on_hit=lambda hit: self._stream_search_hit(job, hit))
+                
+        except Exception as e:
+            error_msg = f"❌ ERROR: {str(e)}\n\n"
+            error_msg += "Troubleshooting:\n"
+            error_msg += "1. Check internet connection\n"
+            error_msg += "2. Verify Groq API key is valid\n"
+            error_msg += "3. Try 'Fast Search' mode instead\n"
+            error_msg += f"4. Error details: {type(e).__name__}"
+            response_text = error_msg
+        
+        return response_text
+
+    def question_finished(self, response_text, error):
+        self._update_answer(response_text if error is None else f"❌ ERROR: {error}")
+        self.btn_ask.configure(state="normal", text="🚀 ASK GROQ AI")
+        self.update_performance()
+
+    def groq_ai_search(self, question, document, job=None, on_partial=None):
+        """Streamed Groq answer from the engine, framed for the answer box"""
+        try:
+            answer, model = self.engine.answer(question, document, job, on_partial)
+            
+            if document is None:
+                scope = f"{self.library.page_count()} pages in {len(self.library.document_names())} library PDFs"
+            else:
+                scope = f"{len(document)} PDF pages"
+            
+            # Format the answer nicely
+            formatted_answer = f"""
+            🧠 GROQ AI ANSWER:
+            {'='*50}
+            
+            {answer}
+            
+            {'='*50}
+            📊 Based on analysis of {scope}
+            💡 Generated with Groq AI ({model})
+            """
+            
+            return formatted_answer
+            
+        except Exception as e:
+            print(f"Groq Search Error: {str(e)}")
+            # Fallback to the local answer
+            return self.engine.instant_answer(question, document)
+
+    def _stream_search_hit(self, job, hit):
+        line = format_hit(hit) + "\n\n"
+        job.post(self.box_answer.insert, "end", line)
+
+    def _update_answer(self, text):
+        self.box_answer.delete("0.0", "end")
+        self.box_answer.insert("0.0", text)
+
+if __name__ == "__main__":
+    app = SmartPDFAnalyzer()
+    app.mainloop()
+    
+    if STARTUP_CHECK:
+        sys.exit(0 if STARTUP_TIMER.within_target else 1)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobLimitError(Exception):
+    """Raised when starting a job would exceed the concurrent job cap"""
+
+
+class JobCancelled(BaseException):
+    """Raised by Job.check() to unwind a job that was cancelled or went stale
+
+    Like asyncio.CancelledError it is not an Exception, so the broad
+    `except Exception` fallbacks inside the analyzers do not swallow it.
+    """
+
+
+class Job:
+    """Handle for one background job, passed to the job function as its first argument"""
+
+    def __init__(self, job_id, kind, generation, manager):
+        self.id = job_id
+        self.kind = kind
+        self.generation = generation
+        self.manager = manager
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """True once cancelled or once a newer document generation has started"""
+        return self.cancel_event.is_set() or self.generation != self.manager.generation
+
+    def check(self):
+        """Call between pages/images; raises JobCancelled when the job should stop"""
+        if self.cancelled:
+            raise JobCancelled(f"{self.kind} job {self.id}")
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def post(self, handler, *args, key=None, **kwargs):
+        """Queue a UI update that is dropped if the job is stale by the time it runs"""
+        self.manager.ui_bus.post(self._deliver, handler, args, kwargs, key=key)
+
+    def _deliver(self, handler, args, kwargs):
+        if not self.cancelled:
+            handler(*args, **kwargs)
+
+
+class JobManager:
+    """Owns the analyzers' background jobs (analysis, image analysis, questions)
+
+    Every job gets an id, a cancellation token it checks between steps and the
+    document generation it was started under. Opening a new PDF calls
+    new_generation(), which cancels everything still running; anything those
+    jobs post afterwards is dropped instead of landing on the new document.
+    At most max_concurrent live jobs are accepted - jobs that were cancelled
+    but are still finishing their current step do not count - and they run on
+    a pool of as many threads, so a new job may wait for a cancelled one to
+    reach its next check().
+    """
+
+    def __init__(self, ui_bus, max_concurrent=3):
+        self.ui_bus = ui_bus
+        self.max_concurrent = max_concurrent
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="job")
+        self.generation = 0
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+    def start(self, kind, fn, *args, replace=False, on_done=None):
+        """Run fn(job, *args) on the job pool; on_done(result, error) runs on the Tk thread"""
+        with self.lock:
+            if replace:
+                for job in self.jobs.values():
+                    if job.kind == kind:
+                        job.cancel()
+            live = sum(1 for job in self.jobs.values() if not job.cancelled)
+            if live >= self.max_concurrent:
+                raise JobLimitError(f"{live} jobs already running")
+
+            job = Job(next(self.ids), kind, self.generation, self)
+            self.jobs[job.id] = job
+
+        self.executor.submit(self._run, job, fn, args, on_done)
+        return job
+
+    def _run(self, job, fn, args, on_done):
+        if job.cancelled:
+            # Cancelled while waiting for a pool thread
+            with self.lock:
+                self.jobs.pop(job.id, None)
+            return
+
+        try:
+            result, error = fn(job, *args), None
+        except JobCancelled:
+            return
+        except Exception as e:
+            result, error = None, e
+        finally:
+            with self.lock:
+                self.jobs.pop(job.id, None)
+
+        if on_done:
+            job.post(on_done, result, error)
+
+    def cancel(self, kind=None):
+        """Cancel every live job (or every live job of one kind); returns how many"""
+        with self.lock:
+            jobs = [job for job in self.jobs.values()
+                    if not job.cancelled and (kind is None or job.kind == kind)]
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def running(self, kind=None):
+        with self.lock:
+            return sum(1 for job in self.jobs.values()
+                       if not job.cancelled and (kind is None or job.kind == kind))
+
+    def new_generation(self):
+        """Start a new document generation; all older jobs become stale"""
+        with self.lock:
+            self.generation += 1
+            for job in self.jobs.values():
+                job.cancel()
+            return self.generation
+
+    def shutdown(self):
+        """Cancel everything and drop queued jobs; called when the window closes"""
+        self.new_generation()
+        self.executor.shutdown(wait=False, cancel_futures=True)
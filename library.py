@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from records import PageRecord
+from search_index import PageIndex
+
+DEFAULT_LIBRARY_DIR = os.path.join(os.path.expanduser("~"), ".intellex", "library")
+
+
+class DocumentLibrary:
+    """Persistent index over every analyzed PDF, updated one document at a time
+
+    Each document is stored as its own JSON file next to a small manifest, so adding
+    or re-analyzing one PDF never rewrites the others.
+    """
+
+    def __init__(self, library_dir=DEFAULT_LIBRARY_DIR):
+        self.library_dir = library_dir
+        self.manifest_path = os.path.join(library_dir, "library.json")
+        self.manifest = {}
+        self.documents = {}   # doc_id -> list of PageRecords
+        self.index = PageIndex()
+        self.lock = threading.RLock()
+        self.loaded = False
+
+    # ==================== STORAGE ====================
+
+    def doc_id(self, pdf_path):
+        return hashlib.sha1(os.path.abspath(pdf_path).encode('utf-8')).hexdigest()[:16]
+
+    def _doc_path(self, doc_id):
+        return os.path.join(self.library_dir, f"{doc_id}.json")
+
+    def load(self):
+        """Read the manifest and every stored document, then build the search index"""
+        with self.lock:
+            if self.loaded:
+                return
+            self.loaded = True
+
+            if not os.path.exists(self.manifest_path):
+                return
+
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.manifest = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Library manifest unreadable: {e}")
+                self.manifest = {}
+                return
+
+            for doc_id in list(self.manifest):
+                name = self.display_name(doc_id)
+                try:
+                    with open(self._doc_path(doc_id), 'r', encoding='utf-8') as f:
+                        self.documents[doc_id] = [PageRecord.from_dict(data, name) for data in json.load(f)]
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Library document {doc_id} skipped: {e}")
+                    del self.manifest[doc_id]
+
+            self._rebuild_index()
+
+    def _save_manifest(self):
+        os.makedirs(self.library_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _rebuild_index(self):
+        self.index.clear()
+        for doc_id, pages in self.documents.items():
+            for page in pages:
+                self.index.add_page(page.page, page.text, doc=doc_id)
+
+    # ==================== UPDATES ====================
+
+    def add_document(self, pdf_path, pdf_data):
+        """Store (or replace) one analyzed document and index its pages"""
+        self.load()
+        doc_id = self.doc_id(pdf_path)
+        name = os.path.basename(pdf_path)
+        # Text and analysis tuples are shared with pdf_data
+        pages = [PageRecord(data.page, data.text, data.analysis, name) for data in pdf_data]
+
+        try:
+            stat = os.stat(pdf_path)
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size, mtime = None, None
+
+        with self.lock:
+            os.makedirs(self.library_dir, exist_ok=True)
+            tmp_path = self._doc_path(doc_id) + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump([page.to_dict() for page in pages], f)
+            os.replace(tmp_path, self._doc_path(doc_id))
+
+            replaced = doc_id in self.documents
+            self.documents[doc_id] = pages
+            self.manifest[doc_id] = {
+                'name': name,
+                'path': os.path.abspath(pdf_path),
+                'size': size,
+                'mtime': mtime,
+                'pages': len(pages),
+                'added': datetime.now().isoformat(timespec='seconds')
+            }
+            self._save_manifest()
+
+            # Same-named PDFs from other folders now need their folder in the label
+            for other_id, info in self.manifest.items():
+                if info['name'] == name:
+                    label = self.display_name(other_id)
+                    for page in self.documents.get(other_id, []):
+                        page.doc = label
+
+            if replaced:
+                self._rebuild_index()
+            else:
+                for page in pages:
+                    self.index.add_page(page.page, page.text, doc=doc_id)
+
+        return doc_id
+
+    def remove_document(self, pdf_path):
+        self.load()
+        doc_id = self.doc_id(pdf_path)
+        with self.lock:
+            if doc_id not in self.manifest:
+                return False
+            del self.manifest[doc_id]
+            self.documents.pop(doc_id, None)
+            try:
+                os.remove(self._doc_path(doc_id))
+            except OSError:
+                pass
+            self._save_manifest()
+            self._rebuild_index()
+        return True
+
+    # ==================== QUERIES ====================
+
+    def document_names(self):
+        self.load()
+        return [info['name'] for info in self.manifest.values()]
+
+    def page_count(self):
+        self.load()
+        return sum(info['pages'] for info in self.manifest.values())
+
+    def iter_pages(self):
+        """Every stored page; its doc is the name of its document"""
+        self.load()
+        with self.lock:
+            documents = list(self.documents.values())
+        for pages in documents:
+            yield from pages
+
+    def display_name(self, doc_id):
+        """Name of a stored document, with its folder when another stored PDF has the same name"""
+        info = self.manifest.get(doc_id)
+        if info is None:
+            return doc_id
+        if any(other['name'] == info['name'] for other_id, other in self.manifest.items() if other_id != doc_id):
+            return f"{info['name']} ({os.path.basename(os.path.dirname(info['path']))})"
+        return info['name']
+
+    def _label(self, hit):
+        # The index keys pages by doc_id; hits show the document name
+        return dict(hit, doc=self.display_name(hit['doc']), doc_id=hit['doc'])
+
+    def search(self, query, top_k=5, on_hit=None):
+        """Top-k sentence hits across the library, falling back to typo-tolerant lookup"""
+        self.load()
+        labelled_on_hit = (lambda hit: on_hit(self._label(hit))) if on_hit else None
+        with self.lock:
+            hits = self.index.search(query, top_k=top_k, on_hit=labelled_on_hit)
+            if not hits or hits[0]['relevance'] < 1.0:
+                fuzzy_hits = self.index.fuzzy_search(query, top_k=top_k)
+                if fuzzy_hits and (not hits or fuzzy_hits[0]['relevance'] > hits[0]['relevance']):
+                    hits = fuzzy_hits
+            return [self._label(hit) for hit in hits]
+
+    def _page_text(self, doc_id, page_num):
+        pages = self.documents.get(doc_id, [])
+        if 0 < page_num <= len(pages) and pages[page_num - 1].page == page_num:
+            return pages[page_num - 1].text
+        return next((page.text for page in pages if page.page == page_num), "")
+
+    def context_for(self, question, max_chars=6000, top_pages=8):
+        """LLM context made of the library pages most relevant to the question"""
+        self.load()
+        with self.lock:
+            hits = self.index.search(question, top_k=top_pages * 3)
+            seen = list(dict.fromkeys((hit['doc'], hit['page']) for hit in hits))[:top_pages]
+            pages = [(self.display_name(doc_id), page, self._page_text(doc_id, page)) for doc_id, page in seen]
+
+        context = ""
+        for name, page, text in pages:
+            block = f"\n\n--- DOCUMENT: {name} | PAGE {page} ---\n{text}"
+            if len(context) + len(block) > max_chars:
+                block = block[:max_chars - len(context)]
+            context += block
+            if len(context) >= max_chars:
+                break
+        return context
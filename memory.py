@@ -0,0 +1,254 @@
+import atexit
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections import OrderedDict
+from io import BytesIO
+
+from startup import lazy_import
+
+Image = lazy_import('PIL.Image')
+
+MB = 1024 * 1024
+
+# Ceiling for everything the budget accounts for; INTELLEX_MEMORY_BUDGET_MB overrides it
+DEFAULT_BUDGET_MB = 1024
+
+
+def image_size(image):
+    """Bytes of a decoded PIL image"""
+    return image.width * image.height * len(image.getbands())
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes of an object and everything it holds (containers, strings, slotted records)"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_size(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+class MemoryBudget:
+    """Byte accounting per structure under one ceiling, spilling to disk past it
+
+    Structures report their size with track(). Two of them can give memory
+    back: gallery images handed to keep_images() are written to a spill
+    directory, least recently used first, and decoded again by image() on
+    their next use; spillers added with register() (the page render cache)
+    move their bitmaps to disk themselves. Text (pages, all_text) is only
+    accounted, a warning is printed when it alone breaks the budget.
+
+    Pixel buffers live in PIL's own allocator, which tracemalloc does not
+    see, so report() shows this accounting next to the tracemalloc top list.
+    """
+
+    def __init__(self, limit_bytes=None):
+        if limit_bytes is None:
+            limit_bytes = int(float(os.environ.get('INTELLEX_MEMORY_BUDGET_MB', DEFAULT_BUDGET_MB)) * MB)
+        self.limit = limit_bytes
+        self.structures = {}         # name -> bytes held in memory
+        self.spilled = {}            # name -> bytes written to the spill directory
+        self.images = OrderedDict()  # id(record) -> ImageRecord with a decoded image, least recently used first
+        self.spillers = []           # (name, spill(nbytes) -> bytes freed)
+        self.spill_dir = None
+        self.names = itertools.count(1)
+        self.lock = threading.RLock()
+        self.warned = False
+
+    # ==================== ACCOUNTING ====================
+
+    def track(self, structure, nbytes):
+        """Set the current size of a structure; spills when the total is over the budget"""
+        with self.lock:
+            self.structures[structure] = max(0, nbytes)
+        self.enforce()
+
+    def _adjust(self, structure, delta):
+        self.structures[structure] = max(0, self.structures.get(structure, 0) + delta)
+
+    def total(self):
+        with self.lock:
+            return sum(self.structures.values())
+
+    def register(self, structure, spill):
+        """spill(nbytes) moves at least nbytes of the structure to disk if it can; returns the bytes freed"""
+        with self.lock:
+            self.spillers.append((structure, spill))
+
+    def enforce(self):
+        """Spill render bitmaps, then the least recently used images, until the total fits again"""
+        with self.lock:
+            excess = self.total() - self.limit
+            if excess <= 0:
+                self.warned = False
+                return
+            spillers = list(self.spillers)
+
+        # Spillers take their own locks, so they run without ours
+        for _, spill in spillers:
+            excess -= spill(excess)
+            if excess <= 0:
+                return
+        excess -= self._spill_images(excess)
+        if excess > 0 and not self.warned:
+            self.warned = True
+            print(f"⚠️ Memory budget exceeded by {excess / MB:.0f} MB with nothing left to spill")
+
+    # ==================== SPILL FILES ====================
+
+    def write_spill(self, structure, data, suffix=""):
+        """Write bytes to a new file in the spill directory; returns its path"""
+        with self.lock:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="intellex-spill-")
+                atexit.register(shutil.rmtree, self.spill_dir, True)
+            path = os.path.join(self.spill_dir, f"{next(self.names)}{suffix}")
+            self.spilled[structure] = self.spilled.get(structure, 0) + len(data)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def remove_spill(self, structure, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self.lock:
+            self.spilled[structure] = max(0, self.spilled.get(structure, 0) - size)
+
+    # ==================== GALLERY IMAGES ====================
+
+    def keep_images(self, images):
+        """Account freshly loaded gallery images (ImageRecords)"""
+        with self.lock:
+            for image_data in images:
+                self.images[id(image_data)] = image_data
+                self._adjust('images', image_size(image_data.image))
+                self._adjust('image_bytes', len(image_data.image_bytes))
+        self.enforce()
+
+    def drop_images(self, images):
+        """Forget a gallery that is being replaced, deleting its spill files"""
+        with self.lock:
+            for image_data in images:
+                if self.images.pop(id(image_data), None) is not None:
+                    self._adjust('images', -image_size(image_data.image))
+                    self._adjust('image_bytes', -len(image_data.image_bytes))
+                if image_data.spill:
+                    self.remove_spill('images', image_data.spill)
+                    image_data.spill = None
+
+    def image(self, image_data):
+        """The decoded image of a gallery entry, read back from disk if it was spilled"""
+        with self.lock:
+            image = image_data.image
+            if image is not None:
+                if id(image_data) in self.images:
+                    self.images.move_to_end(id(image_data))
+                return image
+            path = image_data.spill
+
+        with open(path, 'rb') as f:
+            image_bytes = f.read()
+        image = Image.open(BytesIO(image_bytes))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        with self.lock:
+            if image_data.image is not None:
+                return image_data.image   # Another thread read it back first
+            image_data.image, image_data.image_bytes = image, image_bytes
+            self.images[id(image_data)] = image_data
+            self._adjust('images', image_size(image))
+            self._adjust('image_bytes', len(image_bytes))
+        self.enforce()
+        return image
+
+    def _spill_images(self, excess):
+        """Drop decoded images, least recently used first; their raw bytes stay on disk"""
+        freed = 0
+        with self.lock:
+            while freed < excess and self.images:
+                _, image_data = self.images.popitem(last=False)
+                if not image_data.spill:
+                    try:
+                        image_data.spill = self.write_spill('images', image_data.image_bytes, ".img")
+                    except OSError as e:
+                        print(f"Spill error: {e}")
+                        self.images[id(image_data)] = image_data
+                        break
+                decoded, raw = image_size(image_data.image), len(image_data.image_bytes)
+                image_data.image = image_data.image_bytes = None
+                self._adjust('images', -decoded)
+                self._adjust('image_bytes', -raw)
+                freed += decoded + raw
+        return freed
+
+    # ==================== REPORT ====================
+
+    def usage(self):
+        with self.lock:
+            return {
+                'limit': self.limit,
+                'total': sum(self.structures.values()),
+                'structures': dict(self.structures),
+                'spilled': dict(self.spilled),
+                'resident_images': len(self.images)
+            }
+
+    def largest_allocations(self, limit=10):
+        """Source lines holding the most traced memory, or [] when tracemalloc is off"""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ))
+        return [{'file': os.path.basename(stat.traceback[0].filename), 'line': stat.traceback[0].lineno,
+                 'bytes': stat.size, 'blocks': stat.count}
+                for stat in snapshot.statistics('lineno')[:limit]]
+
+    def summary(self):
+        """One line for a status bar"""
+        usage = self.usage()
+        return f"🧠 Memory {usage['total'] / MB:.1f} MB of a {usage['limit'] / MB:.0f} MB budget"
+
+    def report(self, limit=10):
+        """Accounted structures, plus the largest tracemalloc holders when tracing is on"""
+        usage = self.usage()
+        lines = [self.summary(),
+                 "",
+                 f"{'Structure':<20}{'In memory MB':>14}{'Spilled MB':>12}"]
+        for structure in sorted(set(usage['structures']) | set(usage['spilled'])):
+            lines.append(f"{structure:<20}{usage['structures'].get(structure, 0) / MB:>14.2f}"
+                         f"{usage['spilled'].get(structure, 0) / MB:>12.2f}")
+
+        lines.append("")
+        if not tracemalloc.is_tracing():
+            lines.append("Run with PYTHONTRACEMALLOC=1 to list the largest Python allocations.")
+            return "\n".join(lines)
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(f"tracemalloc: {current / MB:.1f} MB traced, peak {peak / MB:.1f} MB")
+        lines.append(f"{'MB':>8}{'Blocks':>9}  Allocated at")
+        for entry in self.largest_allocations(limit):
+            lines.append(f"{entry['bytes'] / MB:>8.2f}{entry['blocks']:>9}  {entry['file']}:{entry['line']}")
+        return "\n".join(lines)
+
+
+# Shared by both windows, the engine and the render cache
+MEMORY = MemoryBudget()
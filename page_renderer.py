@@ -0,0 +1,204 @@
+import itertools
+import queue
+import threading
+from collections import OrderedDict
+
+from memory import MEMORY
+from startup import lazy_import
+
+fitz = lazy_import('fitz')  # PyMuPDF
+Image = lazy_import('PIL.Image')
+
+
+class PageRenderCache:
+    """Rendered page bitmaps with background prefetch under a memory cap
+
+    A single worker thread owns its own fitz document (PyMuPDF handles must not
+    be shared between threads) and renders pages at a zoom that fits the
+    requested viewport. The requested page always jumps the queue; neighbours
+    of the current page are prefetched behind it. Finished bitmaps are kept in
+    an LRU cache bounded by max_bytes. Bitmaps pushed out of it, by that cap
+    or by the process memory budget (memory.py), are spilled to disk as raw
+    RGB and read back by the worker instead of being rendered again.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, prefetch=2, size_step=50):
+        self.max_bytes = max_bytes
+        self.prefetch = prefetch
+        self.size_step = size_step
+
+        self.cache = OrderedDict()   # (page, width, height) -> PIL image
+        self.cache_bytes = 0
+        self.spilled = {}            # key -> (spill file, size) of bitmaps moved to disk
+        self.lock = threading.Lock()
+
+        self.jobs = queue.PriorityQueue()
+        self.order = itertools.count()
+        self.generation = 0
+        self.pdf_path = None
+        self.page_count = 0
+        self.queued = set()
+        self.worker = None
+        MEMORY.register('renders', self.spill)
+
+    # ==================== DOCUMENT ====================
+
+    def open(self, pdf_path, page_count=None):
+        """Switch to another PDF; pending renders for the old one are dropped"""
+        with self.lock:
+            self.generation += 1
+            self.pdf_path = pdf_path
+            self.cache.clear()
+            self.cache_bytes = 0
+            self.queued.clear()
+            self._drop_spilled()
+        MEMORY.track('renders', 0)
+        if page_count is None:
+            with fitz.open(pdf_path) as doc:
+                page_count = len(doc)
+        self.page_count = page_count
+
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._run, daemon=True, name="page-render")
+            self.worker.start()
+
+    def close(self):
+        with self.lock:
+            self.generation += 1
+            self.pdf_path = None
+            self.cache.clear()
+            self.cache_bytes = 0
+            self.queued.clear()
+            self._drop_spilled()
+        MEMORY.track('renders', 0)
+
+    # ==================== REQUESTS ====================
+
+    def _key(self, page_index, width, height):
+        # Viewport sizes are bucketed so small resizes still hit the cache
+        step = self.size_step
+        return (page_index, max(step, width // step * step), max(step, height // step * step))
+
+    def get(self, page_index, width, height):
+        """Cached bitmap for this page and viewport, or None"""
+        key = self._key(page_index, width, height)
+        with self.lock:
+            image = self.cache.get(key)
+            if image is not None:
+                self.cache.move_to_end(key)
+            return image
+
+    def request(self, page_index, width, height, on_ready):
+        """Render a page in the background; on_ready(page_index, image) runs on the worker"""
+        self._enqueue(0, page_index, width, height, on_ready)
+
+    def prefetch_around(self, page_index, width, height):
+        for distance in range(1, self.prefetch + 1):
+            for neighbour in (page_index + distance, page_index - distance):
+                if 0 <= neighbour < self.page_count:
+                    self._enqueue(distance, neighbour, width, height, None)
+
+    def _enqueue(self, priority, page_index, width, height, on_ready):
+        key = self._key(page_index, width, height)
+        with self.lock:
+            image = self.cache.get(key)
+            if image is None and on_ready is None and key in self.queued:
+                return
+            self.queued.add(key)
+            generation = self.generation
+
+        if image is not None:
+            if on_ready:
+                on_ready(page_index, image)
+            return
+        self.jobs.put((priority, next(self.order), generation, key, on_ready))
+
+    # ==================== WORKER ====================
+
+    def _run(self):
+        doc = None
+        doc_path = None
+        while True:
+            priority, _, generation, key, on_ready = self.jobs.get()
+            with self.lock:
+                stale = generation != self.generation
+                pdf_path = self.pdf_path
+                image = self.cache.get(key)
+                spilled = self.spilled.get(key)
+            if stale or pdf_path is None:
+                continue
+
+            try:
+                if image is None and spilled is not None:
+                    image = self._read_spilled(*spilled)
+                    if image is not None:
+                        self._store(generation, key, image)
+                if image is None:
+                    if doc_path != pdf_path:
+                        if doc is not None:
+                            doc.close()
+                        doc = fitz.open(pdf_path)
+                        doc_path = pdf_path
+                    image = self._render(doc, *key)
+                    self._store(generation, key, image)
+                if on_ready:
+                    on_ready(key[0], image)
+            except Exception as e:
+                print(f"Page render error (page {key[0] + 1}): {e}")
+            finally:
+                with self.lock:
+                    self.queued.discard(key)
+
+    def _render(self, doc, page_index, width, height):
+        page = doc.load_page(page_index)
+        rect = page.rect
+        zoom = min(width / rect.width, height / rect.height)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    def _store(self, generation, key, image):
+        size = image.width * image.height * 3
+        with self.lock:
+            if generation != self.generation or size > self.max_bytes:
+                return
+            self.cache[key] = image
+            self.cache_bytes += size
+            while self.cache_bytes > self.max_bytes:
+                self._spill_oldest()
+            cache_bytes = self.cache_bytes
+        MEMORY.track('renders', cache_bytes)
+
+    # ==================== SPILLING ====================
+
+    def spill(self, nbytes):
+        """Memory budget callback: move bitmaps to disk until nbytes are freed"""
+        with self.lock:
+            before = self.cache_bytes
+            while self.cache and before - self.cache_bytes < nbytes:
+                self._spill_oldest()
+            cache_bytes = self.cache_bytes
+        MEMORY.track('renders', cache_bytes)
+        return before - cache_bytes
+
+    def _spill_oldest(self):
+        # Called with the lock held; a bitmap read back from disk keeps its file
+        key, image = self.cache.popitem(last=False)
+        self.cache_bytes -= image.width * image.height * 3
+        if key in self.spilled:
+            return
+        try:
+            self.spilled[key] = (MEMORY.write_spill('renders', image.tobytes(), ".rgb"), image.size)
+        except OSError as e:
+            print(f"Page spill error (page {key[0] + 1}): {e}")
+
+    def _read_spilled(self, path, size):
+        try:
+            with open(path, 'rb') as f:
+                return Image.frombytes("RGB", size, f.read())
+        except (OSError, ValueError):
+            return None   # Dropped by open()/close() meanwhile: render again
+
+    def _drop_spilled(self):
+        for path, _ in self.spilled.values():
+            MEMORY.remove_spill('renders', path)
+        self.spilled.clear()
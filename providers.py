@@ -0,0 +1,271 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+from telemetry import TELEMETRY
+from tracing import TRACER
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Worth another try: rate limits, timeouts and transient server errors
+RETRY_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class EngineError(Exception):
+    """An API answered with a non-200 status"""
+
+    def __init__(self, status, message="", retry_after=None):
+        super().__init__(f"API returned status {status}{': ' + message if message else ''}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class Usage:
+    """Request, retry, token and latency counters of one provider"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_total = 0.0
+
+    def success(self, seconds, usage=None):
+        with self.lock:
+            self.requests += 1
+            self.latency_total += seconds
+            if usage:
+                self.prompt_tokens += usage.get('prompt_tokens') or 0
+                self.completion_tokens += usage.get('completion_tokens') or 0
+
+    def failure(self, retrying):
+        with self.lock:
+            self.failures += 1
+            if retrying:
+                self.retries += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'failures': self.failures,
+                'retries': self.retries,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'avg_latency_ms': round(self.latency_total / self.requests * 1000, 1) if self.requests else None
+            }
+
+
+class Provider:
+    """One OpenAI-compatible chat endpoint (Groq, OpenRouter, a local server...)
+
+    Each provider keeps its own pooled keep-alive client, created on first use
+    on the engine loop: httpx.AsyncClient when installed, otherwise a
+    requests.Session driven from the loop's executor. Calls that fail with a
+    rate limit, timeout, connection error or 5xx are retried with jittered
+    exponential backoff (honouring Retry-After); a stream is only retried if
+    nothing has been shown from it yet. Every request feeds self.usage, and
+    every settled call the per-model telemetry (telemetry.py).
+    """
+
+    def __init__(self, name, base_url, api_key="", requires_key=True, timeout=60, max_connections=32,
+                 retries=3, backoff=0.5, max_backoff=8.0, headers=None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.requires_key = requires_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.extra_headers = headers or {}
+        self.usage = Usage()
+        self.client = None
+        self.session = None
+        self.transport_errors = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+    @property
+    def url(self):
+        return f"{self.base_url}/chat/completions"
+
+    @property
+    def configured(self):
+        return bool(self.api_key) or not self.requires_key
+
+    def _headers(self):
+        headers = {"Content-Type": "application/json", **self.extra_headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    # ==================== CLIENT ====================
+
+    def _open(self):
+        if self.client is not None or self.session is not None:
+            return
+        try:
+            import httpx
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            self.client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+            self.transport_errors += (httpx.TransportError,)
+        except ImportError:
+            import requests
+            from requests.adapters import HTTPAdapter
+            self.session = requests.Session()
+            self.session.mount("https://", HTTPAdapter(pool_maxsize=self.max_connections))
+            self.session.mount("http://", HTTPAdapter(pool_maxsize=self.max_connections))
+            self.transport_errors += (requests.ConnectionError, requests.Timeout)
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    # ==================== RETRIES ====================
+
+    def _retryable(self, error):
+        if isinstance(error, EngineError):
+            return error.status in RETRY_STATUSES
+        return isinstance(error, self.transport_errors)
+
+    def _delay(self, attempt, error):
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after:
+            return min(retry_after, self.max_backoff * 4)
+        # "Full jitter": spreads out clients that failed together
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def _with_retries(self, attempt_fn, can_retry=None, model=None):
+        call_started = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                with TRACER.span('llm.request', provider=self.name, model=model, attempt=attempt) as span:
+                    result, usage = await attempt_fn()
+                    if usage:
+                        span['tokens'] = usage.get('total_tokens')
+            except Exception as e:
+                retrying = (attempt < self.retries and self._retryable(e)
+                            and (can_retry is None or can_retry()))
+                self.usage.failure(retrying)
+                if not retrying:
+                    status = e.status if isinstance(e, EngineError) else type(e).__name__
+                    TELEMETRY.record(self.name, model, status, time.perf_counter() - call_started, retries=attempt)
+                    raise
+                await asyncio.sleep(self._delay(attempt, e))
+                continue
+            self.usage.success(time.perf_counter() - started, usage)
+            TELEMETRY.record(self.name, model, 'ok', time.perf_counter() - call_started, usage, retries=attempt)
+            return result
+
+    @staticmethod
+    def _error(status, body, headers):
+        try:
+            retry_after = float(headers.get('retry-after') or 0) or None
+        except ValueError:
+            retry_after = None
+        return EngineError(status, body[:200], retry_after)
+
+    # ==================== REQUESTS ====================
+
+    async def post_json(self, payload):
+        self._open()
+        if self.client is not None:
+            response = await self.client.post(self.url, headers=self._headers(), json=payload)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(None, lambda: self.session.post(
+                self.url, headers=self._headers(), json=payload, timeout=self.timeout))
+
+        if response.status_code != 200:
+            raise self._error(response.status_code, response.text, response.headers)
+        return response.json()
+
+    async def chat(self, model, messages, **params):
+        """Chat completion; returns the reply text"""
+        payload = {"model": model, "messages": messages, **params}
+
+        async def attempt():
+            result = await self.post_json(payload)
+            return result['choices'][0]['message']['content'], result.get('usage')
+
+        return await self._with_retries(attempt, model=model)
+
+    async def chat_stream(self, model, messages, on_delta=None, **params):
+        """Streaming chat completion; on_delta(text_so_far) runs per chunk, returns the full text
+
+        Without httpx this degrades to one non-streamed call reported as a single delta.
+        """
+        self._open()
+        if self.client is None:
+            text = await self.chat(model, messages, **params)
+            if on_delta:
+                on_delta(text)
+            return text
+
+        payload = {"model": model, "messages": messages, **params, "stream": True}
+        shown = []
+
+        async def attempt():
+            parts = []
+            usage = None
+            started = time.perf_counter()
+            async with self.client.stream("POST", self.url, headers=self._headers(), json=payload) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    raise self._error(response.status_code, body.decode(errors='replace'), response.headers)
+
+                # Server-sent events: "data: {json chunk}" lines, ending with "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    # OpenAI puts usage on the last chunk, Groq under x_groq
+                    usage = chunk.get('usage') or (chunk.get('x_groq') or {}).get('usage') or usage
+                    choices = chunk.get('choices') or [{}]
+                    delta = (choices[0].get('delta') or {}).get('content')
+                    if delta:
+                        if not parts:
+                            TRACER.add('llm.first_token', time.perf_counter() - started, provider=self.name, model=model)
+                        parts.append(delta)
+                        shown.append(True)
+                        if on_delta:
+                            on_delta("".join(parts))
+            return "".join(parts), usage
+
+        return await self._with_retries(attempt, can_retry=lambda: not shown, model=model)
+
+
+# ==================== PROVIDERS ====================
+
+def groq(api_key=None, **options):
+    key = os.environ.get('GROQ_API_KEY', '') if api_key is None else api_key
+    return Provider("groq", GROQ_BASE_URL, key, **options)
+
+
+def openrouter(api_key=None, **options):
+    key = os.environ.get('OPENROUTER_API_KEY', '') if api_key is None else api_key
+    return Provider("openrouter", OPENROUTER_BASE_URL, key, **options)
+
+
+def openai_compatible(name, base_url, api_key="", **options):
+    """Any other OpenAI-style endpoint (vLLM, Ollama, LM Studio, fake_llm.FakeLLMServer...)"""
+    return Provider(name, base_url, api_key, requires_key=False, **options)
+
+
+def default_providers(timeout=60):
+    return [groq(timeout=timeout), openrouter(timeout=timeout)]
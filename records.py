@@ -0,0 +1,59 @@
+import sys
+
+
+def intern_analysis(analysis):
+    """A page analysis with its lists turned into tuples of interned strings
+
+    The same entity, keyword and event labels come back on page after page
+    ("CHARACTERS: SAID", a main character's name); interned, every page
+    points at one copy instead of holding its own. Tuples are taken to come
+    from here already and are shared as they are.
+    """
+    if not analysis:
+        return {}
+    return {sys.intern(kind): tuple(sys.intern(value) if isinstance(value, str) else value for value in values)
+            if isinstance(values, list) else values
+            for kind, values in analysis.items()}
+
+
+class PageRecord:
+    """One analyzed page: number, text and analysis, plus its document name in the library"""
+
+    __slots__ = ('page', 'text', 'analysis', 'doc')
+
+    def __init__(self, page, text, analysis=None, doc=None):
+        self.page = int(page)
+        self.text = text
+        self.analysis = intern_analysis(analysis)
+        self.doc = sys.intern(doc) if doc else None
+
+    @classmethod
+    def from_dict(cls, data, doc=None):
+        return cls(data['page'], data['text'], data.get('analysis'), doc)
+
+    def to_dict(self):
+        data = {'page': self.page, 'text': self.text,
+                'analysis': {kind: list(values) for kind, values in self.analysis.items()}}
+        if self.doc:
+            data['doc'] = self.doc
+        return data
+
+    def __repr__(self):
+        return f"PageRecord(page={self.page}, doc={self.doc!r}, chars={len(self.text)})"
+
+
+class ImageRecord:
+    """One embedded image of a PDF and, once described, its description"""
+
+    __slots__ = ('page', 'index', 'image', 'image_bytes', 'spill', 'description')
+
+    def __init__(self, page, index, image=None, image_bytes=None, description=None):
+        self.page = int(page)
+        self.index = index
+        self.image = image              # Decoded PIL image; None while spilled to disk
+        self.image_bytes = image_bytes  # Raw bytes as stored in the PDF
+        self.spill = None               # Spill file once the memory budget moved the image to disk
+        self.description = description  # Filled by describe_images
+
+    def __repr__(self):
+        return f"ImageRecord(page={self.page}, index={self.index}, described={self.description is not None})"
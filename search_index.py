@@ -0,0 +1,257 @@
+import heapq
+import re
+
+# Words that carry no meaning for ranking search hits
+STOP_WORDS = frozenset({
+    'the', 'and', 'is', 'in', 'of', 'to', 'a', 'that', 'it', 'for', 'on', 'with', 'as', 'was',
+    'be', 'are', 'this', 'by', 'or', 'at', 'an', 'from', 'not', 'but', 'which', 'you', 'we',
+    'they', 'he', 'she', 'his', 'her', 'their', 'our', 'my', 'your', 'has', 'have', 'had',
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'can', 'may', 'might', 'must',
+    'what', 'who', 'when', 'where', 'why', 'how', 'there', 'about', 'tell', 'me'
+})
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+
+def tokenize(text):
+    """Lowercase word tokens of a text"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(word):
+    """Character trigrams of a word, padded so short words still produce some"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, max_dist=None):
+    """Levenshtein distance counting adjacent swaps as one edit; gives up past max_dist"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_dist is not None and len(a) - len(b) > max_dist:
+        return max_dist + 1
+
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1,
+                       current[j - 1] + 1,
+                       previous[j - 1] + (char_a != char_b))
+            if before is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if max_dist is not None and min(current) > max_dist:
+            return max_dist + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """Character-trigram index over page sentences for typo-tolerant lookups"""
+
+    def __init__(self):
+        self.sentences = []  # (doc, page, sentence, tokens)
+        self.postings = {}   # trigram -> set of sentence ids
+
+    def clear(self):
+        self.sentences = []
+        self.postings = {}
+
+    def add_sentences(self, page_num, sentences, sentence_tokens, doc=None):
+        for sentence, tokens in zip(sentences, sentence_tokens):
+            sentence_id = len(self.sentences)
+            self.sentences.append((doc, page_num, sentence, tokens))
+            for token in tokens:
+                if token in STOP_WORDS:
+                    continue
+                for gram in trigrams(token):
+                    self.postings.setdefault(gram, set()).add(sentence_id)
+
+    def search(self, query, top_k=5, min_score=0.5, candidates=50):
+        """Closest sentences to a possibly misspelled query
+
+        Candidates are ranked by the share of query trigrams they contain, then the
+        best few are re-ranked by edit distance between query terms and sentence words.
+        A sentence needs one query term spelled exactly, or a near match for more than
+        half of them; one misspelling-sized match alone is noise ("Where is the server
+        room?" turning up a line about "servers").
+        """
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t not in STOP_WORDS]
+        if not terms or top_k <= 0:
+            return []
+
+        query_grams = set()
+        for term in terms:
+            query_grams |= trigrams(term)
+
+        overlap = {}
+        for gram in query_grams:
+            for sentence_id in self.postings.get(gram, ()):
+                overlap[sentence_id] = overlap.get(sentence_id, 0) + 1
+
+        shortlist = heapq.nlargest(candidates, overlap.items(), key=lambda item: (item[1], -item[0]))
+
+        scored = []
+        for sentence_id, shared in shortlist:
+            doc, page_num, sentence, tokens = self.sentences[sentence_id]
+            similarities = [self._term_similarity(term, tokens) for term in terms]
+            if 1.0 not in similarities and 2 * sum(1 for value in similarities if value > 0) <= len(terms):
+                continue
+            similarity = sum(similarities) / len(terms)
+            score = 0.5 * shared / len(query_grams) + 0.5 * similarity
+            if score >= min_score:
+                scored.append((score, -sentence_id, {
+                    'doc': doc,
+                    'page': page_num,
+                    'text': sentence,
+                    'relevance': score
+                }))
+
+        return [item[2] for item in heapq.nlargest(top_k, scored, key=lambda item: item[:2])]
+
+    def _term_similarity(self, term, tokens):
+        if term in tokens:
+            return 1.0
+
+        # Allow roughly one typo per four characters
+        max_dist = max(1, len(term) // 4)
+        best = max_dist + 1
+        for token in tokens:
+            if abs(len(token) - len(term)) <= max_dist:
+                best = min(best, edit_distance(term, token, max_dist))
+                if best == 1:
+                    break
+        if best > max_dist:
+            return 0.0
+        return 1.0 - best / max(len(term), 1)
+
+
+class PageIndex:
+    """Precomputed lowercase/token index over every analyzed page"""
+
+    def __init__(self):
+        self.entries = []   # One dict per indexed page
+        self.postings = {}  # token -> set of entry ids
+        self.fuzzy = TrigramIndex()
+
+    def clear(self):
+        self.entries = []
+        self.postings = {}
+        self.fuzzy.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_page(self, page_num, text, doc=None):
+        """Index one page; sentences and lowercase forms are computed once here"""
+        entry_id = len(self.entries)
+        sentences = [s.strip() for s in SENTENCE_SPLIT.split(text) if s.strip()]
+        entry = {
+            'doc': doc,
+            'page': page_num,
+            'text': text,
+            'text_lower': text.lower(),
+            'sentences': sentences,
+            'sentences_lower': [s.lower() for s in sentences],
+            'sentence_tokens': [frozenset(tokenize(s)) for s in sentences],
+        }
+        self.entries.append(entry)
+
+        for token in set(tokenize(text)):
+            self.postings.setdefault(token, set()).add(entry_id)
+
+        self.fuzzy.add_sentences(page_num, sentences, entry['sentence_tokens'], doc=doc)
+        return entry_id
+
+    def query_terms(self, query):
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t not in STOP_WORDS]
+        return terms or list(dict.fromkeys(tokenize(query)))
+
+    def find_phrase(self, phrase):
+        """Entries whose text contains the phrase, narrowed through the postings first"""
+        phrase_lower = phrase.lower().strip()
+        if not phrase_lower:
+            return []
+
+        candidates = None
+        for term in tokenize(phrase_lower):
+            ids = self.postings.get(term, set())
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        ids = sorted(candidates) if candidates is not None else range(len(self.entries))
+        return [self.entries[i] for i in ids if phrase_lower in self.entries[i]['text_lower']]
+
+    def search(self, query, top_k=5, on_hit=None):
+        """Top-k sentence hits across the whole document
+
+        Pages are visited best-first by how many query terms they contain, and the scan
+        stops as soon as no remaining page can beat the weakest hit kept in the heap.
+        on_hit is called for every hit that enters the top-k while the scan runs.
+        """
+        query_lower = query.lower().strip()
+        terms = self.query_terms(query_lower)
+        if not terms or top_k <= 0:
+            return []
+
+        # Count matching terms per page straight from the postings
+        page_matches = {}
+        for term in terms:
+            for entry_id in self.postings.get(term, ()):
+                page_matches[entry_id] = page_matches.get(entry_id, 0) + 1
+
+        ordered = sorted(page_matches.items(), key=lambda item: (-item[1], item[0]))
+        heap = []
+        order = 0
+
+        for entry_id, matched in ordered:
+            # Best possible score on this page: all its terms in one sentence plus the phrase bonus
+            upper_bound = matched / len(terms) + (1.0 if matched == len(terms) else 0.0)
+            if len(heap) >= top_k and heap[0][0] >= upper_bound:
+                break
+
+            entry = self.entries[entry_id]
+            sentences = zip(entry['sentences'], entry['sentences_lower'], entry['sentence_tokens'])
+            for sentence, sentence_lower, tokens in sentences:
+                score = self._score_sentence(sentence_lower, tokens, query_lower, terms)
+                if score <= 0:
+                    continue
+
+                order += 1
+                item = (score, -order, {
+                    'doc': entry['doc'],
+                    'page': entry['page'],
+                    'text': sentence,
+                    'relevance': score
+                })
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+                else:
+                    continue
+
+                if on_hit:
+                    on_hit(item[2])
+
+        return [item[2] for item in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+    def fuzzy_search(self, query, top_k=5):
+        """Typo-tolerant fallback when no sentence contains the query terms exactly"""
+        return self.fuzzy.search(query, top_k=top_k)
+
+    def _score_sentence(self, sentence_lower, tokens, query_lower, terms):
+        present = sum(1 for term in terms if term in tokens)
+        if not present:
+            return 0.0
+
+        score = present / len(terms)
+        if present == len(terms) and query_lower in sentence_lower:
+            score += 1.0
+        return score
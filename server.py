@@ -0,0 +1,621 @@
+"""Analyzer as a local HTTP service
+
+    python server.py --port 8765            # Groq / OpenRouter keys from the environment
+    python server.py --port 8765 --stub     # no keys, no network: canned LLM replies
+    python server.py --fake-llm 0.2         # same, but through real HTTP clients to a fake endpoint
+
+Endpoints (JSON unless noted):
+
+    POST   /documents?name=a.pdf         upload a PDF (raw body) and queue its analysis -> 202 {job, document}
+    POST   /documents                    {"path": "..."} analyze a PDF under --library-root
+    GET    /documents                    analyzed and pending documents
+    GET    /documents/<id>               one document: status, page and image counts
+    GET    /documents/<id>/pages/<n>     page text and analysis
+    GET    /documents/<id>/images        image list with descriptions
+    POST   /documents/<id>/images/describe   {"model": ...} queue image descriptions -> 202 {job}
+    POST   /documents/<id>/ask           {"question": ..., "llm": true} -> 202 {job, instant}
+    GET    /jobs/<id>                    job status, progress and result
+    DELETE /jobs/<id>                    cancel a job
+    GET    /health                       queue and pool state
+    GET    /metrics                      span timings, Prometheus text format
+    GET    /trace                        buffered spans as a Chrome trace (?last=document: last run only)
+
+Work runs as jobs: a bounded queue feeds a fixed number of job threads (503
+when the queue is full). Text and image extraction runs in a process pool so
+big PDFs do not hold the GIL; every LLM call is a coroutine on one async
+engine whose in-flight cap is --llm-concurrency.
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from async_engine import AsyncEngine, StubEngine
+from checkpoint import DEFAULT_JOURNAL_DIR
+from engine import PDFEngine, AnswerError, load_image
+from fake_llm import FakeLLMServer
+from jobs import JobCancelled
+from memory import MEMORY
+from records import ImageRecord
+from telemetry import TELEMETRY
+from tracing import TRACER
+
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+KEEP_FINISHED_JOBS = 500
+
+
+class ServiceBusyError(Exception):
+    """Raised when the job queue is full"""
+
+
+def extract_pdf(pdf_path):
+    """Page texts and raw embedded images of a PDF; runs in the extraction process pool"""
+    import fitz
+
+    texts = []
+    images = []
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(len(doc)):
+            page = doc.load_page(page_num)
+            texts.append(page.get_text())
+            for img_index, img in enumerate(page.get_images()):
+                images.append(ImageRecord(page_num + 1, img_index, image_bytes=doc.extract_image(img[0])["image"]))
+    return texts, images
+
+
+# ==================== JOBS ====================
+
+class ServiceJob:
+    """One queued unit of work; quacks like jobs.Job for the engine (check/cancelled)"""
+
+    def __init__(self, job_id, kind, fn, args, on_cancel=None):
+        self.id = job_id
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.on_cancel = on_cancel   # Runs when the job is cancelled before it started
+        self.status = 'queued'
+        self.stage = None
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancelled:
+            raise JobCancelled(f"{self.kind} job {self.id}")
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def to_dict(self):
+        info = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 3),
+            'queued_seconds': round((self.started or time.time()) - self.created, 3),
+        }
+        if self.started is not None:
+            info['run_seconds'] = round((self.finished or time.time()) - self.started, 3)
+        if self.result is not None:
+            info['result'] = self.result
+        if self.error is not None:
+            info['error'] = self.error
+        return info
+
+
+class JobQueue:
+    """Bounded FIFO of ServiceJobs drained by a fixed number of threads"""
+
+    def __init__(self, workers=4, max_queue=64):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.threads = [threading.Thread(target=self._worker, daemon=True, name=f"service-job-{n}")
+                        for n in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, kind, fn, *args, on_cancel=None):
+        """Queue fn(job, *args); raises ServiceBusyError when the queue is full
+
+        fn sees a cancellation through job.check(); on_cancel() covers a job
+        cancelled while still queued, which fn never runs for.
+        """
+        job = ServiceJob(str(next(self.ids)), kind, fn, args, on_cancel)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            raise ServiceBusyError(f"{self.queue.qsize()} jobs already queued")
+        with self.lock:
+            self.jobs[job.id] = job
+            self._forget_old()
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def counts(self):
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def _forget_old(self):
+        finished = [job for job in self.jobs.values() if job.finished is not None]
+        for job in sorted(finished, key=lambda job: job.finished)[:max(0, len(finished) - KEEP_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            if job.cancelled:
+                job.status, job.finished = 'cancelled', time.time()
+                if job.on_cancel:
+                    job.on_cancel()
+                continue
+
+            job.status, job.started = 'running', time.time()
+            try:
+                job.result = job.fn(job, *job.args)
+                job.status, job.progress = 'done', 1.0
+            except JobCancelled:
+                job.status = 'cancelled'
+            except Exception as e:
+                job.status, job.error = 'failed', str(e)
+                print(f"❌ Job {job.id} ({job.kind}) failed: {e}")
+            job.finished = time.time()
+
+
+# ==================== SERVICE ====================
+
+class ServiceDocument:
+    def __init__(self, doc_id, name, path):
+        self.id = doc_id
+        self.name = name
+        self.path = path
+        self.status = 'queued'
+        self.analysis = None   # engine.DocumentAnalysis once analyzed
+        self.images = []
+        self.describing = set()  # (page, index) of images a describe job has claimed
+        self.lock = threading.Lock()
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'pages': len(self.analysis) if self.analysis is not None else None,
+            'images': len(self.images),
+            'described': sum(1 for img in self.images if img.description)
+        }
+
+
+class AnalysisService:
+    """Documents, jobs and pools behind the HTTP handler (usable without HTTP too)"""
+
+    def __init__(self, engine, data_dir=None, workers=4, max_queue=64, extract_processes=2, library_root=None):
+        self.engine = engine
+        self.data_dir = data_dir or tempfile.mkdtemp(prefix="intellex-service-")
+        os.makedirs(self.data_dir, exist_ok=True)
+        # Only PDFs under this folder can be analyzed by path; uploads are the default
+        self.library_root = os.path.realpath(library_root or self.data_dir)
+        self.extract_pool = concurrent.futures.ProcessPoolExecutor(max_workers=extract_processes)
+        self.jobs = JobQueue(workers=workers, max_queue=max_queue)
+        self.documents = {}
+        self.lock = threading.Lock()
+
+    def document(self, doc_id):
+        with self.lock:
+            return self.documents.get(doc_id)
+
+    # ==================== DOCUMENTS ====================
+
+    def add_upload(self, data, name):
+        """Store uploaded PDF bytes (deduplicated by content) and queue the analysis"""
+        doc_id = hashlib.sha1(data).hexdigest()[:16]
+        path = os.path.join(self.data_dir, f"{doc_id}.pdf")
+        if not os.path.exists(path):
+            with open(path + ".tmp", 'wb') as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        return self._queue_document(doc_id, name, path)
+
+    def add_path(self, pdf_path):
+        """Queue the analysis of a PDF already on the server; it must be under library_root"""
+        pdf_path = os.path.realpath(os.path.join(self.library_root, pdf_path))
+        if os.path.commonpath([pdf_path, self.library_root]) != self.library_root:
+            raise PermissionError(f"Only files under {self.library_root} can be analyzed by path")
+        if not os.path.isfile(pdf_path):
+            raise FileNotFoundError(pdf_path)
+        doc_id = hashlib.sha1(os.path.abspath(pdf_path).encode('utf-8')).hexdigest()[:16]
+        return self._queue_document(doc_id, os.path.basename(pdf_path), pdf_path)
+
+    def _queue_document(self, doc_id, name, path):
+        document = ServiceDocument(doc_id, name, path)
+        job = self.jobs.submit('analysis', self._analyze, document,
+                               on_cancel=lambda: setattr(document, 'status', 'cancelled'))
+        with self.lock:
+            self.documents[doc_id] = document
+        return document, job
+
+    def _analyze(self, job, document):
+        try:
+            with TRACER.span('document', pdf=document.name, doc=document.id):
+                self._run_analysis(job, document)
+        except JobCancelled:
+            document.status = 'cancelled'
+            raise
+        except Exception:
+            document.status = 'failed'
+            raise
+        document.status = 'ready'
+        return document.to_dict()
+
+    def _run_analysis(self, job, document):
+        document.status = job.stage = 'extracting'
+        with TRACER.span('extract.pdf'):
+            future = self.extract_pool.submit(extract_pdf, document.path)
+            while True:
+                try:
+                    texts, images = future.result(timeout=0.1)
+                    break
+                except concurrent.futures.TimeoutError:
+                    if job.cancelled:
+                        future.cancel()
+                        job.check()
+
+        document.images = images
+        document.status = job.stage = 'analyzing'
+
+        def on_progress(done, total):
+            job.progress = done / total
+
+        document.analysis = self.engine.analyze_texts(document.path, texts, job, on_progress,
+                                                      add_to_library=False)
+
+    # ==================== IMAGES ====================
+
+    def describe_images(self, document, model):
+        return self.jobs.submit('images', self._describe, document, model)
+
+    def _describe(self, job, document, model):
+        # The lock only guards the claim and the results, so pages and status stay readable meanwhile
+        with document.lock:
+            pending = [img for img in document.images
+                       if not img.description and (img.page, img.index) not in document.describing]
+            document.describing.update((img.page, img.index) for img in pending)
+        total = len(pending)
+        done = []
+
+        def on_result(index, description):
+            with document.lock:
+                pending[index].description = description
+            done.append(index)
+            job.progress = len(done) / total
+
+        try:
+            job.stage = 'describing'
+            # Decoded in the job thread; the document itself only keeps the raw bytes
+            images = [ImageRecord(img.page, img.index, load_image(img.image_bytes)) for img in pending]
+            self.engine.describe_images(images, model, job, on_result, limit=4, pdf_path=document.path)
+        finally:
+            with document.lock:
+                document.describing.difference_update((img.page, img.index) for img in pending)
+        return {'described': total}
+
+    # ==================== QUESTIONS ====================
+
+    def ask(self, document, question, use_llm=True):
+        """Instant local answer now, plus a job for the LLM answer when one is wanted"""
+        instant = self.engine.instant_answer(question, document.analysis)
+        if not (use_llm and self.engine.groq_ready):
+            return instant, None
+        return instant, self.jobs.submit('question', self._answer, document, question)
+
+    def _answer(self, job, document, question):
+        job.stage = 'answering'
+        try:
+            answer, model = self.engine.answer(question, document.analysis, job)
+        except AnswerError as e:
+            return {'answer': None, 'error': str(e)}
+        return {'answer': answer, 'model': model}
+
+    def health(self):
+        return {
+            'documents': len(self.documents),
+            'queued': self.jobs.queue.qsize(),
+            'jobs': self.jobs.counts(),
+            'groq': self.engine.groq_status,
+            'llm_in_flight_cap': self.engine.llm.max_in_flight,
+            'llm_usage': self.engine.llm.usage(),
+            'models': TELEMETRY.snapshot(),
+            'memory': MEMORY.usage()
+        }
+
+    def shutdown(self):
+        self.extract_pool.shutdown(wait=False, cancel_futures=True)
+        self.engine.llm.stop()
+
+
+# ==================== HTTP ====================
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "IntellexService/1.0"
+
+    routes = [
+        ('GET', r'/health', 'get_health'),
+        ('GET', r'/metrics', 'get_metrics'),
+        ('GET', r'/trace', 'get_trace'),
+        ('GET', r'/documents', 'list_documents'),
+        ('POST', r'/documents', 'post_document'),
+        ('GET', r'/documents/(\w+)', 'get_document'),
+        ('GET', r'/documents/(\w+)/pages/(\d+)', 'get_page'),
+        ('GET', r'/documents/(\w+)/images', 'get_images'),
+        ('POST', r'/documents/(\w+)/images/describe', 'post_describe'),
+        ('POST', r'/documents/(\w+)/ask', 'post_ask'),
+        ('GET', r'/jobs/(\w+)', 'get_job'),
+        ('DELETE', r'/jobs/(\w+)', 'delete_job'),
+    ]
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        self.query = parse_qs(url.query)
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, url.path.rstrip('/') or '/')
+            if match and route_method == method:
+                try:
+                    getattr(self, name)(*match.groups())
+                except ServiceBusyError as e:
+                    self._send(503, {'error': f"Service busy: {e}"})
+                except PermissionError as e:
+                    self._send(403, {'error': str(e)})
+                except (ValueError, KeyError) as e:
+                    self._send(400, {'error': str(e)})
+                except FileNotFoundError as e:
+                    self._send(404, {'error': f"No such file: {e}"})
+                except Exception as e:
+                    self._send(500, {'error': str(e)})
+                return
+        self._send(404, {'error': f"No route for {method} {url.path}"})
+
+    # ==================== HELPERS ====================
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status, text, content_type='text/plain; charset=utf-8'):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_UPLOAD_BYTES:
+            raise ValueError(f"Body too large ({length} bytes)")
+        return self.rfile.read(length)
+
+    def _json_body(self):
+        body = self._body()
+        data = json.loads(body) if body else {}
+        if not isinstance(data, dict):
+            raise ValueError("Body must be a JSON object")
+        return data
+
+    def _field(self, body, name):
+        if name not in body:
+            raise ValueError(f"Missing field: {name}")
+        return body[name]
+
+    def _document(self, doc_id, ready=True):
+        document = self.service.document(doc_id)
+        if document is None:
+            self._send(404, {'error': f"Unknown document {doc_id}"})
+        elif ready and document.analysis is None:
+            self._send(409, {'error': f"Document {doc_id} is {document.status}"})
+        else:
+            return document
+        return None
+
+    # ==================== ENDPOINTS ====================
+
+    def get_health(self):
+        self._send(200, self.service.health())
+
+    def get_metrics(self):
+        self._send_text(200, TRACER.prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+
+    def get_trace(self):
+        last = self.query.get('last', [None])[0]
+        if last is None:
+            self._send(200, TRACER.chrome_trace())
+            return
+        root = TRACER.last_root(last)
+        if root is None:
+            self._send(404, {'error': f"No '{last}' run traced yet"})
+        else:
+            self._send(200, TRACER.chrome_trace(root['trace']))
+
+    def list_documents(self):
+        with self.service.lock:
+            documents = list(self.service.documents.values())
+        self._send(200, {'documents': [document.to_dict() for document in documents]})
+
+    def post_document(self):
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            document, job = self.service.add_path(self._field(self._json_body(), 'path'))
+        else:
+            data = self._body()
+            if not data.startswith(b'%PDF'):
+                raise ValueError("Body is not a PDF")
+            name = self.query.get('name', ['upload.pdf'])[0]
+            document, job = self.service.add_upload(data, name)
+        self._send(202, {'document': document.id, 'job': job.id})
+
+    def get_document(self, doc_id):
+        document = self._document(doc_id, ready=False)
+        if document:
+            self._send(200, document.to_dict())
+
+    def get_page(self, doc_id, page):
+        document = self._document(doc_id)
+        if document:
+            page = int(page)
+            if not 1 <= page <= len(document.analysis):
+                self._send(404, {'error': f"Page {page} out of range 1-{len(document.analysis)}"})
+                return
+            self._send(200, document.analysis.pages[page - 1].to_dict())
+
+    def get_images(self, doc_id):
+        document = self._document(doc_id, ready=False)
+        if document:
+            self._send(200, {'images': [{'page': img.page, 'index': img.index,
+                                         'bytes': len(img.image_bytes), 'description': img.description}
+                                        for img in document.images]})
+
+    def post_describe(self, doc_id):
+        document = self._document(doc_id)
+        if document:
+            model = self._json_body().get('model', "qwen/qwen-2.5-vl-72b-instruct")
+            job = self.service.describe_images(document, model)
+            self._send(202, {'job': job.id, 'images': len(document.images)})
+
+    def post_ask(self, doc_id):
+        document = self._document(doc_id)
+        if document:
+            body = self._json_body()
+            instant, job = self.service.ask(document, self._field(body, 'question'), body.get('llm', True))
+            self._send(202 if job else 200, {'instant': instant, 'job': job.id if job else None})
+
+    def get_job(self, job_id):
+        job = self.service.jobs.get(job_id)
+        if job is None:
+            self._send(404, {'error': f"Unknown job {job_id}"})
+        else:
+            self._send(200, job.to_dict())
+
+    def delete_job(self, job_id):
+        job = self.service.jobs.get(job_id)
+        if job is None:
+            self._send(404, {'error': f"Unknown job {job_id}"})
+        else:
+            job.cancel()
+            self._send(200, job.to_dict())
+
+
+def make_server(host="127.0.0.1", port=8765, stub=False, stub_latency=0.05, llm_concurrency=16,
+                workers=4, max_queue=64, extract_processes=2, data_dir=None, verbose=False,
+                llm_url=None, llm_model=None, fake_llm_latency=None, library_root=None):
+    """Build (but do not start) the HTTP server; port 0 picks a free port
+
+    llm_url sends every LLM call to an OpenAI-compatible endpoint (key from
+    INTELLEX_LLM_KEY); fake_llm_latency starts an in-process fake_llm server
+    with that latency and uses it as the endpoint.
+    """
+    fake = None
+    if fake_llm_latency is not None:
+        fake = FakeLLMServer(latency=fake_llm_latency).start()
+        llm_url = fake.url
+
+    # Canned answers must never end up in the real checkpoint journal
+    journal_dir = None if stub or fake else DEFAULT_JOURNAL_DIR
+    if stub:
+        llm = StubEngine(latency=stub_latency, max_in_flight=llm_concurrency)
+        engine = PDFEngine(groq_api_key="stub", openrouter_api_key="stub", llm=llm, journal_dir=journal_dir)
+    else:
+        engine = PDFEngine(llm=AsyncEngine(max_in_flight=llm_concurrency), journal_dir=journal_dir)
+        if llm_url:
+            engine.use_endpoint(llm_url, os.environ.get('INTELLEX_LLM_KEY', ''), model=llm_model)
+    engine.check_groq()
+
+    httpd = ThreadingHTTPServer((host, port), ServiceHandler)
+    httpd.daemon_threads = True
+    httpd.verbose = verbose
+    httpd.fake_llm = fake
+    httpd.service = AnalysisService(engine, data_dir, workers, max_queue, extract_processes, library_root)
+    return httpd
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the PDF analyzer as a local HTTP service")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--stub', action='store_true', help="answer LLM calls locally (no keys, no network)")
+    parser.add_argument('--stub-latency', type=float, default=0.05, help="seconds per stub LLM call")
+    parser.add_argument('--llm-url', help="OpenAI-compatible base URL for all LLM calls (key: INTELLEX_LLM_KEY)")
+    parser.add_argument('--llm-model', help="model name to use with --llm-url")
+    parser.add_argument('--fake-llm', type=float, metavar='LATENCY',
+                        help="serve LLM calls from an in-process fake endpoint with this latency (seconds)")
+    parser.add_argument('--llm-concurrency', type=int, default=16, help="LLM requests in flight at once")
+    parser.add_argument('--workers', type=int, default=4, help="jobs running at once")
+    parser.add_argument('--max-queue', type=int, default=64, help="queued jobs before answering 503")
+    parser.add_argument('--extract-processes', type=int, default=2, help="processes for PDF extraction")
+    parser.add_argument('--data-dir', help="where uploaded PDFs are stored (default: a temp dir)")
+    parser.add_argument('--library-root', help="folder whose PDFs can be analyzed by path (default: --data-dir)")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    httpd = make_server(args.host, args.port, args.stub, args.stub_latency, args.llm_concurrency,
+                        args.workers, args.max_queue, args.extract_processes, args.data_dir, args.verbose,
+                        args.llm_url, args.llm_model, args.fake_llm, args.library_root)
+    host, port = httpd.server_address[:2]
+    print(f"🚀 Analyzer service on http://{host}:{port} (Groq: {httpd.service.engine.groq_status})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹ Stopping...")
+    finally:
+        httpd.service.shutdown()
+        httpd.server_close()
+        if httpd.fake_llm:
+            httpd.fake_llm.stop()
+
+
+if __name__ == "__main__":
+    main()
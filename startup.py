@@ -0,0 +1,102 @@
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+# Taken when the analyzers import this module first thing, i.e. close to process start
+PROCESS_START = time.perf_counter()
+
+# Cold start budget (import to first drawn frame); override with INTELLEX_STARTUP_TARGET_MS
+DEFAULT_TARGET_MS = 1000
+
+# `python index1.py --startup-check` measures one cold start, then exits non-zero if over target
+STARTUP_CHECK = '--startup-check' in sys.argv
+
+
+# ==================== LAZY IMPORTS ====================
+
+class LazyModule:
+    """Stand-in for a heavy module that is only imported on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def preload(*names):
+    """Import modules on a background thread so the first real use does not stall the UI"""
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"⚠️ Preload of {name} failed: {e}")
+
+    threading.Thread(target=run, daemon=True, name="preload").start()
+
+
+def missing_modules(*names):
+    """Names of modules that are not installed (checked without importing them)"""
+    return [name for name in names if importlib.util.find_spec(name) is None]
+
+
+# ==================== STARTUP TIMING ====================
+
+class StartupTimer:
+    """Measures cold start from process start to the first drawn window"""
+
+    def __init__(self, target_ms=None):
+        self.target_ms = target_ms or float(os.environ.get('INTELLEX_STARTUP_TARGET_MS', DEFAULT_TARGET_MS))
+        self.marks = []
+        self.total_ms = None
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - PROCESS_START) * 1000
+
+    def mark(self, label):
+        self.marks.append((label, self.elapsed_ms()))
+
+    @property
+    def within_target(self):
+        return self.total_ms is not None and self.total_ms <= self.target_ms
+
+    def watch(self, root, on_ready=None, exit_after=False):
+        """Report once Tk is idle after drawing the window, then run on_ready (deferred startup work)"""
+        def ready():
+            self.mark("first frame")
+            self.total_ms = self.marks[-1][1]
+            self.report()
+            if exit_after:
+                root.destroy()
+            elif on_ready:
+                on_ready()
+
+        root.after_idle(ready)
+
+    def report(self):
+        steps = "  ".join(f"{label} {ms:.0f}ms" for label, ms in self.marks)
+        verdict = "✅" if self.within_target else "⚠️ over target"
+        print(f"⏱️ Startup: {self.total_ms:.0f} ms (target {self.target_ms:.0f} ms) {verdict}\n   {steps}")
+
+
+STARTUP_TIMER = StartupTimer()
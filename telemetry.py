@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from collections import deque
+
+# Upper bounds (seconds) of the latency histogram buckets; slower calls go in the last, open bucket
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+# Calls kept per model; the histograms and percentiles cover this window
+WINDOW = 200
+
+# A model whose last calls within this many seconds all failed is routed around
+COOLDOWN = 120
+
+
+def _percentile(ordered, share):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(share * len(ordered)) - 1))]
+
+
+class ModelStats:
+    """The most recent calls of one provider/model pair, plus lifetime totals"""
+
+    def __init__(self, window=WINDOW):
+        self.calls = deque(maxlen=window)   # (time, status, seconds, prompt tokens, completion tokens, retries)
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_prompt_tokens = 0
+        self.total_completion_tokens = 0
+
+    def add(self, status, seconds, prompt_tokens, completion_tokens, retries):
+        self.calls.append((time.time(), status, seconds, prompt_tokens, completion_tokens, retries))
+        self.total_calls += 1
+        if status != 'ok':
+            self.total_failures += 1
+        self.total_prompt_tokens += prompt_tokens
+        self.total_completion_tokens += completion_tokens
+
+    def snapshot(self):
+        calls = list(self.calls)
+        ok = [call for call in calls if call[1] == 'ok']
+        latencies = sorted(call[2] for call in ok)
+        histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        for seconds in latencies:
+            position = next((index for index, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+                            len(LATENCY_BUCKETS))
+            histogram[position] += 1
+
+        completion_tokens = sum(call[4] for call in ok)
+        ok_seconds = sum(latencies)
+        statuses = {}
+        for call in calls:
+            statuses[str(call[1])] = statuses.get(str(call[1]), 0) + 1
+
+        return {
+            'window': len(calls),
+            'success_rate': round(len(ok) / len(calls), 3) if calls else None,
+            'p50_s': round(_percentile(latencies, 0.50), 3) if latencies else None,
+            'p95_s': round(_percentile(latencies, 0.95), 3) if latencies else None,
+            'mean_s': round(ok_seconds / len(ok), 3) if ok else None,
+            'tokens_per_s': round(completion_tokens / ok_seconds, 1) if ok_seconds and completion_tokens else None,
+            'avg_prompt_tokens': round(sum(call[3] for call in ok) / len(ok), 1) if ok else None,
+            'avg_completion_tokens': round(completion_tokens / len(ok), 1) if ok else None,
+            'retries': sum(call[5] for call in calls),
+            'statuses': statuses,
+            'histogram': {'buckets': list(LATENCY_BUCKETS), 'counts': histogram},
+            'last_status': calls[-1][1] if calls else None,
+            'last_call': calls[-1][0] if calls else None,
+            'total_calls': self.total_calls,
+            'total_failures': self.total_failures,
+            'total_prompt_tokens': self.total_prompt_tokens,
+            'total_completion_tokens': self.total_completion_tokens
+        }
+
+
+class ModelTelemetry:
+    """Tokens, latency, status and retries of every LLM call, per provider and model
+
+    Providers record each call once it is settled (after its retries), so
+    latency is what the caller waited. Each model keeps a rolling window of
+    its last calls: the model menus show the summary line, route() uses it
+    to push models that are failing right now behind the ones that work.
+    """
+
+    def __init__(self, window=WINDOW, cooldown=COOLDOWN):
+        self.window = window
+        self.cooldown = cooldown
+        self.models = {}   # (provider, model) -> ModelStats
+        self.lock = threading.Lock()
+
+    def record(self, provider, model, status, seconds, usage=None, retries=0):
+        """One settled call; status is 'ok', an HTTP status or an exception name"""
+        usage = usage or {}
+        with self.lock:
+            stats = self.models.get((provider, model))
+            if stats is None:
+                stats = self.models[(provider, model)] = ModelStats(self.window)
+            stats.add(status, seconds, usage.get('prompt_tokens') or 0, usage.get('completion_tokens') or 0, retries)
+
+    def reset(self):
+        with self.lock:
+            self.models.clear()
+
+    # ==================== QUERIES ====================
+
+    def stats(self, model, provider=None):
+        """Snapshot of one model (merged over providers when provider is None), or None"""
+        with self.lock:
+            matches = [stats for (name, stats_model), stats in self.models.items()
+                       if stats_model == model and provider in (None, name)]
+            if not matches:
+                return None
+            if len(matches) == 1:
+                return matches[0].snapshot()
+            merged = ModelStats(self.window * len(matches))
+            merged.calls.extend(sorted((call for stats in matches for call in stats.calls), key=lambda call: call[0]))
+            for stats in matches:
+                merged.total_calls += stats.total_calls
+                merged.total_failures += stats.total_failures
+                merged.total_prompt_tokens += stats.total_prompt_tokens
+                merged.total_completion_tokens += stats.total_completion_tokens
+            return merged.snapshot()
+
+    def snapshot(self):
+        """Every model: {"provider/model": stats}"""
+        with self.lock:
+            items = list(self.models.items())
+        return {f"{provider}/{model}": stats.snapshot() for (provider, model), stats in items}
+
+    def failing(self, model, provider=None):
+        """True when the model's calls of the last `cooldown` seconds (at least two) all failed"""
+        with self.lock:
+            recent_since = time.time() - self.cooldown
+            statuses = [call[1] for (name, stats_model), stats in self.models.items()
+                        if stats_model == model and provider in (None, name)
+                        for call in stats.calls if call[0] >= recent_since]
+        return len(statuses) >= 2 and all(status != 'ok' for status in statuses)
+
+    def route(self, models, provider=None):
+        """models in their configured order, with the ones failing right now moved to the back"""
+        healthy, failing = [], []
+        for model in models:
+            (failing if self.failing(model, provider) else healthy).append(model)
+        return healthy + failing
+
+    # ==================== TEXT ====================
+
+    def describe(self, model, provider=None):
+        """One line for a model menu: latency, success rate and speed over the window"""
+        stats = self.stats(model, provider)
+        if stats is None:
+            return "No calls yet"
+        if stats['p50_s'] is None:
+            return f"{stats['window']} calls, all failed (last: {stats['last_status']})"
+        line = f"p50 {stats['p50_s']:.1f}s · p95 {stats['p95_s']:.1f}s · {stats['success_rate']:.0%} ok"
+        if stats['tokens_per_s']:
+            line += f" · {stats['tokens_per_s']:.0f} tok/s"
+        return line + f" (n={stats['window']})"
+
+    def report(self):
+        """Table of every model that was called"""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "No LLM calls yet."
+        lines = [f"{'Model':<44}{'Calls':>6}{'OK':>6}{'p50 s':>8}{'p95 s':>8}{'Tok/s':>8}{'Retries':>9}{'Tokens in/out':>16}"]
+        for name in sorted(snapshot):
+            stats = snapshot[name]
+            lines.append(
+                f"{name[:43]:<44}{stats['window']:>6}"
+                f"{stats['success_rate']:>6.0%}"
+                f"{stats['p50_s'] if stats['p50_s'] is not None else '-':>8}"
+                f"{stats['p95_s'] if stats['p95_s'] is not None else '-':>8}"
+                f"{stats['tokens_per_s'] or '-':>8}{stats['retries']:>9}"
+                f"{str(stats['total_prompt_tokens']) + '/' + str(stats['total_completion_tokens']):>16}")
+        return "\n".join(lines)
+
+
+# Shared by every provider of the process
+TELEMETRY = ModelTelemetry()
@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import pytest
+
+from async_engine import StubEngine
+from engine import PDFEngine
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = PDFEngine(llm=StubEngine(latency=0), journal_dir=str(tmp_path / "journal"))
+    engine.groq_ready = True
+    yield engine
+    engine.llm.stop()
+
+
+def test_resume_skips_journaled_pages(engine, tmp_path):
+    pdf_path = str(tmp_path / "a.pdf")
+    shutil.copy(os.path.join(HERE, "story.pdf"), pdf_path)
+
+    first = engine.analyze_document(pdf_path, add_to_library=False)
+    calls = engine.llm.calls
+    assert calls == len(first)
+
+    second = engine.analyze_document(pdf_path, add_to_library=False)
+    assert engine.llm.calls == calls
+    assert [page.analysis for page in second.pages] == [page.analysis for page in first.pages]
+
+
+def test_replaced_pdf_invalidates_journal(engine, tmp_path):
+    pdf_path = str(tmp_path / "a.pdf")
+    shutil.copy(os.path.join(HERE, "story.pdf"), pdf_path)
+    story = engine.analyze_document(pdf_path, add_to_library=False)
+
+    shutil.copy(os.path.join(HERE, "guidence.pdf"), pdf_path)
+    calls = engine.llm.calls
+    guidence = engine.analyze_document(pdf_path, add_to_library=False)
+
+    assert engine.llm.calls - calls == len(guidence)
+    assert guidence.pages[0].analysis != story.pages[0].analysis
+
+
+def test_model_switch_invalidates_journal(engine, tmp_path):
+    pdf_path = str(tmp_path / "a.pdf")
+    shutil.copy(os.path.join(HERE, "story.pdf"), pdf_path)
+    first = engine.analyze_document(pdf_path, add_to_library=False)
+
+    engine.text_model = "another-model"
+    calls = engine.llm.calls
+    engine.analyze_document(pdf_path, add_to_library=False)
+    assert engine.llm.calls - calls == len(first)
@@ -0,0 +1,43 @@
+from entity_extractor import EntityExtractor
+from entity_store import EntityStore
+
+
+def test_extract_names_with_roles_in_first_seen_order():
+    extractor = EntityExtractor()
+    text = ("Dr. Watson said hello. Then Sherlock Holmes went to London. "
+            "The detective found Sherlock Holmes at home.")
+
+    assert extractor.extract(text) == [
+        ('Dr. Watson', 'medical'),
+        ('Sherlock Holmes', 'person'),
+        ('London', 'name'),
+    ]
+
+
+def test_extract_skips_sentence_starts_and_lowercase_titles():
+    extractor = EntityExtractor()
+    assert extractor.extract("Yesterday it rained. I miss Paris in spring.") == [('Paris', 'name')]
+    assert extractor.extract("Elara said nothing.") == [('Elara', 'person')]
+
+
+def test_extract_uses_the_gazetteer():
+    extractor = EntityExtractor({'acme corp': 'organization'})
+    assert ('acme corp', 'organization') in extractor.extract("shares of acme corp fell")
+
+
+def test_store_counts_pages_and_cooccurrence():
+    store = EntityStore()
+    store.add_page(1, {'entities': ["Sarah Chen (detective)", "Marcus"], 'keywords': ["TIME: NIGHT"]})
+    store.add_page(2, {'entities': ["sarah chen", "Marcus", "Elara"]})
+    store.add_page(3, {'entities': ["Elara", "Elara"]})
+
+    # Counts are occurrences, pages are distinct; spellings merge on the normalized key
+    assert store.top('entities', 3) == [('Elara', 3, [2, 3]), ('Sarah Chen', 2, [1, 2]), ('Marcus', 2, [1, 2])]
+    assert store.pages_for('entities', "elara") == [2, 3]
+
+    # A repeat on one page is not a pair, and pairs are counted once per page
+    assert store.cooccurrence['sarah chen']['marcus'] == 2
+    assert store.cooccurrence['marcus']['sarah chen'] == 2
+    assert 'elara' not in store.cooccurrence['elara']
+    assert store.related("Elara") == [('Sarah Chen', 1), ('Marcus', 1)]
+    assert store.top_pairs(1) == [('Marcus', 'Sarah Chen', 2)]
@@ -0,0 +1,87 @@
+from search_index import PageIndex, edit_distance, trigrams
+
+
+def make_index(pages):
+    index = PageIndex()
+    for page_num, text in enumerate(pages, 1):
+        index.add_page(page_num, text)
+    return index
+
+
+def test_search_returns_top_k_best_first():
+    index = make_index([
+        "The archive holds old maps. Nothing else is kept here.",
+        "The server room is locked at night. The server racks hum.",
+        "Maps of the server room hang by the door.",
+    ])
+
+    hits = index.search("server room", top_k=3)
+
+    scores = [hit['relevance'] for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert len(hits) == 3
+    # Both full phrase matches outrank the sentence with only one term; ties keep page order
+    assert [hit['page'] for hit in hits] == [2, 3, 2]
+    assert hits[2]['text'] == "The server racks hum"
+
+
+def test_search_stops_once_no_page_can_beat_the_heap():
+    index = make_index([
+        "The server room is on the second floor.",
+        "Old servers and a server manual.",
+        "A server for the guest room.",
+    ])
+    scanned = []
+    score_sentence = index._score_sentence
+
+    def counting(sentence_lower, *args):
+        scanned.append(sentence_lower)
+        return score_sentence(sentence_lower, *args)
+
+    index._score_sentence = counting
+    hits = index.search("server room", top_k=1)
+
+    assert [hit['page'] for hit in hits] == [1]
+    # Page 3 could at best tie the phrase hit and page 2 holds one term: neither is read
+    assert scanned == ["the server room is on the second floor"]
+
+
+def test_search_streams_hits_that_enter_the_top_k():
+    index = make_index(["A key. The key box. A red key box."])
+    streamed = []
+    hits = index.search("key box", top_k=2, on_hit=streamed.append)
+    assert hits and all(hit in streamed for hit in hits)
+
+
+def test_fuzzy_search_finds_misspelled_terms():
+    index = make_index(["Visitors sign in at the desk. The server room is on the second floor."])
+
+    assert index.search("servr rom") == []
+    hits = index.fuzzy_search("servr rom")
+    assert hits[0]['text'] == "The server room is on the second floor"
+
+
+def test_fuzzy_search_skips_sentences_matching_too_few_terms():
+    index = make_index(["PDFs stay on your computer. No data stored on servers."])
+
+    assert index.fuzzy_search("Where is the server room?") == []
+    assert index.fuzzy_search("servr rom") == []
+    assert index.fuzzy_search("data servers")[0]['text'] == "No data stored on servers"
+
+
+def test_trigrams_pad_short_words():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_edit_distance_counts_adjacent_swaps_once():
+    assert edit_distance("form", "from") == 1
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("room", "rom") == 1
+    assert edit_distance("", "abc") == 3
+
+
+def test_edit_distance_gives_up_past_max_dist():
+    assert edit_distance("abcdef", "uvwxyz", max_dist=2) == 3
+    # Length difference alone rules it out before any row is computed
+    assert edit_distance("server", "se", max_dist=2) == 3
+    assert edit_distance("server", "servr", max_dist=2) == 1
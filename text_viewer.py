@@ -0,0 +1,127 @@
+import tkinter as tk
+
+
+class WindowedTextView:
+    """Shows a very large text in a Tk Text widget a few chunks at a time
+
+    Only a window of chunks (the visible region plus a margin) lives in the
+    widget. Scrolling near the bottom appends the next chunk and scrolling near
+    the top puts back the previous one; chunks falling far outside the view are
+    dropped again, so switching pages costs one small insert regardless of how
+    big the page is.
+
+    Works with tk.Text / ScrolledText and with CTkTextbox (through its inner
+    Text widget).
+    """
+
+    def __init__(self, widget, chunk_chars=16000, window_chunks=6, margin=0.15):
+        self.text = getattr(widget, '_textbox', widget)
+        self.chunk_chars = chunk_chars
+        self.window_chunks = window_chunks
+        self.margin = margin
+
+        self.content = ""
+        self.chunks = []   # (start, end) offsets into content
+        self.first = 0     # first loaded chunk
+        self.last = 0      # one past the last loaded chunk
+        self.busy = False
+        self.scheduled = False
+
+        # Keep the widget's scrollbar working and watch the view at the same time
+        self.scrollbar_command = self.text.cget('yscrollcommand')
+        self.text.configure(yscrollcommand=self._on_yscroll)
+
+    def _split(self, text):
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_chars, len(text))
+            if end < len(text):
+                # Prefer to cut right after a newline, else after a space
+                cut = text.rfind('\n', start, end)
+                if cut <= start:
+                    cut = text.rfind(' ', start, end)
+                if cut > start:
+                    end = cut + 1
+            chunks.append((start, end))
+            start = end
+        return chunks
+
+    def _chunk(self, number):
+        start, end = self.chunks[number]
+        return self.content[start:end]
+
+    def set_text(self, text):
+        """Replace the content, loading just enough chunks to fill the view"""
+        self.content = text or ""
+        self.chunks = self._split(self.content)
+        self.first = 0
+        self.last = min(2, len(self.chunks))
+
+        self.busy = True
+        try:
+            self.text.delete('1.0', tk.END)
+            if self.last:
+                self.text.insert('1.0', self.content[:self.chunks[self.last - 1][1]])
+            self.text.yview_moveto(0)
+        finally:
+            self.busy = False
+
+    def clear(self):
+        self.set_text("")
+
+    @property
+    def fully_loaded(self):
+        return self.first == 0 and self.last == len(self.chunks)
+
+    def _on_yscroll(self, first, last):
+        if self.scrollbar_command:
+            self.text.tk.call(*self.text.tk.splitlist(self.scrollbar_command), first, last)
+
+        if self.busy or self.scheduled:
+            return
+        first, last = float(first), float(last)
+        if (last > 1 - self.margin and self.last < len(self.chunks)) or \
+           (first < self.margin and self.first > 0):
+            self.scheduled = True
+            self.text.after_idle(self._extend)
+
+    def _top_line(self):
+        return int(self.text.index('@0,0').split('.')[0])
+
+    def _lines_in(self, chars):
+        return int(self.text.index(f'1.0 + {chars} chars').split('.')[0]) - 1
+
+    def _extend(self):
+        self.scheduled = False
+        first, last = (float(v) for v in self.text.yview())
+        self.busy = True
+        try:
+            if last > 1 - self.margin and self.last < len(self.chunks):
+                self.text.insert(tk.END + '-1c', self._chunk(self.last))
+                self.last += 1
+                if self.last - self.first > self.window_chunks:
+                    self._drop_first()
+            elif first < self.margin and self.first > 0:
+                top = self._top_line()
+                self.first -= 1
+                chunk = self._chunk(self.first)
+                self.text.insert('1.0', chunk)
+                self.text.yview(f'{top + self._lines_in(len(chunk))}.0')
+                if self.last - self.first > self.window_chunks:
+                    self._drop_last()
+        finally:
+            self.busy = False
+
+    def _drop_first(self):
+        top = self._top_line()
+        size = len(self._chunk(self.first))
+        removed = self._lines_in(size)
+        self.text.delete('1.0', f'1.0 + {size} chars')
+        self.first += 1
+        self.text.yview(f'{max(top - removed, 1)}.0')
+
+    def _drop_last(self):
+        size = len(self._chunk(self.last - 1))
+        self.text.delete(f'{tk.END} - {size + 1} chars', tk.END + '-1c')
+        self.last -= 1
@@ -0,0 +1,207 @@
+import tkinter as tk
+
+from memory import MEMORY
+from startup import lazy_import
+from workers import WorkerPool, PoolBusyError
+
+ImageTk = lazy_import('PIL.ImageTk')
+
+
+class ThumbnailStrip:
+    """Horizontally scrolling strip of image thumbnails
+
+    Thumbnails are shrunk from the gallery's PIL images on a small worker pool
+    and kept as small PIL images. Only the cells currently scrolled into view
+    (plus a margin) hold a PhotoImage and a canvas item; everything else is
+    released as soon as it scrolls out, so a 300-image PDF costs a handful of
+    Tk images rather than 300.
+
+    The strip reads items from a list of ImageRecords (the analyzers'
+    images_data, read through MEMORY so spilled images come back) and
+    reports clicks through on_select(index).
+    """
+
+    def __init__(self, parent, on_select, size=72, padding=6, margin=3,
+                 bg='#1e1e1e', fg='#cccccc', accent='#4fc3f7', workers=2):
+        self.on_select = on_select
+        self.size = size
+        self.padding = padding
+        self.margin = margin
+        self.accent = accent
+        self.fg = fg
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, bg=bg, height=size + 2 * padding + 14,
+                                highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self.frame, orient='horizontal', command=self._xview)
+        self.canvas.configure(xscrollcommand=self._on_xscroll)
+        self.canvas.pack(fill='x', expand=True)
+        self.scrollbar.pack(fill='x')
+
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Configure>', lambda e: self.refresh())
+        self.canvas.bind('<Shift-MouseWheel>', self._on_wheel)
+        self.canvas.bind('<Button-4>', lambda e: self._xview('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self._xview('scroll', 1, 'units'))
+
+        self.pool = WorkerPool(max_workers=workers, max_pending=4 * workers, name="thumbs")
+        self.items = []
+        self.thumbs = {}       # index -> small PIL image
+        self.requested = set()
+        self.visible = {}      # index -> (PhotoImage, canvas item ids)
+        self.selected = None
+        self.generation = 0
+        self.polling = False
+
+    @property
+    def cell(self):
+        return self.size + 2 * self.padding
+
+    # ==================== CONTENT ====================
+
+    def set_items(self, items):
+        """Show a new list of images (the list may keep growing; call items_added)"""
+        self.generation += 1
+        self.pool.cancel()
+        self.items = items
+        self.thumbs.clear()
+        self.requested.clear()
+        self.selected = None
+        self._forget_visible()
+        self.canvas.xview_moveto(0)
+        self.items_added()
+
+    def clear(self):
+        self.set_items([])
+
+    def items_added(self):
+        self.canvas.configure(scrollregion=(0, 0, max(1, len(self.items) * self.cell), self.cell))
+        self.refresh()
+
+    def select(self, index):
+        """Highlight a thumbnail and scroll it into view"""
+        self.selected = index
+        if self.items:
+            first, last = self._visible_range(margin=0)
+            if not first <= index <= last:
+                self.canvas.xview_moveto(max(0, index * self.cell - self.cell) / (len(self.items) * self.cell))
+        self._draw_selection()
+        self.refresh()
+
+    # ==================== SCROLLING ====================
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self.refresh()
+
+    def _on_xscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def _on_wheel(self, event):
+        self._xview('scroll', -1 if event.delta > 0 else 1, 'units')
+
+    def _visible_range(self, margin=None):
+        margin = self.margin if margin is None else margin
+        width = max(self.canvas.winfo_width(), self.cell)
+        left = self.canvas.canvasx(0)
+        first = max(0, int(left // self.cell) - margin)
+        last = min(len(self.items) - 1, int((left + width) // self.cell) + margin)
+        return first, last
+
+    def refresh(self):
+        """Realize thumbnails in view, release the rest, queue missing ones"""
+        if not self.items:
+            return
+        first, last = self._visible_range()
+
+        for index in [i for i in self.visible if not first <= i <= last]:
+            self._forget(index)
+
+        for index in range(first, last + 1):
+            if index in self.visible:
+                continue
+            thumb = self.thumbs.get(index)
+            if thumb is not None:
+                self._realize(index, thumb)
+            elif index not in self.requested:
+                self._request(index)
+
+    # ==================== CELLS ====================
+
+    def _realize(self, index, thumb):
+        x = index * self.cell + self.cell // 2
+        photo = ImageTk.PhotoImage(thumb)
+        ids = (
+            self.canvas.create_image(x, self.padding + self.size // 2, image=photo, anchor='center'),
+            self.canvas.create_text(x, self.cell + 4, text=f"p{self.items[index].page}",
+                                    fill=self.fg, font=('Arial', 8)),
+        )
+        self.visible[index] = (photo, ids)
+        if index == self.selected:
+            self._draw_selection()
+
+    def _forget(self, index):
+        _, ids = self.visible.pop(index)
+        for item in ids:
+            self.canvas.delete(item)
+
+    def _forget_visible(self):
+        for index in list(self.visible):
+            self._forget(index)
+        self.canvas.delete('selection')
+
+    def _draw_selection(self):
+        self.canvas.delete('selection')
+        if self.selected is None:
+            return
+        x = self.selected * self.cell
+        self.canvas.create_rectangle(x + 2, 2, x + self.cell - 2, self.cell - 2,
+                                     outline=self.accent, width=2, tags='selection')
+
+    def _on_click(self, event):
+        index = int(self.canvas.canvasx(event.x) // self.cell)
+        if 0 <= index < len(self.items):
+            self.select(index)
+            self.on_select(index)
+
+    # ==================== BACKGROUND THUMBNAILS ====================
+
+    def _request(self, index):
+        try:
+            self.pool.submit(self._make_thumb, self.items[index], tag=self.generation,
+                             on_done=lambda thumb, error, i=index, g=self.generation: self._thumb_ready(g, i, thumb, error))
+        except PoolBusyError:
+            return  # Picked up again by the next refresh
+        self.requested.add(index)
+        if not self.polling:
+            self.polling = True
+            self.canvas.after(30, self._poll)
+
+    def _make_thumb(self, cancel_event, item):
+        if cancel_event.is_set():
+            return None
+        thumb = MEMORY.image(item).copy()   # Read back from disk here if the image was spilled
+        thumb.thumbnail((self.size, self.size))
+        return thumb
+
+    def _poll(self):
+        self.pool.poll()
+        if self.pool.pending():
+            self.canvas.after(30, self._poll)
+        else:
+            self.polling = False
+            self.refresh()  # Cells skipped while the pool was full
+
+    def _thumb_ready(self, generation, index, thumb, error):
+        if generation != self.generation:
+            return
+        if error is not None or thumb is None:
+            # Stays in requested so a broken image is not retried on every scroll
+            print(f"Thumbnail error (image {index + 1}): {error}")
+            return
+        self.requested.discard(index)
+        self.thumbs[index] = thumb
+        first, last = self._visible_range()
+        if first <= index <= last and index not in self.visible:
+            self._realize(index, thumb)
@@ -0,0 +1,224 @@
+import contextlib
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Upper bounds (seconds) of the Prometheus histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (span id, trace id) of the span the current code runs in. Context variables
+# follow coroutines, and run_coroutine_threadsafe carries them from the job
+# thread onto the engine loop, so page requests nest under their document.
+_current = contextvars.ContextVar('intellex_span', default=None)
+
+
+class Tracer:
+    """In-process collector of named, timed spans
+
+        with TRACER.span('page.analyze', page=3):
+            ...
+
+    Finished spans go into a bounded ring buffer (the oldest are dropped) and
+    into per-name histograms that are never dropped. A span opened inside
+    another one becomes its child; one opened outside any span starts a new
+    trace, so "the last run" is the trace of the last 'document' root span.
+    Exports: export_json() writes the Chrome trace format (chrome://tracing,
+    Perfetto), prometheus() renders the histograms as Prometheus text, and
+    report() is the plain-text table the Performance view shows.
+    """
+
+    def __init__(self, max_spans=50000):
+        self.enabled = True
+        self.spans = deque(maxlen=max_spans)
+        self.stats = {}    # name -> [count, total seconds, max seconds, bucket counts]
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.origin = time.perf_counter()
+        self.origin_wall = time.time()
+
+    @contextlib.contextmanager
+    def span(self, name, **attrs):
+        """Time the with-block as a span; the yielded dict takes extra attributes"""
+        if not self.enabled:
+            yield attrs
+            return
+
+        span_id = next(self.ids)
+        parent = _current.get()
+        trace_id = parent[1] if parent else span_id
+        token = _current.set((span_id, trace_id))
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs['error'] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            _current.reset(token)
+            self._record({
+                'id': span_id,
+                'parent': parent[0] if parent else None,
+                'trace': trace_id,
+                'name': name,
+                'start': start,
+                'duration': end - start,
+                'thread': threading.current_thread().name,
+                'attrs': attrs
+            })
+
+    def add(self, name, seconds, **attrs):
+        """Record a span that was timed elsewhere and ended just now"""
+        if not self.enabled:
+            return
+        span_id = next(self.ids)
+        parent = _current.get()
+        self._record({
+            'id': span_id,
+            'parent': parent[0] if parent else None,
+            'trace': parent[1] if parent else span_id,
+            'name': name,
+            'start': time.perf_counter() - seconds,
+            'duration': seconds,
+            'thread': threading.current_thread().name,
+            'attrs': attrs
+        })
+
+    def _record(self, span):
+        seconds = span['duration']
+        with self.lock:
+            self.spans.append(span)
+            stats = self.stats.get(span['name'])
+            if stats is None:
+                stats = self.stats[span['name']] = [0, 0.0, 0.0, [0] * len(BUCKETS)]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            for position, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    stats[3][position] += 1
+                    break
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.stats.clear()
+
+    # ==================== QUERIES ====================
+
+    def finished(self, trace=None):
+        """Finished spans, oldest first; only those of one trace when given"""
+        with self.lock:
+            spans = list(self.spans)
+        if trace is None:
+            return spans
+        return [span for span in spans if span['trace'] == trace]
+
+    def last_root(self, prefix):
+        """The most recent finished root span whose name starts with prefix, or None"""
+        with self.lock:
+            for span in reversed(self.spans):
+                if span['parent'] is None and span['name'].startswith(prefix):
+                    return span
+        return None
+
+    def run_spans(self, root, background=('ui.',)):
+        """Spans of root's trace, plus root spans of background work (Tk updates) during it"""
+        end = root['start'] + root['duration']
+        return [span for span in self.finished()
+                if span['trace'] == root['trace']
+                or (span['parent'] is None and span['name'].startswith(background)
+                    and root['start'] <= span['start'] <= end)]
+
+    def summary(self, spans):
+        """Per-name count/total/mean/max of some spans, biggest total first"""
+        totals = {}
+        for span in spans:
+            entry = totals.setdefault(span['name'], {'name': span['name'], 'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += span['duration']
+            entry['max'] = max(entry['max'], span['duration'])
+        rows = sorted(totals.values(), key=lambda entry: entry['total'], reverse=True)
+        for entry in rows:
+            entry['mean'] = entry['total'] / entry['count']
+        return rows
+
+    # ==================== EXPORTS ====================
+
+    def report(self, prefix='document', limit=15):
+        """Where the last trace started by a `prefix` root span spent its time, as text"""
+        root = self.last_root(prefix)
+        if root is None:
+            return f"No '{prefix}' run traced yet."
+
+        label = root['attrs'].get('pdf') or root['attrs'].get('question') or ""
+        lines = [f"⏱ {root['name']} {label} - {root['duration']:.3f} s",
+                 "",
+                 f"{'Span':<20}{'Count':>7}{'Total s':>10}{'% run':>8}{'Mean ms':>10}{'Max ms':>10}"]
+        for entry in self.summary(self.run_spans(root))[:limit]:
+            share = entry['total'] / root['duration'] if root['duration'] else 0.0
+            lines.append(f"{entry['name'][:19]:<20}{entry['count']:>7}{entry['total']:>10.3f}{share:>8.0%}"
+                         f"{entry['mean'] * 1000:>10.1f}{entry['max'] * 1000:>10.1f}")
+        lines.append("")
+        lines.append("Spans nest and run concurrently, so shares add up to more than 100%.")
+        return "\n".join(lines)
+
+    def chrome_trace(self, trace=None):
+        """Spans as Chrome trace events (complete events, microseconds)"""
+        events = []
+        threads = {}
+        for span in self.finished(trace):
+            tid = threads.setdefault(span['thread'], len(threads) + 1)
+            events.append({
+                'name': span['name'],
+                'ph': 'X',
+                'ts': round((span['start'] - self.origin) * 1e6, 1),
+                'dur': round(span['duration'] * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': tid,
+                'args': {'id': span['id'], 'parent': span['parent'], 'trace': span['trace'],
+                         **{key: value if isinstance(value, (int, float, str, bool)) or value is None else str(value)
+                            for key, value in span['attrs'].items()}}
+            })
+        for thread_name, tid in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                           'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'started': self.origin_wall}}
+
+    def export_json(self, path, trace=None):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(trace), f)
+        return path
+
+    def prometheus(self, prefix='intellex'):
+        """Per-span histograms in the Prometheus text exposition format"""
+        metric = f"{prefix}_span_seconds"
+        lines = [f"# HELP {metric} Time spent in traced spans.",
+                 f"# TYPE {metric} histogram"]
+        with self.lock:
+            stats = {name: (count, total, list(buckets)) for name, (count, total, _, buckets) in self.stats.items()}
+        for name in sorted(stats):
+            count, total, buckets = stats[name]
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'{metric}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{span="{label}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {total:.6f}')
+            lines.append(f'{metric}_count{{span="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path, prefix='intellex'):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus(prefix))
+        return path
+
+
+# Shared by every module of the process
+TRACER = Tracer()
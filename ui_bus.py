@@ -0,0 +1,65 @@
+import itertools
+import threading
+from collections import OrderedDict
+
+from tracing import TRACER
+
+
+class UIEventBus:
+    """Single drain point for UI updates posted by worker threads
+
+    Workers call post() instead of scheduling one root.after() closure per page
+    or image. A periodic Tk callback applies everything queued since the last
+    tick; events posted with the same key collapse so only the newest runs
+    (e.g. a progress bar only needs the latest value).
+    """
+
+    def __init__(self, widget, interval=33, max_per_tick=200):
+        self.widget = widget
+        self.interval = interval
+        self.max_per_tick = max_per_tick
+        self.pending = OrderedDict()
+        self.lock = threading.Lock()
+        self.ids = itertools.count()
+        self.running = False
+        self.posted = 0
+        self.applied = 0
+
+    def post(self, handler, *args, key=None, **kwargs):
+        """Queue handler(*args, **kwargs) for the Tk thread; safe to call from any thread"""
+        with self.lock:
+            if key is None:
+                key = ('event', next(self.ids))
+            else:
+                # Re-insert so the collapsed event keeps its newest position
+                self.pending.pop(key, None)
+            self.pending[key] = (handler, args, kwargs)
+            self.posted += 1
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self.widget.after(self.interval, self._drain)
+
+    def stop(self):
+        self.running = False
+
+    def _drain(self):
+        if not self.running:
+            return
+
+        with self.lock:
+            batch = []
+            while self.pending and len(batch) < self.max_per_tick:
+                batch.append(self.pending.popitem(last=False)[1])
+
+        if batch:
+            with TRACER.span('ui.update', events=len(batch)):
+                for handler, args, kwargs in batch:
+                    try:
+                        handler(*args, **kwargs)
+                    except Exception as e:
+                        print(f"UI update failed: {e}")
+        self.applied += len(batch)
+
+        self.widget.after(self.interval, self._drain)
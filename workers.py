@@ -0,0 +1,105 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolBusyError(Exception):
+    """Raised when a WorkerPool already holds its maximum number of tasks"""
+
+
+class WorkerTask:
+    """Handle for one submitted job"""
+
+    def __init__(self, task_id, tag, on_done):
+        self.id = task_id
+        self.tag = tag
+        self.on_done = on_done
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; returns True if it was dropped before it started"""
+        self.cancel_event.set()
+        return self.future is not None and self.future.cancel()
+
+
+class WorkerPool:
+    """Bounded, cancellable thread pool that hands results back through a queue
+
+    Workers never touch the UI: each finished job is put on a thread-safe queue
+    and poll() - called periodically from the Tk loop - runs its on_done(result,
+    error) callback on the main thread. Jobs receive their cancel event as the
+    first argument so long calls can stop between steps; results of cancelled
+    jobs are dropped.
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, name="worker"):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.max_pending = max_pending
+        self.results = queue.Queue()
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+    def submit(self, fn, *args, tag=None, on_done=None):
+        with self.lock:
+            if len(self.tasks) >= self.max_pending:
+                raise PoolBusyError(f"{len(self.tasks)} tasks already queued")
+            task = WorkerTask(next(self.ids), tag, on_done)
+            self.tasks[task.id] = task
+
+        task.future = self.executor.submit(self._run, task, fn, args)
+        return task
+
+    def _run(self, task, fn, args):
+        if task.cancelled:
+            self.results.put((task, None, None))
+            return
+
+        try:
+            result, error = fn(task.cancel_event, *args), None
+        except Exception as e:
+            result, error = None, e
+        self.results.put((task, result, error))
+
+    def cancel(self, tag=None):
+        """Cancel every task (or every task with the given tag)"""
+        with self.lock:
+            tasks = [task for task in self.tasks.values() if tag is None or task.tag == tag]
+        for task in tasks:
+            if task.cancel():
+                # Never started, so no result will come back to clear it
+                with self.lock:
+                    self.tasks.pop(task.id, None)
+        return len(tasks)
+
+    def pending(self, tag=None):
+        with self.lock:
+            return sum(1 for task in self.tasks.values() if tag is None or task.tag == tag)
+
+    def poll(self, max_items=50):
+        """Dispatch finished tasks on the calling (UI) thread"""
+        dispatched = 0
+        while dispatched < max_items:
+            try:
+                task, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            with self.lock:
+                self.tasks.pop(task.id, None)
+            if task.cancelled or task.on_done is None:
+                continue
+
+            task.on_done(result, error)
+            dispatched += 1
+        return dispatched
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)